@@ -0,0 +1,91 @@
+"""
+Benchmark comparing the legacy connection-per-call path with the persistent,
+tuned connection of DatabaseManager.
+
+Usage: python -m Benchmarks.database_connection [--iterations N]
+
+The dataset is copied to a temporary directory so that Datasets/ is never modified.
+"""
+
+import argparse
+import os
+import shutil
+import sqlite3
+import tempfile
+import time
+from collections.abc import Callable
+from Database.Manager import DatabaseManager
+
+DATASET: str = os.path.join(
+    os.path.dirname(os.path.dirname(__file__)), "Datasets", "askfrance_1000.db"
+)
+
+
+def legacy_execute_command(filepath: str, command: str, params: tuple = ()) -> list:
+    """Reproduces the former behaviour: one sqlite3.connect per call."""
+
+    connexion: sqlite3.Connection = sqlite3.connect(filepath)
+    try:
+        return connexion.execute(command, params).fetchall()
+    finally:
+        connexion.close()
+
+
+def timeit(label: str, function: Callable[[], object], iterations: int) -> float:
+    start: float = time.perf_counter()
+    for _ in range(iterations):
+        function()
+    elapsed: float = time.perf_counter() - start
+    print(
+        f"{label:<45} {elapsed * 1000:10.1f} ms  ({elapsed / iterations * 1e6:8.1f} µs/call)"
+    )
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=2000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        filepath: str = shutil.copy(DATASET, os.path.join(directory, "bench.db"))
+        ids: list[str] = [
+            row[0] for row in legacy_execute_command(filepath, "SELECT Id FROM Submission")
+        ]
+        query: str = "SELECT Title, Body FROM Submission WHERE Id = ?"
+        iterations: int = args.iterations
+
+        print(f"Dataset : {DATASET} ({len(ids)} submissions)")
+        print("-- Point lookups by Id")
+        legacy_point = timeit(
+            "legacy (connect per call)",
+            lambda: legacy_execute_command(filepath, query, (ids[0],)),
+            iterations,
+        )
+        with DatabaseManager("", filepath=filepath) as database:
+            persistent_point = timeit(
+                "DatabaseManager (persistent connection)",
+                lambda: database.execute_command(query, (ids[0],)),
+                iterations,
+            )
+
+        print("-- Full table reads")
+        full_iterations: int = max(1, iterations // 100)
+        legacy_full = timeit(
+            "legacy (connect per call)",
+            lambda: legacy_execute_command(filepath, "SELECT * FROM Submission"),
+            full_iterations,
+        )
+        with DatabaseManager("", filepath=filepath) as database:
+            persistent_full = timeit(
+                "DatabaseManager (persistent connection)",
+                lambda: database.execute_command("SELECT * FROM Submission"),
+                full_iterations,
+            )
+
+        print(f"Speed-up point lookups : x{legacy_point / persistent_point:.1f}")
+        print(f"Speed-up full reads    : x{legacy_full / persistent_full:.1f}")
+
+
+if __name__ == "__main__":
+    main()
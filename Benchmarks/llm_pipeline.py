@@ -0,0 +1,160 @@
+"""
+Benchmark of the LLM enrichment pipeline against the local stand-in server of
+LLM.MockServer: no Azure deployment is called.
+
+Usage: python -m Benchmarks.llm_pipeline [--submissions N] [--concurrency N] [--latency S]
+                                         [--tokens-per-minute N] [--rate-limit-rate P] [--malformed-rate P]
+
+Each scenario reports calls/s, tokens/s and the p50 / p99 latency of the model calls
+(retries included), and the parse-failure rate of the answers. The dataset is copied to a
+temporary directory so that Datasets/ is never modified. Offline, token counts fall back to
+an approximation of the tiktoken encoding (see LLM.Tokens.encoding).
+"""
+
+import argparse
+import os
+import shutil
+import statistics
+import tempfile
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from langchain_core.messages import BaseMessage
+from Database.Manager import DatabaseManager
+from LLM.Agent import LLMAgent
+from LLM.MockServer import API_KEY, API_VERSION, MockAzureOpenAI
+from LLM.Parser import ParseStats
+
+DATASET: str = os.path.join(
+    os.path.dirname(os.path.dirname(__file__)), "Datasets", "askfrance_1000.db"
+)
+
+
+class TimedAgent(LLMAgent):
+    """LLMAgent recording the duration of every model call, retries included."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._lock: threading.Lock = threading.Lock()
+        self.latencies: list[float] = []
+
+    def _invoke(
+        self,
+        messages: list[BaseMessage],
+        completion_tokens: int = 256,
+        json_mode: bool = False,
+    ) -> BaseMessage:
+        start: float = time.perf_counter()
+        try:
+            return super()._invoke(messages, completion_tokens, json_mode)
+        finally:
+            with self._lock:
+                self.latencies.append(time.perf_counter() - start)
+
+
+def run(label: str, server: MockAzureOpenAI, agent: TimedAgent, function: Callable[[], object]):
+    agent.latencies.clear()
+    agent.parse_stats = ParseStats()
+    before: dict[str, int] = server.stats()
+    start: float = time.perf_counter()
+    function()
+    elapsed: float = time.perf_counter() - start
+    after: dict[str, int] = server.stats()
+
+    calls: int = after["completed"] - before["completed"]
+    tokens: int = (after["prompt_tokens"] + after["completion_tokens"]) - (
+        before["prompt_tokens"] + before["completion_tokens"]
+    )
+    latencies: list[float] = sorted(agent.latencies) or [0.0]
+    p99: float = (
+        statistics.quantiles(latencies, n=100)[98] if len(latencies) > 1 else latencies[0]
+    )
+    print(
+        f"{label:<40} {elapsed:7.2f} s  {calls / elapsed:8.1f} calls/s  {tokens / elapsed:10.0f} tokens/s  "
+        f"p50 {statistics.median(latencies) * 1000:7.1f} ms  p99 {p99 * 1000:7.1f} ms  "
+        f"(429: {after['throttled'] - before['throttled']}, malformed: {after['malformed'] - before['malformed']})"
+    )
+    print(f"{'':<40} Parsing : {agent.parse_stats.report()}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--submissions", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--requests-per-minute", type=int)
+    parser.add_argument("--tokens-per-minute", type=int)
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0)
+    parser.add_argument("--malformed-rate", type=float, default=0.0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory, MockAzureOpenAI(
+        latency=args.latency,
+        requests_per_minute=args.requests_per_minute,
+        tokens_per_minute=args.tokens_per_minute,
+        rate_limit_rate=args.rate_limit_rate,
+        malformed_rate=args.malformed_rate,
+        seed=0,
+    ) as server:
+        filepath: str = shutil.copy(DATASET, os.path.join(directory, "bench.db"))
+        agent: TimedAgent = TimedAgent(
+            requests_per_minute=args.requests_per_minute,
+            tokens_per_minute=args.tokens_per_minute,
+            azure_endpoint=server.endpoint,
+            azure_deployment="mock",
+            api_version=API_VERSION,
+            api_key=API_KEY,
+        )
+
+        with DatabaseManager("", filepath=filepath) as database:
+            database.create()
+            submissions = list(database.iter_submissions(limit=args.submissions))
+            print(
+                f"Mock server {server.endpoint}, {len(submissions)} submissions, "
+                f"concurrency {args.concurrency}, latency {args.latency * 1000:.0f} ms"
+            )
+
+            def keywords_and_topic():
+                with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+                    list(executor.map(agent.request_keywords_and_topic, submissions))
+
+            run("request_keywords_and_topic", server, agent, keywords_and_topic)
+
+            ids: tuple[str, ...] = tuple(submission["Id"] for submission in submissions)
+            database.execute_command(
+                f"UPDATE Submission SET Keywords = NULL, Topic = NULL WHERE Id IN ({', '.join('?' * len(ids))})",
+                ids,
+            )
+            run(
+                "update_all_keywords_and_topic",
+                server,
+                agent,
+                lambda: database.update_all_keywords_and_topic(
+                    agent, concurrency=args.concurrency
+                ),
+            )
+
+            database.execute_command(
+                f"UPDATE Submission SET Keywords = NULL, Topic = NULL WHERE Id IN ({', '.join('?' * len(ids))})",
+                ids,
+            )
+            run(
+                "update_all_keywords_and_topic (packed)",
+                server,
+                agent,
+                lambda: database.update_all_keywords_and_topic(
+                    agent, concurrency=args.concurrency, max_batch_tokens=3000
+                ),
+            )
+
+            run(
+                "categorize_keywords",
+                server,
+                agent,
+                lambda: database.categorize_keywords(agent, 10),
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+"""
+Benchmark of time-range queries and foreign-key lookups before and after the
+schema migration (Created_utc epoch column and secondary indexes).
+
+Usage: python -m Benchmarks.range_queries [--scale N] [--iterations N]
+
+The dataset is copied to a temporary directory (and optionally replicated
+--scale times) so that Datasets/ is never modified.
+"""
+
+import argparse
+import os
+import random
+import shutil
+import sqlite3
+import tempfile
+import time
+from datetime import datetime, timedelta
+from Database.Manager import DatabaseManager
+
+DATASET: str = os.path.join(
+    os.path.dirname(os.path.dirname(__file__)), "Datasets", "askfrance_1000.db"
+)
+
+
+def replicate(filepath: str, scale: int):
+    """Duplicates every submission scale - 1 times, shifted by one day per copy."""
+
+    connexion: sqlite3.Connection = sqlite3.connect(filepath)
+    for copy in range(1, scale):
+        connexion.execute(
+            """
+            INSERT INTO Submission (Id, Author_id, Created, Sub_id, Url, Title, Body, Keywords, Topic)
+            SELECT Id || '_' || ?, Author_id || '_' || ?,
+                   strftime('%Y-%m-%d %H:%M:%f', Created, '-' || ? || ' days'),
+                   Sub_id, Url, Title, Body, Keywords, Topic
+            FROM Submission WHERE Id NOT LIKE '%\\_%' ESCAPE '\\'
+            """,
+            (copy, copy % 50, copy),
+        )
+    connexion.commit()
+    connexion.close()
+
+
+def run(
+    label: str,
+    connexion: sqlite3.Connection,
+    command: str,
+    params: list[tuple],
+) -> float:
+    plan: str = " / ".join(
+        row[3] for row in connexion.execute(f"EXPLAIN QUERY PLAN {command}", params[0])
+    )
+    start: float = time.perf_counter()
+    for param in params:
+        connexion.execute(command, param).fetchall()
+    elapsed: float = time.perf_counter() - start
+    print(f"{label:<32} {elapsed * 1000:9.1f} ms  [{plan}]")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--scale", type=int, default=50)
+    parser.add_argument("--iterations", type=int, default=500)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        filepath: str = shutil.copy(DATASET, os.path.join(directory, "bench.db"))
+        replicate(filepath, args.scale)
+
+        connexion: sqlite3.Connection = sqlite3.connect(filepath)
+        count: int = connexion.execute("SELECT COUNT(*) FROM Submission").fetchone()[0]
+        first, last = connexion.execute(
+            "SELECT MIN(Created), MAX(Created) FROM Submission"
+        ).fetchone()
+        authors: list[str] = [
+            row[0] for row in connexion.execute("SELECT DISTINCT Author_id FROM Submission")
+        ]
+        print(f"Dataset : {DATASET} x{args.scale} ({count} submissions)")
+
+        # Fenêtres d'une journée tirées aléatoirement sur toute la période couverte
+        random.seed(0)
+        first_date = datetime.strptime(first, "%Y-%m-%d %H:%M:%S.%f")
+        span: float = (
+            datetime.strptime(last, "%Y-%m-%d %H:%M:%S.%f") - first_date
+        ).total_seconds()
+        windows: list[tuple[datetime, datetime]] = []
+        for _ in range(args.iterations):
+            start = first_date + timedelta(seconds=random.uniform(0, span))
+            windows.append((start, start + timedelta(days=1)))
+        sample_authors: list[tuple] = [
+            (random.choice(authors),) for _ in range(args.iterations)
+        ]
+
+        print("-- Before migration")
+        before_range = run(
+            "range on Created (TEXT)",
+            connexion,
+            "SELECT Id, Title FROM Submission WHERE Created >= ? AND Created < ?",
+            [
+                (start.strftime("%Y-%m-%d %H:%M:%S.000"), end.strftime("%Y-%m-%d %H:%M:%S.000"))
+                for start, end in windows
+            ],
+        )
+        before_author = run(
+            "lookup by Author_id",
+            connexion,
+            "SELECT Id FROM Submission WHERE Author_id = ?",
+            sample_authors,
+        )
+        connexion.close()
+
+        with DatabaseManager("", filepath=filepath) as database:
+            database.migrate()
+
+        connexion = sqlite3.connect(filepath)
+        print("-- After migration")
+        after_range = run(
+            "range on Created_utc (INTEGER)",
+            connexion,
+            "SELECT Id, Title FROM Submission WHERE Created_utc >= ? AND Created_utc < ?",
+            [(int(start.timestamp()), int(end.timestamp())) for start, end in windows],
+        )
+        after_author = run(
+            "lookup by Author_id",
+            connexion,
+            "SELECT Id FROM Submission WHERE Author_id = ?",
+            sample_authors,
+        )
+        connexion.close()
+
+        print(f"Speed-up range queries : x{before_range / after_range:.1f}")
+        print(f"Speed-up author lookups: x{before_author / after_author:.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Benchmark of keyword chunking: the legacy per-keyword tokenization against the
+shared token counter of LLM.Tokens (batch encoding and memoized counts).
+
+Usage: python -m Benchmarks.token_counting [--keywords N] [--distinct N] [--max-tokens N]
+
+Offline, both paths count tokens with the approximation of LLM.Tokens.encoding().
+"""
+
+import argparse
+import random
+import time
+from collections.abc import Callable
+from Database.Types import DbWeightedKeyword
+from LLM import Tokens
+from LLM.Agent import LLMAgent
+from LLM.Types import LLMCategoryRequestFormat
+
+
+def legacy_chunk_keywords(
+    request: LLMCategoryRequestFormat, max_tokens: int
+) -> list[LLMCategoryRequestFormat]:
+    """Reproduces the former behaviour: one encode per keyword repr, nothing memoized."""
+
+    # Même encodage que le compteur partagé, y compris son approximation hors ligne
+    tokenizer = Tokens.encoding()
+    chunks: list[LLMCategoryRequestFormat] = []
+    current_chunk: list[DbWeightedKeyword] = []
+    current_tokens: int = 0
+    for weighted_keyword in request["weighted_objects"]:
+        keyword_tokens: int = len(tokenizer.encode(str(weighted_keyword)))
+        if current_tokens + keyword_tokens > max_tokens:
+            chunks.append(
+                {"weighted_objects": current_chunk, "category_number": request["category_number"]}
+            )
+            current_chunk, current_tokens = [weighted_keyword], keyword_tokens
+        else:
+            current_chunk.append(weighted_keyword)
+            current_tokens += keyword_tokens
+    if current_chunk:
+        chunks.append(
+            {"weighted_objects": current_chunk, "category_number": request["category_number"]}
+        )
+    return chunks
+
+
+def generate_keywords(count: int, distinct: int) -> list[DbWeightedKeyword]:
+    """Draws count weighted keywords among distinct ones, with a skewed (Zipf-like) frequency."""
+
+    randomizer: random.Random = random.Random(0)
+    syllables: list[str] = ["ma", "ri", "zon", "é", "lec", "tion", "pa", "ris", "vé", "lo", "crè", "che"]
+    vocabulary: list[str] = [
+        " ".join(
+            "".join(randomizer.choices(syllables, k=randomizer.randint(2, 4)))
+            for _ in range(randomizer.randint(1, 3))
+        )
+        for _ in range(distinct)
+    ]
+    weights: list[float] = [1 / (rank + 1) for rank in range(distinct)]
+    return [
+        DbWeightedKeyword(Keyword=keyword, Weight=randomizer.randint(1, 20))
+        for keyword in randomizer.choices(vocabulary, weights=weights, k=count)
+    ]
+
+
+def timeit(label: str, function: Callable[[], list]) -> float:
+    start: float = time.perf_counter()
+    chunks: list = function()
+    elapsed: float = time.perf_counter() - start
+    print(f"{label:<45} {elapsed * 1000:10.1f} ms  ({len(chunks)} chunks)")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--keywords", type=int, default=100_000)
+    parser.add_argument("--distinct", type=int, default=20_000)
+    parser.add_argument("--max-tokens", type=int, default=7500)
+    args = parser.parse_args()
+
+    request: LLMCategoryRequestFormat = LLMCategoryRequestFormat(
+        weighted_objects=generate_keywords(args.keywords, args.distinct), category_number=10
+    )
+    # Le découpage n'appelle pas le modèle : aucun déploiement Azure n'est nécessaire
+    agent: LLMAgent = LLMAgent.__new__(LLMAgent)
+    Tokens.encoding()  # Chargement de l'encodage hors mesure
+
+    print(f"{args.keywords} keywords ({args.distinct} distinct), max {args.max_tokens} tokens per chunk")
+    legacy: float = timeit(
+        "legacy (encode per keyword)", lambda: legacy_chunk_keywords(request, args.max_tokens)
+    )
+    cold: float = timeit(
+        "shared counter (cold memo)", lambda: agent.chunk_keywords(request, args.max_tokens)
+    )
+    warm: float = timeit(
+        "shared counter (warm memo)", lambda: agent.chunk_keywords(request, args.max_tokens)
+    )
+
+    print(f"Speed-up cold : x{legacy / cold:.1f}")
+    print(f"Speed-up warm : x{legacy / warm:.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,267 @@
+"""
+Import d'archives Reddit (NDJSON compressé en zstd, une soumission ou un commentaire par ligne).
+
+Usage :
+    python -m Crawler.Archive RS_2023-01.zst RC_2023-01.zst --subreddit AskFrance [--start 2023-01-01] [--end 2023-02-01]
+        [--database askfrance_new] [--workers 4]
+"""
+
+import argparse
+from collections import deque
+from collections.abc import Iterator
+from concurrent.futures import Future, ProcessPoolExecutor
+from datetime import datetime
+import io
+import json
+import os
+import time
+import zstandard
+from Database.Manager import DatabaseManager
+from Database.Types import DbComment, DbSubmission, DbUser
+from .Mapping import RedditMapper
+
+
+# Convertisseur propre à chaque processus du pool (sans client Reddit : aucune requête)
+_mapper: RedditMapper | None = None
+
+
+def parse_lines(
+    lines: list[bytes],
+    subreddits: frozenset[str],
+    start: float | None,
+    end: float | None,
+) -> tuple[list[DbSubmission], list[DbComment], list[DbUser], int]:
+    """
+    Décode, filtre et convertit un paquet de lignes (exécuté dans un processus du pool).
+
+    :param lines: list[bytes] - Les lignes JSON.
+    :param subreddits: frozenset[str] - Les subreddits retenus (en minuscules), tous si vide.
+    :param start: float | None - La date de création minimale (epoch), incluse.
+    :param end: float | None - La date de création maximale (epoch), exclue.
+    :return: tuple[list[DbSubmission], list[DbComment], list[DbUser], int] - Les lignes retenues
+             et le nombre de lignes illisibles.
+    """
+
+    global _mapper
+    if _mapper is None:
+        _mapper = RedditMapper()
+
+    submissions: list[DbSubmission] = []
+    comments: list[DbComment] = []
+    users: dict[str, DbUser] = {}
+    errors: int = 0
+
+    # Filtre grossier sur le texte brut, avant le décodage JSON (de loin l'étape la plus coûteuse)
+    needles: list[bytes] = [name.encode() for name in subreddits]
+
+    for line in lines:
+        if needles:
+            lowered: bytes = line.lower()
+            if not any(needle in lowered for needle in needles):
+                continue
+
+        try:
+            data: dict = json.loads(line)
+            if subreddits and str(data.get("subreddit", "")).lower() not in subreddits:
+                continue
+
+            created: float = float(data["created_utc"])
+            if (start is not None and created < start) or (end is not None and created >= end):
+                continue
+            data["created_utc"] = created
+
+            if "link_id" in data:
+                row, user = _mapper.comment(data)
+                comments.append(row)
+            else:
+                # Champs absents des archives les plus anciennes
+                data.setdefault("selftext", "")
+                data.setdefault("url", "")
+                row, user = _mapper.submission(data)
+                submissions.append(row)
+            if user is not None:
+                users[user["Id"]] = user
+
+        except (ValueError, KeyError, TypeError):
+            errors += 1
+
+    return submissions, comments, list(users.values()), errors
+
+
+class ArchiveImporter:
+    """
+    Importe une archive NDJSON compressée en zstd en mémoire bornée.
+
+    L'archive est décompressée en flux et découpée en paquets de lignes, décodés et
+    filtrés par un pool de processus. Au plus deux paquets par processus sont en vol, et
+    les résultats sont écrits dans l'ordre de lecture : après chaque paquet, la position
+    atteinte (en octets décompressés) est enregistrée dans la table ImportState. Un import
+    interrompu reprend à cette position ; la décompression des octets déjà importés est
+    refaite (un flux zstd ne se parcourt pas au hasard) mais leur décodage est sauté.
+    """
+
+    def __init__(
+        self,
+        database: DatabaseManager,
+        subreddits: list[str] | None = None,
+        start: datetime | None = None,
+        end: datetime | None = None,
+        workers: int | None = None,
+        chunk_lines: int = 20_000,
+        report_interval: float = 10.0,
+    ) -> None:
+        """
+        :param database: DatabaseManager - La base dans laquelle importer.
+        :param subreddits: list[str] | None - Les subreddits retenus, tous si None.
+        :param start: datetime | None - La date de création minimale, incluse (optionnel).
+        :param end: datetime | None - La date de création maximale, exclue (optionnel).
+        :param workers: int | None - Le nombre de processus (par défaut, le nombre de cœurs).
+        :param chunk_lines: int - Le nombre de lignes par paquet.
+        :param report_interval: float - L'intervalle (s) entre deux affichages de la progression.
+        """
+
+        self._database = database
+        self._subreddits: frozenset[str] = frozenset(
+            name.lower() for name in subreddits or []
+        )
+        self._start: float | None = start.timestamp() if start is not None else None
+        self._end: float | None = end.timestamp() if end is not None else None
+        self._workers: int = workers or os.cpu_count() or 1
+        self._chunk_lines = chunk_lines
+        self._report_interval = report_interval
+
+    @staticmethod
+    def _chunks(
+        filepath: str, offset: int, chunk_lines: int
+    ) -> Iterator[tuple[list[bytes], int]]:
+        """
+        Décompresse l'archive en flux et retourne des paquets de lignes complètes.
+
+        :return: Iterator[tuple[list[bytes], int]] - Les paquets et la position (octets décompressés) de leur fin.
+        """
+
+        with open(filepath, "rb") as file:
+            # Les archives Reddit utilisent une fenêtre de compression de 2 Gio
+            reader = zstandard.ZstdDecompressor(max_window_size=2**31).stream_reader(file)
+            stream = io.BufferedReader(reader, buffer_size=1 << 20)
+
+            # Reprise : les octets déjà importés sont décompressés sans être découpés
+            skipped: int = 0
+            while skipped < offset:
+                data: bytes = stream.read(min(offset - skipped, 1 << 24))
+                if not data:
+                    return
+                skipped += len(data)
+
+            position: int = offset
+            lines: list[bytes] = []
+            for line in stream:
+                position += len(line)
+                if not line.endswith(b"\n"):
+                    # Dernière ligne tronquée (archive incomplète) : ignorée
+                    position -= len(line)
+                    break
+                lines.append(line)
+                if len(lines) >= chunk_lines:
+                    yield lines, position
+                    lines = []
+
+            if lines:
+                yield lines, position
+
+    def _write(self, result: tuple[list[DbSubmission], list[DbComment], list[DbUser], int]) -> int:
+        """Écrit les lignes d'un paquet et retourne leur nombre."""
+
+        submissions, comments, users, _ = result
+        if users:
+            self._database.add_users(users, on_conflict="update")
+        if submissions:
+            self._database.add_submissions(submissions)
+        if comments:
+            self._database.add_comments(comments)
+        return len(submissions) + len(comments)
+
+    def import_file(self, filepath: str) -> int:
+        """
+        Importe (ou reprend l'import d') une archive.
+
+        :param filepath: str - Le chemin de l'archive .zst.
+        :return: int - Le nombre de soumissions et commentaires écrits.
+        """
+
+        source: str = os.path.basename(filepath)
+        offset: int = self._database.get_import_offset(source)
+        if offset:
+            print(f"{source} - Reprise à l'octet {offset}...")
+
+        started: float = time.perf_counter()
+        next_report: float = started + self._report_interval
+        lines: int = 0
+        rows: int = 0
+        errors: int = 0
+
+        with ProcessPoolExecutor(max_workers=self._workers) as executor:
+            in_flight: deque[tuple[Future, int]] = deque()
+
+            def collect():
+                nonlocal rows, errors, next_report
+                future, position = in_flight.popleft()
+                result = future.result()
+                rows += self._write(result)
+                errors += result[3]
+                self._database.save_import_offset(source, position)
+
+                now: float = time.perf_counter()
+                if now >= next_report:
+                    elapsed: float = now - started
+                    print(
+                        f"{source} - {lines} ligne(s) lue(s) ({(position - offset) / elapsed / 2**20:.1f} Mio/s), "
+                        f"{rows} écrite(s) ({rows / elapsed:.0f}/s), {errors} illisible(s)"
+                    )
+                    next_report = now + self._report_interval
+
+            for chunk, position in self._chunks(filepath, offset, self._chunk_lines):
+                if len(in_flight) >= 2 * self._workers:
+                    collect()
+                lines += len(chunk)
+                in_flight.append(
+                    (
+                        executor.submit(
+                            parse_lines, chunk, self._subreddits, self._start, self._end
+                        ),
+                        position,
+                    )
+                )
+
+            while in_flight:
+                collect()
+
+        elapsed: float = time.perf_counter() - started
+        print(
+            f"{source} - Import terminé : {lines} ligne(s) lue(s), {rows} écrite(s) "
+            f"en {elapsed:.1f}s ({rows / elapsed if elapsed > 0 else 0:.0f}/s), {errors} illisible(s)."
+        )
+        return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("files", nargs="+")
+    parser.add_argument("--subreddit", action="append", dest="subreddits")
+    parser.add_argument("--start", type=datetime.fromisoformat)
+    parser.add_argument("--end", type=datetime.fromisoformat)
+    parser.add_argument("--database", default="askfrance_new")
+    parser.add_argument("--workers", type=int)
+    args = parser.parse_args()
+
+    with DatabaseManager(name=args.database) as database:
+        database.create()
+        importer = ArchiveImporter(
+            database, args.subreddits, args.start, args.end, workers=args.workers
+        )
+        for filepath in args.files:
+            importer.import_file(filepath)
+
+
+if __name__ == "__main__":
+    main()
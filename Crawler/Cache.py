@@ -0,0 +1,248 @@
+from collections.abc import Mapping
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import Any, Literal
+import prawcore
+from prawcore.requestor import Requestor
+import requests
+from requests.structures import CaseInsensitiveDict
+
+
+CacheMode = Literal["cache", "record", "replay"]
+
+
+class ResponseCache:
+    """
+    Cache disque (SQLite) des réponses de l'API Reddit, utilisé par CachingRequestor.
+
+    Trois modes :
+    - cache : une réponse encore fraîche (selon la durée de vie de son type d'endpoint)
+      est servie depuis le disque, sinon elle est téléchargée puis enregistrée ;
+    - record : tout est téléchargé et enregistré, pour rejouer la session plus tard ;
+    - replay : tout est servi depuis le disque, quel que soit son âge, sans aucun accès
+      réseau (seule l'obtention du jeton d'authentification est simulée) ; une requête
+      absente est une erreur.
+
+    Seules les requêtes GET ayant abouti (200) sont enregistrées. Les en-têtes
+    x-ratelimit-* ne sont pas conservés : une réponse rejouée ne consomme pas de quota.
+    """
+
+    # Durée de vie (s) par type d'endpoint, la première expression correspondant au chemin l'emporte
+    _default_ttls: list[tuple[str, float]] = [
+        (r"^/r/[^/]+/(new|comments|rising)", 60),  # Listings chronologiques
+        (r"^/r/[^/]+/(hot|top|controversial)", 900),
+        (r"^/comments/|^/api/morechildren", 3600),  # Arbres de commentaires
+        (r"^/api/info|^/api/user_data_by_account_ids|/about", 86_400),  # Métadonnées
+    ]
+
+    def __init__(
+        self,
+        filepath: str | None = None,
+        mode: CacheMode = "cache",
+        ttls: list[tuple[str, float]] | None = None,
+        default_ttl: float = 300,
+    ) -> None:
+        """
+        :param filepath: str | None - Chemin du fichier de cache (par défaut http_cache.db dans le dossier du module).
+        :param mode: CacheMode - "cache", "record" ou "replay".
+        :param ttls: list[tuple[str, float]] | None - Les durées de vie (expression sur le chemin, secondes), prioritaires sur celles par défaut.
+        :param default_ttl: float - La durée de vie des endpoints non listés.
+        """
+
+        self._filepath = filepath or os.path.join(
+            os.path.dirname(__file__), "http_cache.db"
+        )
+        self.mode: CacheMode = mode
+        self._ttls: list[tuple[re.Pattern, float]] = [
+            (re.compile(pattern), ttl)
+            for pattern, ttl in (ttls or []) + self._default_ttls
+        ]
+        self._default_ttl = default_ttl
+        self._lock: threading.Lock = threading.Lock()
+        self.hits: int = 0
+        self.misses: int = 0
+
+        self._connexion: sqlite3.Connection = sqlite3.connect(
+            self._filepath, check_same_thread=False
+        )
+        self._connexion.execute("PRAGMA journal_mode = WAL")
+        self._connexion.execute("PRAGMA synchronous = NORMAL")
+        self._connexion.execute("""
+            CREATE TABLE IF NOT EXISTS HttpCache (
+                Key TEXT PRIMARY KEY,
+                Method TEXT NOT NULL,
+                Url TEXT NOT NULL,
+                Status INTEGER NOT NULL,
+                Headers TEXT NOT NULL,
+                Body BLOB NOT NULL,
+                Created_utc REAL NOT NULL
+            ) WITHOUT ROWID
+        """)
+        self._connexion.commit()
+
+    def close(self):
+        self._connexion.close()
+
+    def ttl(self, url: str) -> float:
+        """Retourne la durée de vie (s) des réponses d'une URL."""
+
+        path: str = re.sub(r"^https?://[^/]+", "", url)
+        for pattern, ttl in self._ttls:
+            if pattern.search(path):
+                return ttl
+        return self._default_ttl
+
+    @staticmethod
+    def key(method: str, url: str, params: Mapping[str, Any] | None, data: Any) -> str:
+        """Calcule la clé d'une requête (méthode, URL, paramètres triés et corps)."""
+
+        payload: str = json.dumps(
+            [method.upper(), url, sorted((params or {}).items()), data],
+            default=str,
+            sort_keys=True,
+        )
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def get(self, key: str, max_age: float | None) -> requests.Response | None:
+        """
+        Retourne la réponse enregistrée sous une clé, si elle existe et n'est pas plus vieille que max_age.
+
+        :param key: str - La clé de la requête.
+        :param max_age: float | None - L'âge maximal (s) accepté, None pour l'ignorer.
+        :return: requests.Response | None - La réponse, ou None.
+        """
+
+        with self._lock:
+            row = self._connexion.execute(
+                "SELECT Url, Status, Headers, Body, Created_utc FROM HttpCache WHERE Key = ?",
+                (key,),
+            ).fetchone()
+
+            if row is None or (max_age is not None and time.time() - row[4] > max_age):
+                self.misses += 1
+                return None
+            self.hits += 1
+
+        response = requests.Response()
+        response.url = row[0]
+        response.status_code = row[1]
+        response.headers = CaseInsensitiveDict(json.loads(row[2]))
+        response._content = row[3]
+        response.encoding = "utf-8"
+        return response
+
+    def put(self, key: str, method: str, response: requests.Response):
+        """Enregistre une réponse sous une clé (sans ses en-têtes de quota)."""
+
+        headers: dict[str, str] = {
+            name: value
+            for name, value in response.headers.items()
+            if not name.lower().startswith("x-ratelimit")
+        }
+        with self._lock:
+            self._connexion.execute(
+                """
+                INSERT OR REPLACE INTO HttpCache (Key, Method, Url, Status, Headers, Body, Created_utc)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                """,
+                (
+                    key,
+                    method.upper(),
+                    response.url,
+                    response.status_code,
+                    json.dumps(headers),
+                    response.content,
+                    time.time(),
+                ),
+            )
+            self._connexion.commit()
+
+    def purge(self) -> int:
+        """
+        Supprime les réponses expirées.
+
+        :return: int - Le nombre de réponses supprimées.
+        """
+
+        now: float = time.time()
+        with self._lock:
+            expired: list[str] = [
+                key
+                for key, url, created in self._connexion.execute(
+                    "SELECT Key, Url, Created_utc FROM HttpCache"
+                )
+                if now - created > self.ttl(url)
+            ]
+            self._connexion.executemany(
+                "DELETE FROM HttpCache WHERE Key = ?", ((key,) for key in expired)
+            )
+            self._connexion.commit()
+        return len(expired)
+
+
+class CachingRequestor(Requestor):
+    """
+    Requestor prawcore servant les requêtes depuis un ResponseCache.
+
+    À brancher via praw.Reddit(requestor_class=CachingRequestor, requestor_kwargs={"cache": cache}),
+    ou plus simplement create_reddit(cache=cache).
+    """
+
+    def __init__(self, *args: Any, cache: ResponseCache, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self._cache = cache
+
+    @staticmethod
+    def _replayed_token() -> requests.Response:
+        """Réponse d'authentification simulée pour le mode replay."""
+
+        response = requests.Response()
+        response.status_code = 200
+        response.headers = CaseInsensitiveDict({"content-type": "application/json"})
+        response._content = json.dumps(
+            {
+                "access_token": "replay",
+                "token_type": "bearer",
+                "expires_in": 86_400,
+                "scope": "*",
+            }
+        ).encode()
+        return response
+
+    @staticmethod
+    def _miss(method: str, url: str, args: tuple, kwargs: dict) -> prawcore.exceptions.RequestException:
+        return prawcore.exceptions.RequestException(
+            KeyError(f"Requête absente du cache : {method} {url}"), args, kwargs
+        )
+
+    def request(self, *args: Any, timeout: float | None = None, **kwargs: Any) -> requests.Response:
+        method, url = args[0], args[1]
+        if method.upper() != "GET":
+            if self._cache.mode == "replay":
+                # Seule l'authentification est simulée : une autre requête (vote, envoi,
+                # ...) ne peut pas réussir sans réseau
+                if url.split("?")[0].endswith("/api/v1/access_token"):
+                    return self._replayed_token()
+                raise self._miss(method, url, args, kwargs)
+            return super().request(*args, timeout=timeout, **kwargs)
+
+        key: str = self._cache.key(method, url, kwargs.get("params"), kwargs.get("data"))
+        if self._cache.mode != "record":
+            max_age: float | None = (
+                None if self._cache.mode == "replay" else self._cache.ttl(url)
+            )
+            response: requests.Response | None = self._cache.get(key, max_age)
+            if response is not None:
+                return response
+            if self._cache.mode == "replay":
+                raise self._miss(method, url, args, kwargs)
+
+        response = super().request(*args, timeout=timeout, **kwargs)
+        if response.status_code == 200:
+            self._cache.put(key, method, response)
+        return response
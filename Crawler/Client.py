@@ -0,0 +1,76 @@
+import os
+import praw
+from .Cache import CachingRequestor, ResponseCache
+from .RateLimiter import SharedRateLimiter
+
+
+# Variables d'environnement d'un jeu d'identifiants (voir example.env)
+_credential_variables: dict[str, str] = {
+    "client_id": "CLIENT_ID",
+    "client_secret": "CLIENT_SECRET",
+    "password": "USER_PASSWORD",
+    "user_agent": "USER_AGENT",
+    "username": "USERNAME",
+}
+
+
+def load_credentials() -> list[dict[str, str | None]]:
+    """
+    Lit les jeux d'identifiants Reddit depuis les variables d'environnement.
+
+    Le jeu sans suffixe (CLIENT_ID, ...) est lu en premier, puis les jeux numérotés
+    CLIENT_ID_1, CLIENT_ID_2, ... jusqu'au premier numéro absent.
+
+    :return: list[dict[str, str | None]] - Les paramètres praw.Reddit de chaque jeu.
+    """
+
+    credentials: list[dict[str, str | None]] = []
+    if os.getenv("CLIENT_ID"):
+        credentials.append(
+            {key: os.getenv(variable) for key, variable in _credential_variables.items()}
+        )
+
+    number: int = 1
+    while os.getenv(f"CLIENT_ID_{number}"):
+        credentials.append(
+            {
+                key: os.getenv(f"{variable}_{number}")
+                for key, variable in _credential_variables.items()
+            }
+        )
+        number += 1
+
+    return credentials
+
+
+def create_reddit(
+    rate_limiter: SharedRateLimiter | None = None,
+    credentials: dict[str, str | None] | None = None,
+    cache: ResponseCache | None = None,
+    **overrides,
+) -> praw.Reddit:
+    """
+    Crée un client praw.Reddit configuré depuis les variables d'environnement (voir example.env).
+
+    :param rate_limiter: SharedRateLimiter | None - Limiteur partagé à brancher sur le client (optionnel).
+    :param credentials: dict[str, str | None] | None - Jeu d'identifiants à utiliser à la place de celui sans suffixe (optionnel).
+    :param cache: ResponseCache | None - Cache disque des réponses de l'API (optionnel).
+    :param overrides: Paramètres supplémentaires ou surchargés de praw.Reddit.
+    :return: praw.Reddit - Le client.
+    """
+
+    settings: dict = {
+        key: os.getenv(variable) for key, variable in _credential_variables.items()
+    }
+    settings["ratelimit_seconds"] = 2
+    settings.update(credentials or {})
+    if cache is not None:
+        settings["requestor_class"] = CachingRequestor
+        settings["requestor_kwargs"] = {"cache": cache}
+    settings.update(overrides)
+
+    reddit = praw.Reddit(**settings)
+    if rate_limiter is not None:
+        rate_limiter.install(reddit)
+
+    return reddit
@@ -0,0 +1,147 @@
+from collections.abc import Callable, Iterable
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from contextlib import AbstractContextManager, nullcontext
+import threading
+import praw
+from praw.models import Comment
+from Database.Manager import DatabaseManager
+from Database.Types import DbComment, DbUser
+from .Mapping import RedditMapper
+from .Pool import CredentialPool
+
+
+class CommentFetcher:
+    """
+    Récupère les arbres de commentaires de nombreuses soumissions en parallèle.
+
+    Chaque thread du pool utilise son propre client praw.Reddit (PRAW n'est pas thread-safe),
+    tous partageant le même SharedRateLimiter via reddit_factory. Avec un CredentialPool,
+    chaque soumission est traitée par un client emprunté au jeu d'identifiants ayant le plus
+    de marge. Les écritures en base sont
+    faites par lots depuis le thread appelant, seul utilisateur de la connexion SQLite.
+    """
+
+    def __init__(
+        self,
+        reddit_factory: Callable[[], praw.Reddit] | None,
+        database: DatabaseManager,
+        workers: int = 8,
+        batch_size: int = 500,
+        mapper: RedditMapper | None = None,
+        pool: CredentialPool | None = None,
+    ) -> None:
+        """
+        :param reddit_factory: Callable[[], praw.Reddit] | None - Crée un client par thread (voir Crawler.Client.create_reddit), inutile avec pool.
+        :param database: DatabaseManager - La base dans laquelle écrire les commentaires.
+        :param workers: int - Le nombre de soumissions traitées simultanément.
+        :param batch_size: int - Le nombre de commentaires accumulés avant chaque écriture en base.
+        :param mapper: RedditMapper | None - Le convertisseur partagé (et son cache d'auteurs) (optionnel).
+        :param pool: CredentialPool | None - Le pool de jeux d'identifiants, prioritaire sur reddit_factory (optionnel).
+        """
+
+        if reddit_factory is None and pool is None:
+            raise ValueError("reddit_factory ou pool doit être fourni.")
+
+        self._reddit_factory = reddit_factory
+        self._database = database
+        self._workers = workers
+        self._batch_size = batch_size
+        self._mapper = mapper or RedditMapper()
+        self._pool = pool
+        self._local = threading.local()
+        self._comments: list[DbComment] = []
+        self._users: dict[str, DbUser] = {}
+
+    def _reddit(self) -> praw.Reddit:
+        """Retourne le client praw.Reddit du thread courant, créé au premier appel."""
+
+        if not hasattr(self._local, "reddit"):
+            self._local.reddit = self._reddit_factory()
+        return self._local.reddit
+
+    def _lease(self) -> AbstractContextManager[praw.Reddit]:
+        """Emprunte un client au pool, ou retourne celui du thread courant."""
+
+        if self._pool is not None:
+            return self._pool.lease()
+        return nullcontext(self._reddit())
+
+    def _fetch(self, submission_id: str) -> tuple[list[DbComment], list[DbUser]]:
+        """
+        Récupère l'arbre complet des commentaires d'une soumission (exécuté dans un thread du pool).
+
+        :param submission_id: str - L'identifiant de la soumission.
+        :return: tuple[list[DbComment], list[DbUser]] - Les commentaires et leurs auteurs.
+        """
+
+        with self._lease() as reddit:
+            submission = reddit.submission(id=submission_id)
+            submission.comments.replace_more(limit=None)
+            items: list = submission.comments.list()
+
+        comments: list[DbComment] = []
+        users: list[DbUser] = []
+        for comment in items:
+            if not isinstance(comment, Comment):
+                continue
+
+            db_comment, user = self._mapper.comment(comment)
+            comments.append(db_comment)
+            if user is not None:
+                users.append(user)
+
+        return comments, users
+
+    def _collect(self, futures: Iterable[Future], submission_ids: dict[Future, str]):
+        """Récupère le résultat des tâches terminées et écrit en base quand un lot est complet."""
+
+        for future in futures:
+            submission_id: str = submission_ids.pop(future)
+            try:
+                comments, users = future.result()
+            except Exception as e:
+                print(
+                    f"Soumission '{submission_id}' - Erreur lors de la récupération des commentaires : {e}"
+                )
+                continue
+
+            self._comments.extend(comments)
+            self._users.update((user["Id"], user) for user in users)
+
+        if len(self._comments) >= self._batch_size:
+            self._flush()
+
+    def _flush(self):
+        """Écrit les utilisateurs et commentaires en attente."""
+
+        self._users.update(
+            (user["Id"], user) for user in self._mapper.resolve_pending()
+        )
+        if self._users:
+            self._database.add_users(list(self._users.values()), on_conflict="update")
+            self._users.clear()
+        if self._comments:
+            self._database.add_comments(self._comments, on_conflict="update")
+            self._comments.clear()
+
+    def fetch(self, submission_ids: Iterable[str]):
+        """
+        Récupère et enregistre les commentaires de toutes les soumissions données.
+
+        Le nombre de tâches en vol est borné (2 par thread) : les identifiants peuvent
+        provenir d'un générateur sans être tous chargés en mémoire.
+
+        :param submission_ids: Iterable[str] - Les identifiants des soumissions.
+        """
+
+        with ThreadPoolExecutor(max_workers=self._workers) as executor:
+            in_flight: dict[Future, str] = {}
+            for submission_id in submission_ids:
+                if len(in_flight) >= 2 * self._workers:
+                    done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                    self._collect(done, in_flight)
+                in_flight[executor.submit(self._fetch, submission_id)] = submission_id
+
+            self._collect(wait(in_flight).done, in_flight)
+
+        self._flush()
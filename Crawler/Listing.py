@@ -0,0 +1,164 @@
+from collections import deque
+from collections.abc import Iterator
+import praw
+from praw.models import Submission
+from Database.Manager import DatabaseManager
+from Database.Types import DbCrawlState
+import threading
+
+
+class ListingCrawler:
+    """
+    Parcourt un listing chronologique de subreddit (par défaut "new") de façon incrémentale.
+
+    Le filigrane (élément le plus récent de la dernière collecte terminée) est enregistré
+    dans la table CrawlState : une collecte s'arrête dès qu'elle l'atteint au lieu de
+    reparcourir des données déjà connues. Un point de reprise est enregistré régulièrement,
+    si bien qu'une collecte interrompue reprend là où elle s'était arrêtée.
+
+    Le point de reprise et le filigrane n'avancent que sur acquittement : un élément n'est
+    considéré comme traité qu'une fois acknowledge() appelé pour lui ou pour un élément
+    retourné après lui. Avec manual_ack=False, l'élément est acquitté dès que l'appelant
+    demande le suivant ; avec manual_ack=True, c'est à l'appelant (par exemple l'étape
+    d'écriture de CrawlPipeline, après validation de sa transaction) de le faire.
+    """
+
+    def __init__(
+        self,
+        reddit: praw.Reddit,
+        database: DatabaseManager,
+        subreddit: str,
+        listing: str = "new",
+        limit: int | None = 1000,
+        checkpoint_every: int = 25,
+        manual_ack: bool = False,
+    ) -> None:
+        """
+        :param reddit: praw.Reddit - Le client Reddit.
+        :param database: DatabaseManager - La base contenant la table CrawlState.
+        :param subreddit: str - Le nom du subreddit.
+        :param listing: str - Le listing chronologique à parcourir ("new" ou "comments").
+        :param limit: int | None - Le nombre maximal d'éléments lus par passe (Reddit en sert au plus 1000).
+        :param checkpoint_every: int - Le nombre d'éléments acquittés automatiquement entre deux enregistrements du point de reprise.
+        :param manual_ack: bool - Les éléments sont acquittés par l'appelant (voir acknowledge).
+        """
+
+        self._reddit = reddit
+        self._database = database
+        self._subreddit = subreddit
+        self._listing = listing
+        self._limit = limit
+        self._checkpoint_every = checkpoint_every
+        self._manual_ack = manual_ack
+        # États à enregistrer une fois l'élément associé acquitté, dans l'ordre de parcours ;
+        # un fullname None marque la fin d'une passe, effective dès que ce qui précède l'est
+        self._pending: deque[tuple[str | None, DbCrawlState]] = deque()
+        self._lock: threading.Lock = threading.Lock()
+
+    def crawl(self) -> Iterator[Submission]:
+        """
+        Retourne les éléments plus récents que le filigrane, du plus récent au plus ancien.
+
+        :return: Iterator[Submission] - Les nouveaux éléments du listing.
+        """
+
+        state: DbCrawlState = self._database.get_crawl_state(
+            self._subreddit, self._listing
+        ) or DbCrawlState(
+            Subreddit=self._subreddit,
+            Listing=self._listing,
+            Newest_fullname=None,
+            Newest_created_utc=None,
+            Head_fullname=None,
+            Head_created_utc=None,
+            Checkpoint_fullname=None,
+        )
+
+        # Reprise d'une collecte interrompue, depuis son dernier point de reprise
+        if state["Checkpoint_fullname"] is not None:
+            print(
+                f"r/{self._subreddit} ({self._listing}) - Reprise après {state['Checkpoint_fullname']}..."
+            )
+            yield from self._walk(state, after=state["Checkpoint_fullname"])
+
+        # Nouvelle passe depuis le haut du listing jusqu'au filigrane
+        yield from self._walk(state, after=None)
+
+    def acknowledge(self, fullname: str, save: bool = True):
+        """
+        Marque comme traités l'élément fullname et tous ceux retournés avant lui.
+
+        Les fins de passe qui ne dépendaient plus que de ces éléments sont enregistrées
+        (nouveau filigrane) quelle que soit la valeur de save. Un fullname inconnu est ignoré.
+
+        :param fullname: str - Le fullname du dernier élément traité.
+        :param save: bool - Enregistrer le point de reprise correspondant.
+        """
+
+        with self._lock:
+            if all(pending != fullname for pending, _ in self._pending):
+                return
+
+            state: DbCrawlState | None = None
+            while True:
+                pending, state = self._pending.popleft()
+                if pending == fullname:
+                    break
+            # Fins de passe qui suivent immédiatement l'élément acquitté
+            while self._pending and self._pending[0][0] is None:
+                state = self._pending.popleft()[1]
+                save = True
+
+            if save:
+                self._database.save_crawl_state(state)
+
+    def _walk(self, state: DbCrawlState, after: str | None) -> Iterator[Submission]:
+        """
+        Parcourt le listing (éventuellement à partir de after) jusqu'au filigrane, puis fait
+        du premier élément de la collecte le nouveau filigrane une fois tout acquitté.
+        """
+
+        listing = getattr(self._reddit.subreddit(self._subreddit), self._listing)(
+            limit=self._limit, params={"after": after} if after else None
+        )
+
+        processed: int = 0
+        for item in listing:
+            if item.fullname == state["Newest_fullname"] or (
+                state["Newest_created_utc"] is not None
+                and int(item.created_utc) < state["Newest_created_utc"]
+            ):
+                break
+
+            if state["Head_fullname"] is None:
+                state["Head_fullname"] = item.fullname
+                state["Head_created_utc"] = int(item.created_utc)
+
+            state["Checkpoint_fullname"] = item.fullname
+            with self._lock:
+                self._pending.append((item.fullname, DbCrawlState(**state)))
+
+            yield item
+
+            processed += 1
+            if not self._manual_ack:
+                self.acknowledge(
+                    item.fullname, save=processed % self._checkpoint_every == 0
+                )
+
+        # Passe terminée : la tête de la collecte devient le filigrane, une fois les
+        # éléments de la passe acquittés
+        if state["Head_fullname"] is not None:
+            state["Newest_fullname"] = state["Head_fullname"]
+            state["Newest_created_utc"] = state["Head_created_utc"]
+        state["Head_fullname"] = None
+        state["Head_created_utc"] = None
+        state["Checkpoint_fullname"] = None
+        with self._lock:
+            if self._pending:
+                self._pending.append((None, DbCrawlState(**state)))
+            else:
+                self._database.save_crawl_state(state)
+        print(
+            f"r/{self._subreddit} ({self._listing}) - {processed} nouvel(s) élément(s)."
+        )
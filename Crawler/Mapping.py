@@ -0,0 +1,235 @@
+from collections import OrderedDict
+from collections.abc import Iterator, Mapping
+from contextlib import contextmanager
+from datetime import datetime
+import threading
+from typing import Any
+import praw
+from Database.Types import DbComment, DbSubmission, DbUser
+from .Pool import CredentialPool
+
+
+class LRUCache:
+    """Petit cache LRU (clé -> valeur) de taille bornée."""
+
+    def __init__(self, size: int) -> None:
+        self._size: int = size
+        self._items: OrderedDict[str, str] = OrderedDict()
+
+    def get(self, key: str) -> str | None:
+        value: str | None = self._items.get(key)
+        if value is not None:
+            self._items.move_to_end(key)
+        return value
+
+    def put(self, key: str, value: str):
+        self._items[key] = value
+        self._items.move_to_end(key)
+        if len(self._items) > self._size:
+            self._items.popitem(last=False)
+
+
+def item_data(item: Any) -> Mapping[str, Any]:
+    """
+    Retourne les champs JSON d'un élément de listing sans déclencher de requête.
+
+    Les objets PRAW stockent les champs reçus dans leurs attributs d'instance : les lire
+    via vars() évite le chargement paresseux (une requête HTTP) qu'un getattr sur un
+    attribut absent provoquerait. Un dict JSON brut est retourné tel quel.
+    """
+
+    return item if isinstance(item, Mapping) else vars(item)
+
+
+class RedditMapper:
+    """
+    Construit les DbSubmission, DbComment et DbUser directement depuis les champs JSON des
+    listings (author_fullname, subreddit_id, ...), sans accès paresseux par objet comme
+    submission.author.id qui coûte une requête par auteur.
+
+    Les identifiants d'auteurs connus sont gardés dans un cache LRU. Les auteurs dont on ne
+    connaît que l'identifiant sont résolus par lots de 100 via l'endpoint
+    /api/user_data_by_account_ids (resolve_pending) ; ceux dont on ne connaît que le nom
+    sont résolus un par un (Reddit n'a pas d'endpoint groupé par nom), puis mis en cache.
+
+    Le convertisseur peut être partagé entre threads : la résolution par nom emprunte un
+    client au pool s'il est fourni, sinon l'accès au client partagé est sérialisé.
+    """
+
+    def __init__(
+        self,
+        reddit: praw.Reddit | None = None,
+        cache_size: int = 100_000,
+        pool: CredentialPool | None = None,
+    ) -> None:
+        """
+        :param reddit: praw.Reddit | None - Client utilisé pour résoudre les auteurs incomplets (optionnel).
+        :param cache_size: int - Le nombre d'auteurs gardés en cache.
+        :param pool: CredentialPool | None - Le pool auquel emprunter un client pour la résolution par nom (optionnel).
+        """
+
+        self._reddit = reddit
+        self._pool = pool
+        self._lock: threading.Lock = threading.Lock()
+        self._client_lock: threading.Lock = threading.Lock()  # Accès au client partagé
+        self._names: LRUCache = LRUCache(cache_size)  # Id -> Name
+        self._ids: LRUCache = LRUCache(cache_size)  # Name -> Id
+        # Id sans nom connu, par ordre d'arrivée ; au-delà de cache_size, les plus anciens sont oubliés
+        self._pending: dict[str, None] = {}
+        self._max_pending: int = cache_size
+
+    @contextmanager
+    def _lease(self) -> Iterator[praw.Reddit]:
+        """Emprunte un client au pool, ou verrouille le client partagé le temps de la requête."""
+
+        if self._pool is not None:
+            with self._pool.lease() as reddit:
+                yield reddit
+        else:
+            with self._client_lock:
+                yield self._reddit
+
+    def _author(self, data: Mapping[str, Any]) -> tuple[str | None, DbUser | None]:
+        """
+        Extrait l'auteur d'un élément.
+
+        :return: tuple[str | None, DbUser | None] - L'identifiant de l'auteur (sans préfixe t2_)
+                 et l'utilisateur à enregistrer s'il est complet.
+        """
+
+        author = data.get("author")
+        name: str | None = (
+            str(author) if author is not None and str(author) != "[deleted]" else None
+        )
+        fullname: str | None = data.get("author_fullname")
+        author_id: str | None = fullname[3:] if fullname else None
+
+        with self._lock:
+            if author_id is not None and name is not None:
+                self._names.put(author_id, name)
+                self._ids.put(name, author_id)
+                return author_id, DbUser(Id=author_id, Name=name)
+
+            if author_id is not None:
+                name = self._names.get(author_id)
+                if name is None:
+                    # Sans client, l'auteur ne pourra pas être résolu : inutile de le garder
+                    if self._reddit is not None or self._pool is not None:
+                        self._pending[author_id] = None
+                        if len(self._pending) > self._max_pending:
+                            del self._pending[next(iter(self._pending))]
+                    return author_id, None
+                return author_id, DbUser(Id=author_id, Name=name)
+
+            if name is not None:
+                author_id = self._ids.get(name)
+
+        if name is not None and author_id is None and (
+            self._reddit is not None or self._pool is not None
+        ):
+            try:
+                with self._lease() as reddit:
+                    author_id = reddit.redditor(name).id
+            except Exception as e:
+                print(f"Auteur '{name}' - Impossible de résoudre l'identifiant : {e}")
+                return None, None
+            with self._lock:
+                self._names.put(author_id, name)
+                self._ids.put(name, author_id)
+
+        if author_id is None or name is None:
+            return None, None
+        return author_id, DbUser(Id=author_id, Name=name)
+
+    def submission(self, item: Any) -> tuple[DbSubmission, DbUser | None]:
+        """
+        Construit une soumission (et son auteur) depuis un élément de listing.
+
+        :param item: Any - Un objet praw Submission ou le dict JSON correspondant.
+        :return: tuple[DbSubmission, DbUser | None] - La soumission et son auteur, s'il est connu.
+        """
+
+        data: Mapping[str, Any] = item_data(item)
+        author_id, user = self._author(data)
+
+        return (
+            DbSubmission(
+                Id=data["id"],
+                Author_id=author_id if author_id is not None else "None",
+                Created=datetime.fromtimestamp(data["created_utc"]),
+                Sub_id=data["subreddit_id"][3:],
+                Url=data["url"],
+                Title=data["title"],
+                Body=data["selftext"],
+                Keywords=[],
+                Topic="",
+            ),
+            user,
+        )
+
+    def comment(self, item: Any) -> tuple[DbComment, DbUser | None]:
+        """
+        Construit un commentaire (et son auteur) depuis un élément de listing.
+
+        :param item: Any - Un objet praw Comment ou le dict JSON correspondant.
+        :return: tuple[DbComment, DbUser | None] - Le commentaire et son auteur, s'il est connu.
+        """
+
+        data: Mapping[str, Any] = item_data(item)
+        author_id, user = self._author(data)
+
+        return (
+            DbComment(
+                Id=data["id"],
+                Author_id=author_id if author_id is not None else "[Removed]",
+                Created=datetime.fromtimestamp(data["created_utc"]),
+                Parent_id=data["parent_id"],
+                Submission_id=data["link_id"],
+                Body=data["body"] if author_id is not None else "[Removed]",
+            ),
+            user,
+        )
+
+    @property
+    def pending(self) -> int:
+        """Le nombre d'auteurs en attente de résolution."""
+
+        with self._lock:
+            return len(self._pending)
+
+    def resolve_pending(self) -> list[DbUser]:
+        """
+        Résout par lots de 100 les noms des auteurs dont seul l'identifiant est connu.
+
+        Chaque identifiant soumis est retiré de l'attente, résolu ou non (compte supprimé,
+        erreur réseau) : il ne sera de nouveau soumis que s'il réapparaît.
+
+        :return: list[DbUser] - Les auteurs résolus.
+        """
+
+        with self._lock:
+            pending: list[str] = list(self._pending)
+
+        if not pending:
+            return []
+
+        users: list[DbUser] = []
+        try:
+            with self._lease() as reddit:
+                for partial in reddit.redditors.partial_redditors(
+                    f"t2_{author_id}" for author_id in pending
+                ):
+                    author_id: str = partial.fullname[3:]
+                    users.append(DbUser(Id=author_id, Name=partial.name))
+                    with self._lock:
+                        self._names.put(author_id, partial.name)
+                        self._ids.put(partial.name, author_id)
+        except Exception as e:
+            print(f"Erreur lors de la résolution groupée des auteurs : {e}")
+        finally:
+            # Les identifiants arrivés pendant la résolution restent en attente
+            with self._lock:
+                for author_id in pending:
+                    self._pending.pop(author_id, None)
+
+        return users
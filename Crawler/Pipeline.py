@@ -0,0 +1,287 @@
+from collections.abc import Callable, Iterable, Mapping
+from dataclasses import dataclass, field
+import queue
+import threading
+import time
+from typing import Any
+from Database.Manager import DatabaseManager
+from Database.Types import DbComment, DbSubmission, DbUser
+from .Mapping import LRUCache, RedditMapper, item_data
+
+
+# Marque de fin de flux transmise d'une étape à la suivante
+_END = object()
+
+
+@dataclass
+class StageStats:
+    """Compteurs d'une étape du pipeline."""
+
+    name: str
+    items: int = 0
+    busy: float = 0.0  # Secondes passées à travailler
+    blocked: float = 0.0  # Secondes passées à attendre la file suivante (contre-pression)
+    started: float = field(default_factory=time.perf_counter)
+    finished: float | None = None
+
+    @property
+    def elapsed(self) -> float:
+        return (self.finished or time.perf_counter()) - self.started
+
+    @property
+    def throughput(self) -> float:
+        """Éléments traités par seconde depuis le démarrage de l'étape."""
+
+        return self.items / self.elapsed if self.elapsed > 0 else 0.0
+
+    def __str__(self) -> str:
+        return (
+            f"{self.name:<6} {self.items:>8} éléments  {self.throughput:>9.1f}/s  "
+            f"actif {self.busy:>7.2f}s  bloqué {self.blocked:>7.2f}s"
+        )
+
+
+class CrawlPipeline:
+    """
+    Pipeline en trois étapes reliées par des files bornées :
+
+    - fetch : parcourt la source (listing PRAW, archive...) dans le thread appelant ;
+    - map : convertit les éléments en DbSubmission / DbComment / DbUser et élimine les doublons ;
+    - write : écrit les lots en base depuis un thread dédié, avec sa propre connexion SQLite.
+
+    Les files étant bornées, une étape plus rapide que la suivante est mise en attente
+    (contre-pression) : la mémoire reste constante et la latence réseau se recouvre avec
+    les écritures disque. À la sortie (normale ou sur exception), les éléments déjà
+    récupérés sont écrits avant de rendre la main.
+
+    Après chaque transaction validée, le rappel on_commit de run() reçoit le fullname du
+    dernier élément de la source écrit (ou écarté comme doublon) : tous les éléments
+    précédents sont alors eux aussi en base, ce qui permet d'avancer un point de reprise.
+    """
+
+    def __init__(
+        self,
+        database_factory: Callable[[], DatabaseManager],
+        mapper: RedditMapper,
+        queue_size: int = 1000,
+        batch_size: int = 500,
+        flush_interval: float = 2.0,
+        dedup_size: int = 100_000,
+    ) -> None:
+        """
+        :param database_factory: Callable[[], DatabaseManager] - Ouvre la base utilisée par le thread d'écriture.
+        :param mapper: RedditMapper - Le convertisseur des éléments de listing.
+        :param queue_size: int - La capacité de chaque file entre deux étapes.
+        :param batch_size: int - Le nombre de lignes écrites par transaction.
+        :param flush_interval: float - Le délai (s) sans nouvel élément au-delà duquel un lot incomplet est écrit.
+        :param dedup_size: int - Le nombre d'identifiants récents mémorisés pour éliminer les doublons.
+        """
+
+        self._database_factory = database_factory
+        self._mapper = mapper
+        self._queue_size = queue_size
+        self._batch_size = batch_size
+        self._flush_interval = flush_interval
+        self._dedup_size = dedup_size
+        self.stats: dict[str, StageStats] = {}
+
+    @staticmethod
+    def _put(target: queue.Queue, item: Any, stats: StageStats, stop: threading.Event):
+        """Ajoute un élément à une file bornée en comptant le temps d'attente."""
+
+        start: float = time.perf_counter()
+        while not stop.is_set():
+            try:
+                target.put(item, timeout=0.1)
+                break
+            except queue.Full:
+                continue
+        stats.blocked += time.perf_counter() - start
+
+    def _map(
+        self,
+        source: queue.Queue,
+        target: queue.Queue,
+        stop: threading.Event,
+        errors: list[BaseException],
+    ):
+        """
+        Étape map : conversion des éléments et élimination des doublons.
+
+        Les auteurs incomplets sont résolus ici, par lots de 100 : le client Reddit du
+        convertisseur n'est ainsi utilisé que par ce thread.
+        """
+
+        stats: StageStats = self.stats["map"]
+        seen: LRUCache = LRUCache(self._dedup_size)
+
+        def resolve():
+            for user in self._mapper.resolve_pending():
+                self._put(target, ("user", None, user, None), stats, stop)
+
+        item: Any = None
+        try:
+            while (item := source.get()) is not _END:
+                start: float = time.perf_counter()
+                data: Mapping[str, Any] = item_data(item)
+                # Seuls les commentaires portent un link_id
+                kind: str = "comment" if "link_id" in data else "submission"
+                fullname: str | None = data.get("name")
+                if seen.get(f"{kind}:{data['id']}") is not None:
+                    stats.busy += time.perf_counter() - start
+                    # Le doublon est transmis pour que sa position soit acquittée avec le lot
+                    self._put(target, ("skip", None, None, fullname), stats, stop)
+                    continue
+                seen.put(f"{kind}:{data['id']}", data["id"])
+
+                if kind == "comment":
+                    row, user = self._mapper.comment(data)
+                else:
+                    row, user = self._mapper.submission(data)
+                stats.items += 1
+                stats.busy += time.perf_counter() - start
+
+                self._put(target, (kind, row, user, fullname), stats, stop)
+                if self._mapper.pending >= 100:
+                    resolve()
+
+            resolve()
+        except BaseException as e:
+            errors.append(e)
+            stop.set()
+            # Débloque l'étape précédente pour qu'elle puisse se terminer
+            while item is not _END:
+                item = source.get()
+        finally:
+            stats.finished = time.perf_counter()
+            self._put(target, _END, stats, threading.Event())
+
+    def _write(
+        self,
+        source: queue.Queue,
+        stop: threading.Event,
+        errors: list[BaseException],
+        on_commit: Callable[[str], None] | None,
+    ):
+        """Étape write : écriture par lots depuis un thread dédié, puis acquittement."""
+
+        stats: StageStats = self.stats["write"]
+        submissions: list[DbSubmission] = []
+        comments: list[DbComment] = []
+        users: dict[str, DbUser] = {}
+        last_fullname: str | None = None
+
+        database: DatabaseManager = self._database_factory()
+        try:
+
+            def flush():
+                nonlocal last_fullname
+                start: float = time.perf_counter()
+                if users:
+                    database.add_users(list(users.values()), on_conflict="update")
+                if submissions:
+                    database.add_submissions(submissions)
+                if comments:
+                    database.add_comments(comments, on_conflict="update")
+                stats.items += len(submissions) + len(comments)
+                stats.busy += time.perf_counter() - start
+                users.clear()
+                submissions.clear()
+                comments.clear()
+                # Le lot est validé : la source peut avancer son point de reprise
+                if on_commit is not None and last_fullname is not None:
+                    on_commit(last_fullname)
+                last_fullname = None
+
+            while True:
+                try:
+                    item = source.get(timeout=self._flush_interval)
+                except queue.Empty:
+                    flush()
+                    continue
+                if item is _END:
+                    break
+
+                kind, row, user, fullname = item
+                if fullname is not None:
+                    last_fullname = fullname
+                if kind == "comment":
+                    comments.append(row)
+                elif kind == "submission":
+                    submissions.append(row)
+                if user is not None:
+                    users[user["Id"]] = user
+                if len(submissions) + len(comments) >= self._batch_size:
+                    flush()
+
+            flush()
+        except BaseException as e:
+            errors.append(e)
+            stop.set()
+            # Débloque l'étape précédente pour qu'elle puisse se terminer
+            while source.get() is not _END:
+                pass
+        finally:
+            stats.finished = time.perf_counter()
+            database.close()
+
+    def run(
+        self, items: Iterable[Any], on_commit: Callable[[str], None] | None = None
+    ) -> dict[str, StageStats]:
+        """
+        Fait passer les éléments de la source dans le pipeline et attend leur écriture.
+
+        :param items: Iterable[Any] - Les soumissions et commentaires (objets PRAW ou dicts JSON).
+        :param on_commit: Callable[[str], None] | None - Appelé depuis le thread d'écriture après chaque
+                          transaction, avec le fullname du dernier élément de la source écrit (optionnel).
+        :return: dict[str, StageStats] - Les compteurs de chaque étape.
+        """
+
+        mapped: queue.Queue = queue.Queue(maxsize=self._queue_size)
+        fetched: queue.Queue = queue.Queue(maxsize=self._queue_size)
+        stop: threading.Event = threading.Event()
+        errors: list[BaseException] = []
+
+        self.stats = {name: StageStats(name) for name in ("fetch", "map", "write")}
+        threads: list[threading.Thread] = [
+            threading.Thread(
+                target=self._map, args=(fetched, mapped, stop, errors), name="pipeline-map"
+            ),
+            threading.Thread(
+                target=self._write,
+                args=(mapped, stop, errors, on_commit),
+                name="pipeline-write",
+            ),
+        ]
+        for thread in threads:
+            thread.start()
+
+        stats: StageStats = self.stats["fetch"]
+        try:
+            iterator = iter(items)
+            while not stop.is_set():
+                start: float = time.perf_counter()
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    break
+                stats.items += 1
+                stats.busy += time.perf_counter() - start
+
+                self._put(fetched, item, stats, stop)
+        finally:
+            stats.finished = time.perf_counter()
+            self._put(fetched, _END, stats, threading.Event())
+            for thread in threads:
+                thread.join()
+
+        if errors:
+            raise errors[0]
+
+        return self.stats
+
+    def report(self):
+        """Affiche le débit de chaque étape."""
+
+        for stats in self.stats.values():
+            print(stats)
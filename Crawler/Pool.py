@@ -0,0 +1,218 @@
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+import math
+import threading
+import time
+import praw
+import prawcore
+from .Cache import ResponseCache
+from .Client import create_reddit
+from .RateLimiter import SharedRateLimiter
+
+
+@dataclass
+class PooledCredential:
+    """Un jeu d'identifiants du pool, avec son quota et son état de santé."""
+
+    name: str
+    credentials: dict[str, str | None]
+    rate_limiter: SharedRateLimiter = field(default_factory=SharedRateLimiter)
+    clients: list[praw.Reddit] = field(default_factory=list)  # Clients libres
+    leased: int = 0  # Clients en cours d'utilisation
+    failures: int = 0  # Échecs consécutifs
+    quarantines: int = 0  # Mises en quarantaine consécutives
+    quarantined_until: float = 0.0
+
+    def headroom(self) -> float:
+        """Le quota restant, partagé entre les clients en cours d'utilisation."""
+
+        remaining: float = (
+            math.inf if self.rate_limiter.remaining is None else self.rate_limiter.remaining
+        )
+        if (
+            self.rate_limiter.reset_timestamp is not None
+            and self.rate_limiter.reset_timestamp <= time.time()
+        ):
+            # Fenêtre écoulée : le quota est de nouveau plein
+            remaining = math.inf
+        return remaining / (1 + self.leased)
+
+
+class CredentialPool:
+    """
+    Répartit la collecte entre plusieurs applications Reddit (un quota chacune).
+
+    Chaque jeu d'identifiants a son propre SharedRateLimiter, qui suit le quota restant
+    à partir des en-têtes x-ratelimit-* de ses réponses. lease() prête un client du jeu
+    ayant le plus de marge. Un jeu dont les identifiants sont refusés, qui reçoit un 429
+    ou qui échoue max_failures fois de suite est mis en quarantaine, pour une durée qui
+    double à chaque récidive.
+
+    Un client prêté n'est utilisé que par un thread à la fois (PRAW n'est pas thread-safe) :
+    plusieurs clients peuvent être créés pour un même jeu, ils partagent alors son limiteur.
+    """
+
+    def __init__(
+        self,
+        credentials: list[dict[str, str | None]],
+        max_failures: int = 3,
+        quarantine: float = 300.0,
+        max_quarantine: float = 3600.0,
+        cache: ResponseCache | None = None,
+    ) -> None:
+        """
+        :param credentials: list[dict[str, str | None]] - Les jeux d'identifiants (voir Crawler.Client.load_credentials).
+        :param max_failures: int - Le nombre d'échecs consécutifs entraînant une mise en quarantaine.
+        :param quarantine: float - La durée (s) de la première mise en quarantaine.
+        :param max_quarantine: float - La durée maximale (s) d'une mise en quarantaine.
+        :param cache: ResponseCache | None - Cache disque des réponses, partagé par tous les clients (optionnel).
+        """
+
+        if not credentials:
+            raise ValueError("Le pool doit contenir au moins un jeu d'identifiants.")
+
+        self._lock: threading.Lock = threading.Lock()
+        self._available: threading.Condition = threading.Condition(self._lock)
+        self._max_failures = max_failures
+        self._quarantine = quarantine
+        self._max_quarantine = max_quarantine
+        self._cache = cache
+        self.credentials: list[PooledCredential] = [
+            PooledCredential(
+                name=str(settings.get("username") or settings.get("client_id") or index),
+                credentials=settings,
+            )
+            for index, settings in enumerate(credentials)
+        ]
+
+    def __len__(self) -> int:
+        return len(self.credentials)
+
+    @property
+    def requests(self) -> int:
+        """Le nombre total de requêtes émises par les clients du pool."""
+
+        return sum(credential.rate_limiter.requests for credential in self.credentials)
+
+    def _select(self) -> PooledCredential:
+        """Choisit le jeu disponible ayant le plus de marge, en attendant si tous sont en quarantaine."""
+
+        while True:
+            now: float = time.time()
+            available: list[PooledCredential] = [
+                credential
+                for credential in self.credentials
+                if credential.quarantined_until <= now
+            ]
+            if available:
+                return max(
+                    available,
+                    key=lambda credential: (credential.headroom(), -credential.leased),
+                )
+
+            self._available.wait(
+                min(credential.quarantined_until for credential in self.credentials) - now
+            )
+
+    def _client(self, credential: PooledCredential) -> praw.Reddit:
+        """Retourne un client libre du jeu, créé si nécessaire."""
+
+        if credential.clients:
+            return credential.clients.pop()
+        return create_reddit(
+            credential.rate_limiter, credentials=credential.credentials, cache=self._cache
+        )
+
+    def _quarantine_credential(self, credential: PooledCredential, duration: float | None = None):
+        """Met un jeu d'identifiants en quarantaine."""
+
+        credential.quarantines += 1
+        if duration is None:
+            duration = min(
+                self._quarantine * 2 ** (credential.quarantines - 1), self._max_quarantine
+            )
+        credential.quarantined_until = time.time() + duration
+        credential.failures = 0
+        print(f"Identifiants '{credential.name}' en quarantaine pour {duration:.0f}s.")
+
+    def _record_failure(self, credential: PooledCredential, error: Exception):
+        """Comptabilise un échec et met le jeu en quarantaine si nécessaire."""
+
+        if isinstance(error, prawcore.exceptions.TooManyRequests):
+            # Quota dépassé : inutile de réessayer avant la remise à zéro de la fenêtre
+            reset: float | None = credential.rate_limiter.reset_timestamp
+            self._quarantine_credential(
+                credential,
+                max(reset - time.time(), 1.0) if reset is not None else None,
+            )
+        elif isinstance(
+            error, (prawcore.exceptions.OAuthException, prawcore.exceptions.InvalidToken)
+        ):
+            # Identifiants refusés
+            self._quarantine_credential(credential)
+        elif isinstance(
+            error, (prawcore.exceptions.RequestException, prawcore.exceptions.ServerError)
+        ):
+            credential.failures += 1
+            if credential.failures >= self._max_failures:
+                self._quarantine_credential(credential)
+
+    @contextmanager
+    def lease(self) -> Iterator[praw.Reddit]:
+        """
+        Prête un client du jeu d'identifiants ayant le plus de marge.
+
+        Les erreurs levées pendant le prêt sont comptabilisées contre ce jeu, puis propagées.
+
+        :return: Iterator[praw.Reddit] - Le client, à n'utiliser que dans le bloc with.
+        """
+
+        with self._lock:
+            credential: PooledCredential = self._select()
+            credential.leased += 1
+
+        client: praw.Reddit = self._client(credential)
+        try:
+            yield client
+        except Exception as e:
+            with self._lock:
+                self._record_failure(credential, e)
+            raise
+        else:
+            with self._lock:
+                credential.failures = 0
+                credential.quarantines = 0
+        finally:
+            with self._lock:
+                credential.leased -= 1
+                credential.clients.append(client)
+                self._available.notify_all()
+
+    def client(self) -> praw.Reddit:
+        """
+        Crée un client dédié sur le jeu ayant actuellement le plus de marge, pour un
+        usage prolongé par un seul thread (il ne suit pas les quarantaines ultérieures).
+        """
+
+        with self._lock:
+            credential: PooledCredential = self._select()
+        return create_reddit(
+            credential.rate_limiter, credentials=credential.credentials, cache=self._cache
+        )
+
+    def report(self):
+        """Affiche le quota et l'état de chaque jeu d'identifiants."""
+
+        now: float = time.time()
+        for credential in self.credentials:
+            limiter: SharedRateLimiter = credential.rate_limiter
+            state: str = (
+                f"quarantaine {credential.quarantined_until - now:.0f}s"
+                if credential.quarantined_until > now
+                else "disponible"
+            )
+            print(
+                f"{credential.name:<20} {limiter.requests:>7} requête(s)  "
+                f"restant {limiter.remaining if limiter.remaining is not None else '?':>6}  {state}"
+            )
@@ -0,0 +1,102 @@
+from collections.abc import Callable, Mapping
+import threading
+import time
+from typing import Any
+import praw
+
+
+class SharedRateLimiter:
+    """
+    Limiteur de débit partagé entre plusieurs clients praw.Reddit (et donc entre threads).
+
+    Il remplace le RateLimiter interne de prawcore, qui n'est pas partagé entre clients :
+    le quota restant et l'échéance de sa remise à zéro sont lus dans les en-têtes
+    x-ratelimit-* de chaque réponse, et les requêtes sont réparties uniformément sur la
+    fenêtre restante au lieu d'attendre un délai fixe.
+    """
+
+    def __init__(self, max_delay: float = 10.0) -> None:
+        """
+        :param max_delay: float - Attente maximale entre deux requêtes tant que le quota n'est pas épuisé.
+        """
+
+        self._lock: threading.Lock = threading.Lock()
+        self._max_delay: float = max_delay
+        self.remaining: float | None = None
+        self.used: int | None = None
+        self.reset_timestamp: float | None = None
+        self.next_request_timestamp: float = 0.0
+        self.requests: int = 0
+
+    def install(self, reddit: praw.Reddit) -> praw.Reddit:
+        """
+        Branche le limiteur sur les sessions prawcore d'un client praw.Reddit.
+
+        :param reddit: praw.Reddit - Le client à limiter.
+        :return: praw.Reddit - Le même client.
+        """
+
+        for core in (reddit._read_only_core, reddit._authorized_core):
+            if core is not None:
+                core._rate_limiter = self
+        return reddit
+
+    def call(
+        self,
+        request_function: Callable[..., Any],
+        set_header_callback: Callable[[], dict[str, str]],
+        *args: Any,
+        **kwargs: Any,
+    ) -> Any:
+        """Interface attendue par prawcore : attend son tour, exécute la requête puis lit les en-têtes."""
+
+        self.delay()
+        kwargs["headers"] = set_header_callback()
+        response = request_function(*args, **kwargs)
+        self.update(response.headers)
+        return response
+
+    def delay(self):
+        """Réserve le prochain créneau de requête et attend qu'il arrive."""
+
+        with self._lock:
+            now: float = time.time()
+            start: float = max(now, self.next_request_timestamp)
+
+            if self.remaining is not None and self.reset_timestamp is not None:
+                if self.remaining <= 0 and self.reset_timestamp > start:
+                    # Quota épuisé : on attend la remise à zéro de la fenêtre
+                    start = self.reset_timestamp
+                    interval: float = 0.0
+                else:
+                    # Répartition du quota restant sur le temps restant avant la remise à zéro
+                    interval = min(
+                        max(self.reset_timestamp - start, 0) / max(self.remaining, 1),
+                        self._max_delay,
+                    )
+                self.remaining -= 1
+            else:
+                interval = 0.0
+
+            self.next_request_timestamp = start + interval
+            self.requests += 1
+
+        if start > now:
+            time.sleep(start - now)
+
+    def update(self, response_headers: Mapping[str, str]):
+        """
+        Met à jour le quota à partir des en-têtes d'une réponse de Reddit.
+
+        :param response_headers: Mapping[str, str] - Les en-têtes de la réponse.
+        """
+
+        if "x-ratelimit-remaining" not in response_headers:
+            return
+
+        with self._lock:
+            self.remaining = float(response_headers["x-ratelimit-remaining"])
+            self.used = int(response_headers["x-ratelimit-used"])
+            self.reset_timestamp = time.time() + int(
+                response_headers["x-ratelimit-reset"]
+            )
@@ -0,0 +1,194 @@
+from collections.abc import Callable
+from dataclasses import dataclass
+import math
+import threading
+import time
+from Database.Manager import DatabaseManager
+from Database.Types import DbCrawlSchedule
+from .Pool import CredentialPool
+from .RateLimiter import SharedRateLimiter
+
+
+@dataclass
+class CrawlTarget:
+    """Un subreddit à collecter périodiquement."""
+
+    subreddit: str
+    priority: float = 1.0  # Part relative du budget de requêtes
+    interval: float = 900.0  # Intervalle (s) initial entre deux collectes
+    min_interval: float = 60.0
+    max_interval: float = 86_400.0
+
+
+class CrawlScheduler:
+    """
+    Planifie la collecte de nombreux subreddits sous un même quota d'API.
+
+    Chaque collecte mesure la vitesse de publication du subreddit (nouveaux éléments par
+    heure) et son coût (requêtes consommées, lues sur le limiteur partagé). L'intervalle
+    suivant vise new_items_per_crawl nouveaux éléments par collecte : un subreddit actif
+    est interrogé souvent, un subreddit inactif rarement. L'intervalle ne descend jamais
+    sous celui que permet la part du budget de requêtes attribuée au subreddit, au
+    prorata de sa priorité, si bien que la somme des collectes respecte le budget.
+
+    La planification est enregistrée dans la table CrawlSchedule : un redémarrage reprend
+    le calendrier là où il en était.
+    """
+
+    def __init__(
+        self,
+        database: DatabaseManager,
+        targets: list[CrawlTarget],
+        crawl: Callable[[str], int],
+        rate_limiter: SharedRateLimiter | CredentialPool,
+        requests_per_minute: float = 60.0,
+        new_items_per_crawl: float = 50.0,
+        smoothing: float = 0.5,
+    ) -> None:
+        """
+        :param database: DatabaseManager - La base contenant la table CrawlSchedule.
+        :param targets: list[CrawlTarget] - Les subreddits à collecter.
+        :param crawl: Callable[[str], int] - Collecte un subreddit et retourne le nombre de nouveaux éléments.
+        :param rate_limiter: SharedRateLimiter | CredentialPool - Le limiteur (ou le pool) des clients utilisés par crawl.
+        :param requests_per_minute: float - Le budget de requêtes réservé aux collectes planifiées.
+        :param new_items_per_crawl: float - Le nombre de nouveaux éléments visé par collecte.
+        :param smoothing: float - Le poids de la dernière mesure dans les moyennes mobiles (entre 0 et 1).
+        """
+
+        self._database = database
+        self._targets: dict[str, CrawlTarget] = {
+            target.subreddit: target for target in targets
+        }
+        self._crawl = crawl
+        self._rate_limiter = rate_limiter
+        self._requests_per_hour: float = requests_per_minute * 60
+        self._new_items_per_crawl = new_items_per_crawl
+        self._smoothing = smoothing
+        self._stop = threading.Event()
+
+        # Planification enregistrée, complétée pour les nouveaux subreddits
+        saved: dict[str, DbCrawlSchedule] = {
+            schedule["Subreddit"]: schedule
+            for schedule in database.get_crawl_schedules()
+        }
+        now: int = int(time.time())
+        self.schedules: dict[str, DbCrawlSchedule] = {
+            name: saved.get(name)
+            or DbCrawlSchedule(
+                Subreddit=name,
+                Interval=target.interval,
+                Velocity=None,
+                Cost=None,
+                Last_run_utc=None,
+                Next_run_utc=now,
+            )
+            for name, target in self._targets.items()
+        }
+
+    def _average(self, previous: float | None, value: float) -> float:
+        """Moyenne mobile exponentielle."""
+
+        if previous is None:
+            return value
+        return self._smoothing * value + (1 - self._smoothing) * previous
+
+    def _budget_interval(self, target: CrawlTarget, cost: float) -> float:
+        """L'intervalle minimal (s) permis par la part du budget attribuée au subreddit."""
+
+        total_priority: float = sum(t.priority for t in self._targets.values())
+        share: float = self._requests_per_hour * target.priority / total_priority
+        return 3600 * cost / share
+
+    def _interval(self, target: CrawlTarget, schedule: DbCrawlSchedule) -> float:
+        """Calcule l'intervalle jusqu'à la prochaine collecte d'un subreddit."""
+
+        velocity: float | None = schedule["Velocity"]
+        if velocity is None:
+            interval: float = schedule["Interval"]
+        elif velocity <= 0:
+            # Aucun nouvel élément : on espace progressivement les collectes
+            interval = schedule["Interval"] * 2
+        else:
+            interval = 3600 * self._new_items_per_crawl / velocity
+
+        interval = max(interval, self._budget_interval(target, schedule["Cost"] or 1.0))
+        return min(max(interval, target.min_interval), target.max_interval)
+
+    def run_once(self, subreddit: str):
+        """Collecte un subreddit, puis met à jour et enregistre sa planification."""
+
+        target: CrawlTarget = self._targets[subreddit]
+        schedule: DbCrawlSchedule = self.schedules[subreddit]
+
+        requests: int = self._rate_limiter.requests
+        started: float = time.time()
+        try:
+            items: int = self._crawl(subreddit)
+        except Exception as e:
+            print(f"r/{subreddit} - Erreur lors de la collecte : {e}")
+            items = -1
+        finished: float = time.time()
+        cost: int = self._rate_limiter.requests - requests
+
+        if items >= 0:
+            schedule["Cost"] = self._average(schedule["Cost"], max(cost, 1))
+            # La première collecte (sans date de référence) ne mesure pas la vitesse
+            if schedule["Last_run_utc"] is not None:
+                hours: float = max(finished - schedule["Last_run_utc"], 1) / 3600
+                schedule["Velocity"] = self._average(
+                    schedule["Velocity"], items / hours
+                )
+            schedule["Last_run_utc"] = int(finished)
+
+        schedule["Interval"] = self._interval(target, schedule)
+        schedule["Next_run_utc"] = int(finished + schedule["Interval"])
+        self._database.save_crawl_schedule(schedule)
+
+        print(
+            f"r/{subreddit} - {max(items, 0)} nouvel(s) élément(s) en {finished - started:.1f}s, "
+            f"{cost} requête(s), prochaine collecte dans {schedule['Interval'] / 60:.0f} min."
+        )
+
+    def due(self) -> list[str]:
+        """Retourne les subreddits à collecter, par priorité décroissante puis par ancienneté."""
+
+        now: float = time.time()
+        return sorted(
+            (
+                name
+                for name, schedule in self.schedules.items()
+                if schedule["Next_run_utc"] <= now
+            ),
+            key=lambda name: (
+                -self._targets[name].priority,
+                self.schedules[name]["Next_run_utc"],
+            ),
+        )
+
+    def stop(self):
+        """Demande l'arrêt du planificateur après la collecte en cours."""
+
+        self._stop.set()
+
+    def run(self, duration: float | None = None):
+        """
+        Collecte les subreddits à leur échéance jusqu'à l'appel de stop() ou l'expiration de duration.
+
+        :param duration: float | None - La durée maximale (s) de fonctionnement (optionnel).
+        """
+
+        deadline: float = time.time() + duration if duration is not None else math.inf
+        if not self.schedules:
+            return
+
+        while not self._stop.is_set() and time.time() < deadline:
+            due: list[str] = self.due()
+            if due:
+                # Une seule collecte à la fois : les échéances sont réévaluées après chacune
+                self.run_once(due[0])
+                continue
+
+            next_run: float = min(
+                schedule["Next_run_utc"] for schedule in self.schedules.values()
+            )
+            self._stop.wait(max(min(next_run, deadline) - time.time(), 0))
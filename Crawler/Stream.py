@@ -0,0 +1,312 @@
+"""
+Collecte en continu des nouvelles soumissions et nouveaux commentaires d'un ou plusieurs subreddits.
+
+Usage :
+    python -m Crawler.Stream AskFrance france [--database askfrance_new] [--batch-size 100] [--flush-interval 5]
+"""
+
+import argparse
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+import threading
+import time
+from typing import Any
+from dotenv import load_dotenv
+import praw
+import prawcore
+from Database.Manager import DatabaseManager
+from Database.Types import DbComment, DbSubmission, DbUser
+from .Client import create_reddit
+from .Mapping import RedditMapper
+from .RateLimiter import SharedRateLimiter
+
+
+@dataclass
+class StreamStats:
+    """Compteurs d'un flux (soumissions ou commentaires)."""
+
+    name: str
+    items: int = 0
+    window_items: int = 0  # Éléments reçus depuis le dernier rapport
+    window_started: float = field(default_factory=time.monotonic)
+    lag: float = 0.0  # Retard (s) entre la publication et la réception du dernier élément
+    max_lag: float = 0.0  # Retard maximal depuis le dernier rapport
+
+    def record(self, created_utc: float):
+        self.items += 1
+        self.window_items += 1
+        self.lag = max(time.time() - created_utc, 0.0)
+        self.max_lag = max(self.max_lag, self.lag)
+
+    def rate(self) -> float:
+        """Éléments reçus par seconde depuis le dernier rapport."""
+
+        elapsed: float = time.monotonic() - self.window_started
+        return self.window_items / elapsed if elapsed > 0 else 0.0
+
+    def reset_window(self):
+        self.window_items = 0
+        self.window_started = time.monotonic()
+        self.max_lag = self.lag
+
+    def __str__(self) -> str:
+        return (
+            f"{self.name:<11} {self.items:>8} éléments  {self.rate():>7.2f}/s  "
+            f"retard {self.lag:>6.1f}s (max {self.max_lag:.1f}s)"
+        )
+
+
+class StreamIngester:
+    """
+    Suit en continu les flux de soumissions et de commentaires d'un ou plusieurs subreddits.
+
+    Les éléments sont regroupés en micro-lots écrits en base dès qu'ils atteignent
+    batch_size éléments ou flush_interval secondes. En cas d'erreur réseau, les flux sont
+    recréés après une attente croissante et reprennent juste après le dernier élément reçu
+    (continue_after_id) : rien n'est ni perdu ni relu. Au premier démarrage, les éléments
+    déjà publiés sont ignorés (skip_existing), la collecte par listing s'en chargeant ; un flux
+    qui n'a encore rien reçu est recréé sans skip_existing et seuls les éléments publiés depuis
+    la première connexion sont retenus. Les flux sont interrogés à tour de rôle, au plus
+    stream_budget éléments à la fois, afin qu'un flux très actif n'affame pas les autres.
+    """
+
+    def __init__(
+        self,
+        reddit: praw.Reddit,
+        database: DatabaseManager,
+        subreddits: list[str],
+        mapper: RedditMapper | None = None,
+        comments: bool = True,
+        batch_size: int = 100,
+        flush_interval: float = 5.0,
+        poll_interval: float = 2.0,
+        report_interval: float = 60.0,
+        max_backoff: float = 300.0,
+        stream_budget: int = 50,
+    ) -> None:
+        """
+        :param reddit: praw.Reddit - Le client Reddit.
+        :param database: DatabaseManager - La base dans laquelle écrire.
+        :param subreddits: list[str] - Les noms des subreddits suivis.
+        :param mapper: RedditMapper | None - Le convertisseur (et son cache d'auteurs) (optionnel).
+        :param comments: bool - Suivre aussi le flux des commentaires.
+        :param batch_size: int - Le nombre d'éléments au-delà duquel un micro-lot est écrit.
+        :param flush_interval: float - L'âge maximal (s) d'un micro-lot avant son écriture.
+        :param poll_interval: float - L'attente (s) entre deux interrogations sans nouvel élément.
+        :param report_interval: float - L'intervalle (s) entre deux affichages des compteurs.
+        :param max_backoff: float - L'attente maximale (s) avant une reconnexion.
+        :param stream_budget: int - Le nombre maximal d'éléments lus d'un flux avant de passer au suivant.
+        """
+
+        self._reddit = reddit
+        self._database = database
+        self._subreddit = reddit.subreddit("+".join(subreddits))
+        self._mapper = mapper or RedditMapper(reddit)
+        self._comments = comments
+        self._batch_size = batch_size
+        self._flush_interval = flush_interval
+        self._poll_interval = poll_interval
+        self._report_interval = report_interval
+        self._max_backoff = max_backoff
+        self._stream_budget = stream_budget
+        self._stop = threading.Event()
+
+        self.stats: dict[str, StreamStats] = {
+            "submissions": StreamStats("submissions"),
+            "comments": StreamStats("comments"),
+        }
+        self.reconnections: int = 0
+
+        # Fullname du dernier élément reçu par flux, point de reprise après reconnexion
+        self._last: dict[str, str | None] = {"submissions": None, "comments": None}
+        # Date (UTC) de la première connexion, None tant que les flux n'ont pas été créés
+        self._connected_utc: float | None = None
+        self._submissions: list[DbSubmission] = []
+        self._comments_batch: list[DbComment] = []
+        self._users: dict[str, DbUser] = {}
+        self._batch_started: float | None = None
+
+    def _streams(self) -> dict[str, Iterator[Any]]:
+        """
+        Crée les flux, repris après le dernier élément reçu s'il est connu.
+
+        À la première connexion, les éléments déjà publiés sont ignorés. Lors d'une
+        reconnexion, un flux qui n'a encore rien reçu repart des éléments récents : ceux
+        publiés avant la première connexion sont écartés par _before_connection().
+        """
+
+        first: bool = self._connected_utc is None
+        if first:
+            self._connected_utc = time.time()
+
+        sources: dict[str, Any] = {"submissions": self._subreddit.stream.submissions}
+        if self._comments:
+            sources["comments"] = self._subreddit.stream.comments
+
+        streams: dict[str, Iterator[Any]] = {}
+        for name, stream in sources.items():
+            last: str | None = self._last[name]
+            # pause_after=0 : le flux rend la main (None) dès qu'une requête ne ramène rien
+            if last is not None:
+                streams[name] = stream(pause_after=0, continue_after_id=last)
+            elif first:
+                streams[name] = stream(pause_after=0, skip_existing=True)
+            else:
+                streams[name] = stream(pause_after=0)
+        return streams
+
+    def _before_connection(self, name: str, item: Any) -> bool:
+        """Indique si un élément rejoué après reconnexion précède la première connexion."""
+
+        return (
+            self._last[name] is None
+            and self._connected_utc is not None
+            and item.created_utc < self._connected_utc
+        )
+
+    def _add(self, name: str, item: Any):
+        """Convertit un élément et l'ajoute au micro-lot courant."""
+
+        if name == "submissions":
+            row, user = self._mapper.submission(item)
+            self._submissions.append(row)
+        else:
+            row, user = self._mapper.comment(item)
+            self._comments_batch.append(row)
+        if user is not None:
+            self._users[user["Id"]] = user
+
+        self._last[name] = item.fullname
+        self.stats[name].record(item.created_utc)
+        if self._batch_started is None:
+            self._batch_started = time.monotonic()
+
+    def _pending(self) -> int:
+        return len(self._submissions) + len(self._comments_batch)
+
+    def flush(self):
+        """Écrit le micro-lot courant."""
+
+        self._users.update(
+            (user["Id"], user) for user in self._mapper.resolve_pending()
+        )
+        if self._users:
+            self._database.add_users(list(self._users.values()), on_conflict="update")
+            self._users.clear()
+        if self._submissions:
+            self._database.add_submissions(self._submissions)
+            self._submissions.clear()
+        if self._comments_batch:
+            self._database.add_comments(self._comments_batch, on_conflict="update")
+            self._comments_batch.clear()
+        self._batch_started = None
+
+    def _flush_due(self) -> bool:
+        return self._pending() >= self._batch_size or (
+            self._batch_started is not None
+            and time.monotonic() - self._batch_started >= self._flush_interval
+        )
+
+    def report(self):
+        """Affiche les compteurs de chaque flux et remet à zéro la fenêtre de mesure."""
+
+        for stats in self.stats.values():
+            print(stats)
+            stats.reset_window()
+        print(f"reconnexions {self.reconnections}")
+
+    def stop(self):
+        """Demande l'arrêt de la collecte (le micro-lot courant est écrit avant de rendre la main)."""
+
+        self._stop.set()
+
+    def run(self, duration: float | None = None):
+        """
+        Collecte jusqu'à l'appel de stop(), l'expiration de duration ou une interruption clavier.
+
+        :param duration: float | None - La durée maximale (s) de la collecte (optionnel).
+        """
+
+        deadline: float | None = (
+            time.monotonic() + duration if duration is not None else None
+        )
+        next_report: float = time.monotonic() + self._report_interval
+        backoff: float = 1.0
+        streams: dict[str, Iterator[Any]] = self._streams()
+
+        try:
+            while not self._stop.is_set():
+                if deadline is not None and time.monotonic() >= deadline:
+                    break
+
+                try:
+                    received: bool = False
+                    for name, stream in streams.items():
+                        # Lit chaque flux jusqu'à sa pause ou l'épuisement de son budget
+                        for _ in range(self._stream_budget):
+                            item = next(stream)
+                            if item is None:
+                                break
+                            received = True
+                            if self._before_connection(name, item):
+                                continue
+                            self._add(name, item)
+                            if self._flush_due():
+                                self.flush()
+                    backoff = 1.0
+                except (
+                    prawcore.exceptions.RequestException,
+                    prawcore.exceptions.ResponseException,
+                ) as e:
+                    self.reconnections += 1
+                    print(f"Flux interrompu ({e}), reconnexion dans {backoff:.0f}s")
+                    self._stop.wait(backoff)
+                    backoff = min(backoff * 2, self._max_backoff)
+                    streams = self._streams()
+                    continue
+
+                if self._flush_due():
+                    self.flush()
+                if time.monotonic() >= next_report:
+                    self.report()
+                    next_report = time.monotonic() + self._report_interval
+                if not received:
+                    self._stop.wait(self._poll_interval)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.flush()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("subreddits", nargs="+")
+    parser.add_argument("--database", default="askfrance_new")
+    parser.add_argument(
+        "--no-comments", action="store_true", help="Ne suit que les soumissions"
+    )
+    parser.add_argument("--batch-size", type=int, default=100)
+    parser.add_argument("--flush-interval", type=float, default=5.0)
+    parser.add_argument("--report-interval", type=float, default=60.0)
+    args = parser.parse_args()
+
+    load_dotenv()
+    reddit = create_reddit(SharedRateLimiter())
+
+    with DatabaseManager(name=args.database) as database:
+        database.create()
+        ingester = StreamIngester(
+            reddit,
+            database,
+            args.subreddits,
+            comments=not args.no_comments,
+            batch_size=args.batch_size,
+            flush_interval=args.flush_interval,
+            report_interval=args.report_interval,
+        )
+        ingester.run()
+        ingester.report()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+"""
+Traitement par lots des mots-clés et sujets : écriture du fichier de requêtes à soumettre
+à l'API batch d'Azure OpenAI / OpenAI, puis import du fichier de résultats.
+
+Usage :
+    python -m Database.Batch Datasets/askfrance_1000.db export batch_input.jsonl [--force]
+    python -m Database.Batch Datasets/askfrance_1000.db import batch_output.jsonl [--batch-size 500]
+"""
+
+import argparse
+from dotenv import load_dotenv
+from LLM.Agent import LLMAgent
+from .Manager import DatabaseManager
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("filepath")
+    parser.add_argument("action", choices=["export", "import"])
+    parser.add_argument("batch_filepath")
+    parser.add_argument(
+        "--force", action="store_true", help="Inclut les soumissions déjà traitées"
+    )
+    parser.add_argument("--batch-size", type=int, default=500)
+    args = parser.parse_args()
+
+    load_dotenv()
+    with DatabaseManager("", filepath=args.filepath) as database:
+        if args.action == "export":
+            # L'export n'appelle pas le modèle : aucun identifiant Azure n'est requis
+            database.export_keywords_and_topic_batch(
+                args.batch_filepath, force_update=args.force
+            )
+        else:
+            database.import_keywords_and_topic_batch(
+                LLMAgent(), args.batch_filepath, batch_size=args.batch_size
+            )
+
+
+if __name__ == "__main__":
+    main()
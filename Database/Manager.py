@@ -1,11 +1,19 @@
-from collections import Counter, defaultdict
+from collections.abc import Iterable, Iterator, Sequence
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 from datetime import datetime
+import itertools
+import json
 from LLM.Agent import LLMAgent
 from LLM.Types import LLMCategoryRequestFormat, LLMKeywordsTopicResponseFormat
 import os
 import sqlite3
 from .Types import (
+    DbBatchSummary,
     DbComment,
+    DbCrawlSchedule,
+    DbCrawlState,
+    DbOnConflict,
+    DbSearchResult,
     DbSubmission,
     DbUser,
     DbWeightedCategory,
@@ -18,6 +26,10 @@ class DatabaseManager:
 
     _filepath: str = ""
 
+    # Sujet enregistré (avec des mots-clés vides) quand le modèle a répondu explicitement qu'il
+    # n'y a rien à extraire : la soumission est traitée et n'est plus renvoyée au modèle
+    no_keywords_topic: str = "[Aucun]"
+
     # Schéma de la table User
     _table_user: str = """
     CREATE TABLE IF NOT EXISTS User (
@@ -34,6 +46,7 @@ class DatabaseManager:
         Id TEXT PRIMARY KEY,
         Author_id TEXT NOT NULL,
         Created TEXT NOT NULL,
+        Created_utc INTEGER,
         Sub_id TEXT NOT NULL,
         Url TEXT NOT NULL,
         Title TEXT NOT NULL,
@@ -50,6 +63,7 @@ class DatabaseManager:
         Id TEXT PRIMARY KEY,
         Author_id TEXT NOT NULL,
         Created TEXT NOT NULL,
+        Created_utc INTEGER,
         Parent_id TEXT,
         Submission_id TEXT NOT NULL,
         Body TEXT NOT NULL,
@@ -58,10 +72,260 @@ class DatabaseManager:
     );
     """
 
-    def __init__(self, name: str) -> None:
+    # Schéma de la table CrawlState (état de collecte par subreddit et par listing)
+    _table_crawl_state: str = """
+    CREATE TABLE IF NOT EXISTS CrawlState (
+        Subreddit TEXT NOT NULL,
+        Listing TEXT NOT NULL,
+        Newest_fullname TEXT,
+        Newest_created_utc INTEGER,
+        Head_fullname TEXT,
+        Head_created_utc INTEGER,
+        Checkpoint_fullname TEXT,
+        Updated_utc INTEGER NOT NULL,
+        PRIMARY KEY (Subreddit, Listing)
+    );
+    """
+
+    _table_import_state: str = """
+    CREATE TABLE IF NOT EXISTS ImportState (
+        Source TEXT PRIMARY KEY,
+        Offset INTEGER NOT NULL,
+        Updated_utc INTEGER NOT NULL
+    );
+    """
+
+    _table_crawl_schedule: str = """
+    CREATE TABLE IF NOT EXISTS CrawlSchedule (
+        Subreddit TEXT PRIMARY KEY,
+        Interval REAL NOT NULL,
+        Velocity REAL,
+        Cost REAL,
+        Last_run_utc INTEGER,
+        Next_run_utc INTEGER NOT NULL,
+        Updated_utc INTEGER NOT NULL
+    );
+    """
+
+    # Schéma de la table Keyword (dictionnaire des mots-clés)
+    _table_keyword: str = """
+    CREATE TABLE IF NOT EXISTS Keyword (
+        Id INTEGER PRIMARY KEY,
+        Name TEXT NOT NULL UNIQUE
+    );
+    """
+
+    # Schéma de la table SubmissionKeyword (index inversé mot-clé -> soumissions)
+    _table_submission_keyword: str = """
+    CREATE TABLE IF NOT EXISTS SubmissionKeyword (
+        Submission_id TEXT NOT NULL,
+        Keyword_id INTEGER NOT NULL,
+        Position INTEGER NOT NULL,
+        PRIMARY KEY (Submission_id, Keyword_id),
+        FOREIGN KEY (Submission_id) REFERENCES Submission(Id) ON DELETE CASCADE,
+        FOREIGN KEY (Keyword_id) REFERENCES Keyword(Id) ON DELETE CASCADE
+    ) WITHOUT ROWID;
+    """
+
+    # Schéma de la table KeywordWeight (nombre d'occurrences de chaque mot-clé)
+    _table_keyword_weight: str = """
+    CREATE TABLE IF NOT EXISTS KeywordWeight (
+        Keyword TEXT PRIMARY KEY,
+        Weight INTEGER NOT NULL
+    );
+    """
+
+    # Triggers maintenant KeywordWeight à jour à chaque ajout ou retrait d'un lien
+    # SubmissionKeyword : l'ancien poids est décrémenté et le nouveau incrémenté dans
+    # la transaction qui modifie les mots-clés de la soumission
+    _triggers_keyword_weight: list[str] = [
+        """
+        CREATE TRIGGER IF NOT EXISTS KeywordWeightInsert AFTER INSERT ON SubmissionKeyword
+        BEGIN
+            INSERT INTO KeywordWeight (Keyword, Weight)
+            VALUES ((SELECT Name FROM Keyword WHERE Id = NEW.Keyword_id), 1)
+            ON CONFLICT(Keyword) DO UPDATE SET Weight = Weight + 1;
+        END;
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS KeywordWeightDelete AFTER DELETE ON SubmissionKeyword
+        BEGIN
+            UPDATE KeywordWeight SET Weight = Weight - 1
+            WHERE Keyword = (SELECT Name FROM Keyword WHERE Id = OLD.Keyword_id);
+            DELETE FROM KeywordWeight
+            WHERE Keyword = (SELECT Name FROM Keyword WHERE Id = OLD.Keyword_id) AND Weight <= 0;
+        END;
+        """,
+    ]
+
+    # Index plein texte FTS5 à contenu externe : le texte n'est pas dupliqué, les index
+    # référencent les lignes de Submission et Comment par leur rowid. Un VACUUM pouvant
+    # renuméroter ces rowid, l'index doit être reconstruit après (rebuild_search_index)
+    _tables_search: list[str] = [
+        """
+        CREATE VIRTUAL TABLE IF NOT EXISTS SubmissionSearch USING fts5(
+            Title, Body,
+            content='Submission', content_rowid='rowid',
+            tokenize='unicode61 remove_diacritics 2'
+        );
+        """,
+        """
+        CREATE VIRTUAL TABLE IF NOT EXISTS CommentSearch USING fts5(
+            Body,
+            content='Comment', content_rowid='rowid',
+            tokenize='unicode61 remove_diacritics 2'
+        );
+        """,
+    ]
+
+    # Triggers synchronisant les index plein texte avec Submission et Comment
+    _triggers_search: list[str] = [
+        """
+        CREATE TRIGGER IF NOT EXISTS SubmissionSearchInsert AFTER INSERT ON Submission
+        BEGIN
+            INSERT INTO SubmissionSearch (rowid, Title, Body) VALUES (NEW.rowid, NEW.Title, NEW.Body);
+        END;
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS SubmissionSearchDelete AFTER DELETE ON Submission
+        BEGIN
+            INSERT INTO SubmissionSearch (SubmissionSearch, rowid, Title, Body)
+            VALUES ('delete', OLD.rowid, OLD.Title, OLD.Body);
+        END;
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS SubmissionSearchUpdate AFTER UPDATE OF Title, Body ON Submission
+        BEGIN
+            INSERT INTO SubmissionSearch (SubmissionSearch, rowid, Title, Body)
+            VALUES ('delete', OLD.rowid, OLD.Title, OLD.Body);
+            INSERT INTO SubmissionSearch (rowid, Title, Body) VALUES (NEW.rowid, NEW.Title, NEW.Body);
+        END;
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS CommentSearchInsert AFTER INSERT ON Comment
+        BEGIN
+            INSERT INTO CommentSearch (rowid, Body) VALUES (NEW.rowid, NEW.Body);
+        END;
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS CommentSearchDelete AFTER DELETE ON Comment
+        BEGIN
+            INSERT INTO CommentSearch (CommentSearch, rowid, Body) VALUES ('delete', OLD.rowid, OLD.Body);
+        END;
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS CommentSearchUpdate AFTER UPDATE OF Body ON Comment
+        BEGIN
+            INSERT INTO CommentSearch (CommentSearch, rowid, Body) VALUES ('delete', OLD.rowid, OLD.Body);
+            INSERT INTO CommentSearch (rowid, Body) VALUES (NEW.rowid, NEW.Body);
+        END;
+        """,
+    ]
+
+    # Index secondaires (clés étrangères et recherches par date)
+    _indexes: list[str] = [
+        "CREATE INDEX IF NOT EXISTS IdxSubmissionAuthor ON Submission(Author_id);",
+        "CREATE INDEX IF NOT EXISTS IdxSubmissionCreated ON Submission(Created_utc);",
+        "CREATE INDEX IF NOT EXISTS IdxCommentSubmission ON Comment(Submission_id);",
+        "CREATE INDEX IF NOT EXISTS IdxCommentParent ON Comment(Parent_id);",
+        "CREATE INDEX IF NOT EXISTS IdxCommentCreated ON Comment(Created_utc);",
+        "CREATE INDEX IF NOT EXISTS IdxSubmissionKeywordKeyword ON SubmissionKeyword(Keyword_id);",
+    ]
+
+    # Schéma de la table SubmissionDate (nombre de soumissions par jour)
+    _table_submission_date: str = """
+    CREATE TABLE IF NOT EXISTS SubmissionDate (
+        Date TEXT PRIMARY KEY,
+        NbSubmissions INTEGER NOT NULL
+    );
+    """
+
+    # Schéma de la table SubmissionWeekdayCount (nombre de soumissions par jour de la semaine)
+    _table_submission_weekday_count: str = """
+    CREATE TABLE IF NOT EXISTS SubmissionWeekdayCount (
+        Weekday TEXT PRIMARY KEY,
+        Id INTEGER NOT NULL,
+        NbSubmissions INTEGER NOT NULL
+    );
+    """
+
+    @staticmethod
+    def _weekday_id_sql(created: str) -> str:
+        """Expression SQL du jour de la semaine (lundi = 0, dimanche = 6) d'une date."""
+
+        # strftime('%w') renvoie dimanche = 0, on décale pour suivre datetime.weekday()
+        return f"((CAST(strftime('%w', {created}) AS INTEGER) + 6) % 7)"
+
+    @staticmethod
+    def _weekday_name_sql(created: str) -> str:
+        """Expression SQL du nom (en français) du jour de la semaine d'une date."""
+
+        return (
+            f"CASE {DatabaseManager._weekday_id_sql(created)} "
+            "WHEN 0 THEN 'Lundi' WHEN 1 THEN 'Mardi' WHEN 2 THEN 'Mercredi' "
+            "WHEN 3 THEN 'Jeudi' WHEN 4 THEN 'Vendredi' WHEN 5 THEN 'Samedi' "
+            "ELSE 'Dimanche' END"
+        )
+
+    # Profil de pragmas appliqué à l'ouverture de la connexion
+    _default_pragmas: dict[str, str | int] = {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "mmap_size": 268435456,  # 256 Mo
+        "cache_size": -65536,  # Valeur négative = taille en Kio (64 Mo)
+        "temp_store": "MEMORY",
+    }
+
+    def __init__(
+        self,
+        name: str,
+        filepath: str | None = None,
+        pragmas: dict[str, str | int] | None = None,
+    ) -> None:
+        """
+        :param name: str - Nom de la base de données (fichier {name}.db dans le dossier du module).
+        :param filepath: str | None - Chemin explicite vers un fichier .db, prioritaire sur name (optionnel).
+        :param pragmas: dict[str, str | int] | None - Pragmas surchargeant le profil par défaut (optionnel).
+        """
+
         # Définir le chemin vers database.db dans le dossier du module
-        self._filepath = os.path.join(os.path.dirname(__file__), f"{name}.db")
-        pass
+        self._filepath = filepath or os.path.join(
+            os.path.dirname(__file__), f"{name}.db"
+        )
+        self._pragmas = {**self._default_pragmas, **(pragmas or {})}
+        self._connexion: sqlite3.Connection | None = None
+
+    def __enter__(self) -> "DatabaseManager":
+        self._connect()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def _connect(self) -> sqlite3.Connection:
+        """
+        Retourne la connexion persistante à la base de données, en l'ouvrant
+        et en appliquant le profil de pragmas si nécessaire.
+        """
+
+        if self._connexion is None:
+            # check_same_thread=False : la connexion peut être partagée entre threads,
+            # l'appelant reste responsable de ne pas entrelacer les transactions
+            connexion: sqlite3.Connection = sqlite3.connect(
+                self._filepath, check_same_thread=False
+            )
+            for pragma, value in self._pragmas.items():
+                connexion.execute(f"PRAGMA {pragma} = {value}")
+            self._connexion = connexion
+
+        return self._connexion
+
+    def close(self):
+        """Fermeture de la connexion persistante (elle sera rouverte au prochain appel)."""
+
+        if self._connexion is not None:
+            self._connexion.close()
+            self._connexion = None
 
     def _format_date(self, date: datetime) -> str:
         """Formatage d'une date au format SQLite"""
@@ -83,7 +347,10 @@ class DatabaseManager:
             submission.get("Topic") is not None and submission.get("Topic") != ""
         )
 
-        return keywords_present and topic_present
+        # Une réponse vide explicite du modèle compte comme traitée
+        return (keywords_present and topic_present) or submission.get(
+            "Topic"
+        ) == self.no_keywords_topic
 
     def create(self):
         """Création de la base de données avec gestion des erreurs"""
@@ -92,7 +359,7 @@ class DatabaseManager:
 
         try:
             # Connexion à la base de données (création du fichier si nécessaire)
-            connexion: sqlite3.Connection = sqlite3.connect(self._filepath)
+            connexion: sqlite3.Connection = self._connect()
 
             # Création d'un curseur pour exécuter les commandes SQL
             curseur: sqlite3.Cursor = connexion.cursor()
@@ -102,212 +369,472 @@ class DatabaseManager:
             curseur.execute(self._table_user)
             curseur.execute(self._table_submission)
             curseur.execute(self._table_comment)
+            curseur.execute(self._table_keyword)
+            curseur.execute(self._table_submission_keyword)
+            curseur.execute(self._table_crawl_state)
+            curseur.execute(self._table_crawl_schedule)
+            curseur.execute(self._table_import_state)
 
             # Enregistrement des changements
             connexion.commit()
             print("Tables créées avec succès.")
 
+            # Mise à niveau des bases créées avec un schéma antérieur
+            self.migrate()
+
         except sqlite3.DatabaseError as e:
+            if self._connexion is not None:
+                self._connexion.rollback()
             print(f"Erreur lors de la création de la base de données : {e}")
 
         except sqlite3.Error as e:
+            if self._connexion is not None:
+                self._connexion.rollback()
             print(f"Erreur générique SQLite : {e}")
 
-        finally:
-            # Fermeture de la connexion, même en cas d'erreur
-            if "connexion" in locals():
-                connexion.close()
-                print("Connexion fermée.")
-
-    def add_users(self, users: list[DbUser]):
+    def migrate(self):
         """
-        Ajoute une liste d'utilisateurs dans la table User.
-
-        :param users: list[User] - Une liste d'objets utilisateur
+        Met à niveau le schéma d'une base existante : ajout et remplissage de la colonne
+        Created_utc (date de création en secondes epoch) et création des index secondaires.
+        L'opération est idempotente.
         """
 
-        valid_genres = {
-            "M",
-            "F",
-            "NB",
-        }  # Ensemble des valeurs valides pour le champ Genre
-
         try:
-            # Connexion à la base de données
-            connexion: sqlite3.Connection = sqlite3.connect(self._filepath)
-            curseur: sqlite3.Cursor = connexion.cursor()
+            connexion: sqlite3.Connection = self._connect()
+
+            for table in ("Submission", "Comment"):
+                columns: set[str] = {
+                    row[1] for row in connexion.execute(f"PRAGMA table_info({table})")
+                }
+                if "Created_utc" not in columns:
+                    print(f"Ajout de la colonne Created_utc à la table {table}...")
+                    connexion.execute(
+                        f"ALTER TABLE {table} ADD COLUMN Created_utc INTEGER"
+                    )
 
-            # Insertion de multiples utilisateurs dans la table User
-            for user in users:
-                try:
-                    # Validation de la valeur du champ Genre
-                    genre = user.get("Genre")
-                    if genre is not None and genre not in valid_genres:
-                        print(
-                            f"Utilisateur '{user['Id']}' - Valeur de genre invalide : '{genre}' (doit être 'M', 'F' ou 'NB')"
-                        )
-                        continue  # Passe à l'utilisateur suivant sans insertion
+                # Created est une date locale naïve : le modificateur 'utc' la convertit
+                # comme le fait datetime.timestamp() à l'insertion
+                connexion.execute(f"""
+                    UPDATE {table}
+                    SET Created_utc = CAST(strftime('%s', Created, 'utc') AS INTEGER)
+                    WHERE Created_utc IS NULL
+                """)
+
+            # Normalisation des mots-clés stockés sous forme de chaîne séparée par des virgules
+            connexion.execute(self._table_keyword)
+            connexion.execute(self._table_submission_keyword)
+            rows: list[tuple[str, str]] = connexion.execute("""
+                SELECT Id, Keywords FROM Submission
+                WHERE Keywords IS NOT NULL AND Keywords != ''
+                AND Id NOT IN (SELECT Submission_id FROM SubmissionKeyword)
+            """).fetchall()
+            for submission_id, keywords in rows:
+                self._set_submission_keywords(
+                    connexion, submission_id, self._unique_keywords(keywords.split(","))
+                )
+            if rows:
+                print(f"Mots-clés de {len(rows)} soumission(s) normalisés.")
+
+            # KeywordWeight est reconstruite une seule fois, puis maintenue par triggers
+            connexion.execute(self._table_keyword_weight)
+            has_triggers: bool = (
+                connexion.execute(
+                    "SELECT 1 FROM sqlite_master WHERE type = 'trigger' AND name = 'KeywordWeightInsert'"
+                ).fetchone()
+                is not None
+            )
+            if not has_triggers:
+                self._rebuild_keyword_weight(connexion, "KeywordWeight")
+                for trigger in self._triggers_keyword_weight:
+                    connexion.execute(trigger)
 
-                    curseur.execute(
-                        """
-                        INSERT INTO User (Id, Name, Genre, Age)
-                        VALUES (?, ?, ?, ?)
-                    """,
-                        (
-                            user["Id"],
-                            user["Name"],
-                            user.get(
-                                "Genre"
-                            ),  # Si "Genre" n'est pas spécifié, cela renverra None
-                            user.get(
-                                "Age"
-                            ),  # Si "Age" n'est pas spécifié, cela renverra None
-                        ),
-                    )
-                    # Enregistrement des changements pour chaque utilisateur
-                    connexion.commit()
-                    print(f"Utilisateur '{user['Id']}' ajouté avec succès.")
+            for index in self._indexes:
+                connexion.execute(index)
 
-                except sqlite3.IntegrityError as e:
-                    print(
-                        f"Utilisateur '{user['Id']}' - Erreur d'intégrité lors de l'ajout de l'utilisateur : {e}"
-                    )
+            connexion.commit()
+            print("Schéma mis à niveau.")
 
-                except sqlite3.Error as e:
-                    print(
-                        f"Utilisateur '{user['Id']}' - Une erreur est survenue lors de l'ajout de l'utilisateur : {e}"
-                    )
+            # Index plein texte, construit une seule fois puis maintenu par triggers
+            if not self._has_table("SubmissionSearch"):
+                self.rebuild_search_index()
 
         except sqlite3.Error as e:
-            print(
-                f"Une erreur est survenue lors de la connexion ou de l'exécution des requêtes : {e}"
+            if self._connexion is not None:
+                self._connexion.rollback()
+            print(f"Erreur lors de la mise à niveau du schéma : {e}")
+
+    def _has_table(self, name: str) -> bool:
+        """Vérifie si une table existe dans la base de données."""
+
+        return (
+            self._connect()
+            .execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (name,)
             )
+            .fetchone()
+            is not None
+        )
 
-        finally:
-            # Fermeture de la connexion
-            connexion.close()
+    @staticmethod
+    def _unique_keywords(keywords: Iterable[str]) -> list[str]:
+        """
+        Retire les mots-clés répétés (en gardant la première occurrence), afin que la colonne
+        Keywords et la table SubmissionKeyword décrivent exactement les mêmes mots-clés.
+        """
 
-    def add_submissions(self, submissions: list[DbSubmission]):
+        return list(dict.fromkeys(keywords))
+
+    @staticmethod
+    def _format_keywords(keywords: list[str]) -> str:
+        """
+        Construit la chaîne de la colonne Keywords. Les virgules séparant les mots-clés, celles
+        contenues dans un mot-clé y sont remplacées par des espaces ; les tables Keyword et
+        SubmissionKeyword conservent le mot-clé tel quel.
         """
-        Ajoute une liste de soumissions dans la table Submission.
 
-        :param submissions: list[Submission] - Une liste d'objets Submission
+        return ",".join(
+            " ".join(keyword.replace(",", " ").split()) for keyword in keywords
+        )
+
+    def _set_submission_keywords(
+        self, connexion: sqlite3.Connection, submission_id: str, keywords: list[str]
+    ):
         """
+        Remplace les liens SubmissionKeyword d'une soumission (sans commit, c'est à l'appelant
+        de valider la transaction).
 
-        try:
-            # Connexion à la base de données
-            connexion: sqlite3.Connection = sqlite3.connect(self._filepath)
-            curseur: sqlite3.Cursor = connexion.cursor()
+        :param connexion: sqlite3.Connection - La connexion portant la transaction en cours.
+        :param submission_id: str - L'identifiant de la soumission.
+        :param keywords: list[str] - Les mots-clés, dans l'ordre.
+        """
 
-            # Insertion de multiples soumissions dans la table Submission
-            for submission in submissions:
-                try:
-                    # Formatage de la liste de mots-clés en une chaîne de caractères séparée par des virgules
-                    formatted_keywords: str | None = None
-                    keywords = submission.get("Keywords")
-                    if keywords:
-                        formatted_keywords = ",".join(keywords)
+        connexion.execute(
+            "DELETE FROM SubmissionKeyword WHERE Submission_id = ?", (submission_id,)
+        )
+        connexion.executemany(
+            "INSERT OR IGNORE INTO Keyword (Name) VALUES (?)",
+            [(keyword,) for keyword in keywords],
+        )
+        connexion.executemany(
+            """
+            INSERT OR IGNORE INTO SubmissionKeyword (Submission_id, Keyword_id, Position)
+            SELECT ?, Id, ? FROM Keyword WHERE Name = ?
+            """,
+            [
+                (submission_id, position, keyword)
+                for position, keyword in enumerate(keywords)
+            ],
+        )
 
-                    # Formatage de la date 'Created' en texte au format SQLite
-                    formatted_created = self._format_date(submission["Created"])
+    def _bulk_write(
+        self,
+        table: str,
+        columns: tuple[str, ...],
+        update_set: str,
+        rows: Iterable[tuple | None],
+        on_conflict: DbOnConflict,
+        batch_size: int,
+    ) -> list[DbBatchSummary]:
+        """
+        Insère des lignes par lots avec executemany, avec un seul commit par lot.
+
+        :param table: str - La table cible (sa clé primaire doit être la colonne Id).
+        :param columns: tuple[str, ...] - Les colonnes insérées, Id en premier.
+        :param update_set: str - La clause SET utilisée en mode "update".
+        :param rows: Iterable[tuple | None] - Les lignes à insérer, None pour une ligne rejetée à la validation.
+        :param on_conflict: DbOnConflict - "update" rafraîchit les lignes existantes, "nothing" les ignore.
+        :param batch_size: int - Le nombre de lignes par lot (et donc par transaction).
+        :return: list[DbBatchSummary] - Un résumé par lot.
+        """
 
-                    curseur.execute(
-                        """
-                        INSERT INTO Submission (Id, Author_id, Created, Sub_id, Url, Title, Body, Keywords, Topic)
-                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    """,
-                        (
-                            submission["Id"],
-                            submission["Author_id"],
-                            formatted_created,
-                            submission["Sub_id"],
-                            submission["Url"],
-                            submission["Title"],
-                            submission["Body"],
-                            formatted_keywords,
-                            submission.get(
-                                "Topic"
-                            ),  # Si 'Topic' n'est pas spécifié, cela renverra None
-                        ),
-                    )
+        if on_conflict == "update":
+            conflict_clause = f"DO UPDATE SET {update_set}"
+        else:
+            conflict_clause = "DO NOTHING"
 
-                    # Enregistrement des changements pour chaque soumission
-                    connexion.commit()
-                    print(f"Soumission '{submission['Id']}' ajoutée avec succès.")
+        command: str = f"""
+            INSERT INTO {table} ({", ".join(columns)})
+            VALUES ({", ".join("?" for _ in columns)})
+            ON CONFLICT(Id) {conflict_clause}
+        """
 
-                except sqlite3.IntegrityError as e:
-                    print(
-                        f"Soumission '{submission['Id']}' - Erreur d'intégrité lors de l'ajout de la soumission : {e}"
+        connexion: sqlite3.Connection = self._connect()
+        summaries: list[DbBatchSummary] = []
+        iterator = iter(rows)
+
+        while batch := list(itertools.islice(iterator, batch_size)):
+            summary = DbBatchSummary(Inserted=0, Updated=0, Skipped=0, Rejected=0)
+            valid_rows: list[tuple] = [row for row in batch if row is not None]
+            summary["Rejected"] = len(batch) - len(valid_rows)
+
+            # En mode "update", les Id déjà présents permettent de distinguer insertions et mises à jour
+            existing_ids: set[str] = set()
+            if on_conflict == "update" and valid_rows:
+                ids: list[str] = list({row[0] for row in valid_rows})
+                for start in range(0, len(ids), 500):
+                    chunk: list[str] = ids[start : start + 500]
+                    existing_ids.update(
+                        row[0]
+                        for row in connexion.execute(
+                            f"SELECT Id FROM {table} WHERE Id IN ({', '.join('?' for _ in chunk)})",
+                            chunk,
+                        )
                     )
 
-                except sqlite3.Error as e:
-                    print(
-                        f"Soumission '{submission['Id']}' - Une erreur est survenue lors de l'ajout de la soumission : {e}"
-                    )
+            try:
+                written: int = connexion.executemany(command, valid_rows).rowcount
+            except sqlite3.Error:
+                # Le lot échoue en bloc : on rejoue ligne par ligne pour isoler les lignes fautives
+                connexion.rollback()
+                written = 0
+                for row in valid_rows:
+                    try:
+                        written += connexion.execute(command, row).rowcount
+                    except sqlite3.Error:
+                        summary["Rejected"] += 1
 
-        except sqlite3.Error as e:
+            connexion.commit()
+
+            if on_conflict == "update":
+                new_ids: set[str] = {row[0] for row in valid_rows} - existing_ids
+                summary["Inserted"] = min(len(new_ids), written)
+                summary["Updated"] = written - summary["Inserted"]
+            else:
+                summary["Inserted"] = written
+            summary["Skipped"] = (
+                len(batch) - summary["Rejected"] - summary["Inserted"] - summary["Updated"]
+            )
+
+            summaries.append(summary)
             print(
-                f"Une erreur est survenue lors de la connexion ou de l'exécution des requêtes : {e}"
+                f"{table} - lot {len(summaries)} : {summary['Inserted']} insérée(s), "
+                f"{summary['Updated']} mise(s) à jour, {summary['Skipped']} ignorée(s), "
+                f"{summary['Rejected']} rejetée(s)."
             )
 
-        finally:
-            # Fermeture de la connexion
-            connexion.close()
+        return summaries
 
-    def add_comments(self, comments: list[DbComment]):
+    def add_users(
+        self,
+        users: Iterable[DbUser],
+        on_conflict: DbOnConflict = "nothing",
+        batch_size: int = 1000,
+    ) -> list[DbBatchSummary]:
         """
-        Ajoute une liste de commentaires dans la table Comment.
+        Ajoute une liste d'utilisateurs dans la table User.
 
-        :param comments: list[Comment] - Une liste d'objets Comment
+        :param users: Iterable[User] - Une liste d'objets utilisateur
+        :param on_conflict: DbOnConflict - "update" rafraîchit les utilisateurs existants, "nothing" les ignore.
+        :param batch_size: int - Le nombre d'utilisateurs insérés par transaction.
+        :return: list[DbBatchSummary] - Un résumé par lot.
         """
 
+        valid_genres = {
+            "M",
+            "F",
+            "NB",
+        }  # Ensemble des valeurs valides pour le champ Genre
+
+        def to_row(user: DbUser) -> tuple | None:
+            # Validation de la valeur du champ Genre
+            genre = user.get("Genre")
+            if genre is not None and genre not in valid_genres:
+                return None
+
+            return (
+                user["Id"],
+                user["Name"],
+                genre,  # Si "Genre" n'est pas spécifié, cela renverra None
+                user.get("Age"),  # Si "Age" n'est pas spécifié, cela renverra None
+            )
+
         try:
-            # Connexion à la base de données
-            connexion: sqlite3.Connection = sqlite3.connect(self._filepath)
-            curseur: sqlite3.Cursor = connexion.cursor()
+            return self._bulk_write(
+                "User",
+                ("Id", "Name", "Genre", "Age"),
+                """
+                Name = excluded.Name,
+                Genre = COALESCE(excluded.Genre, Genre),
+                Age = COALESCE(excluded.Age, Age)
+                """,
+                (to_row(user) for user in users),
+                on_conflict,
+                batch_size,
+            )
 
-            # Insertion de multiples commentaires dans la table Comment
-            for comment in comments:
-                try:
-                    formatted_created = self._format_date(comment["Created"])
+        except sqlite3.Error as e:
+            if self._connexion is not None:
+                self._connexion.rollback()
+            print(
+                f"Une erreur est survenue lors de la connexion ou de l'exécution des requêtes : {e}"
+            )
+            return []
+
+    def add_submissions(
+        self,
+        submissions: Iterable[DbSubmission],
+        on_conflict: DbOnConflict = "nothing",
+        batch_size: int = 1000,
+    ) -> list[DbBatchSummary]:
+        """
+        Ajoute une liste de soumissions dans la table Submission.
 
-                    curseur.execute(
-                        """
-                        INSERT INTO Comment (Id, Author_id, Created, Parent_id, Submission_id, Body)
-                        VALUES (?, ?, ?, ?, ?, ?)
-                    """,
-                        (
-                            comment["Id"],
-                            comment["Author_id"],
-                            formatted_created,
-                            comment["Parent_id"],
-                            comment["Submission_id"],
-                            comment["Body"],
-                        ),
-                    )
+        En mode "update", les mots-clés et le sujet déjà calculés sont conservés
+        si la soumission rafraîchie n'en fournit pas.
 
-                    # Enregistrement des changements pour chaque commentaire
-                    connexion.commit()
-                    print(f"Commentaire '{comment['Id']}' ajouté avec succès.")
+        :param submissions: Iterable[Submission] - Une liste d'objets Submission
+        :param on_conflict: DbOnConflict - "update" rafraîchit les soumissions existantes, "nothing" les ignore.
+        :param batch_size: int - Le nombre de soumissions insérées par transaction.
+        :return: list[DbBatchSummary] - Un résumé par lot.
+        """
 
-                except sqlite3.IntegrityError as e:
-                    print(
-                        f"Commentaire '{comment['Id']}' - Erreur d'intégrité lors de l'ajout du commentaire : {e}"
-                    )
+        # Mots-clés fournis à l'insertion, à reporter dans SubmissionKeyword
+        submitted_keywords: dict[str, list[str]] = {}
+
+        def to_row(submission: DbSubmission) -> tuple | None:
+            try:
+                # Formatage de la liste de mots-clés en une chaîne de caractères séparée par des virgules
+                formatted_keywords: str | None = None
+                keywords = submission.get("Keywords")
+                if keywords:
+                    keywords = self._unique_keywords(keywords)
+                    formatted_keywords = self._format_keywords(keywords)
+                    submitted_keywords[submission["Id"]] = keywords
+
+                return (
+                    submission["Id"],
+                    submission["Author_id"],
+                    # Formatage de la date 'Created' en texte au format SQLite
+                    self._format_date(submission["Created"]),
+                    int(submission["Created"].timestamp()),
+                    submission["Sub_id"],
+                    submission["Url"],
+                    submission["Title"],
+                    submission["Body"],
+                    formatted_keywords,
+                    submission.get(
+                        "Topic"
+                    ),  # Si 'Topic' n'est pas spécifié, cela renverra None
+                )
+            except (KeyError, AttributeError):
+                return None
 
-                except sqlite3.Error as e:
-                    print(
-                        f"Commentaire '{comment['Id']}' - Une erreur est survenue lors de l'ajout du commentaire : {e}"
-                    )
+        try:
+            summaries: list[DbBatchSummary] = self._bulk_write(
+                "Submission",
+                (
+                    "Id",
+                    "Author_id",
+                    "Created",
+                    "Created_utc",
+                    "Sub_id",
+                    "Url",
+                    "Title",
+                    "Body",
+                    "Keywords",
+                    "Topic",
+                ),
+                """
+                Author_id = excluded.Author_id,
+                Created = excluded.Created,
+                Created_utc = excluded.Created_utc,
+                Sub_id = excluded.Sub_id,
+                Url = excluded.Url,
+                Title = excluded.Title,
+                Body = excluded.Body,
+                Keywords = COALESCE(excluded.Keywords, Keywords),
+                Topic = COALESCE(NULLIF(excluded.Topic, ''), Topic)
+                """,
+                (to_row(submission) for submission in submissions),
+                on_conflict,
+                batch_size,
+            )
+
+            # Les liens ne sont mis à jour que pour les soumissions dont les mots-clés
+            # ont effectivement été écrits (nouvelles lignes ou lignes rafraîchies)
+            if submitted_keywords and self._has_table("SubmissionKeyword"):
+                connexion: sqlite3.Connection = self._connect()
+                for submission_id, keywords in submitted_keywords.items():
+                    stored = connexion.execute(
+                        "SELECT Keywords FROM Submission WHERE Id = ?", (submission_id,)
+                    ).fetchone()
+                    if stored is not None and stored[0] == self._format_keywords(keywords):
+                        self._set_submission_keywords(
+                            connexion, submission_id, keywords
+                        )
+                connexion.commit()
+
+            return summaries
 
         except sqlite3.Error as e:
+            if self._connexion is not None:
+                self._connexion.rollback()
             print(
                 f"Une erreur est survenue lors de la connexion ou de l'exécution des requêtes : {e}"
             )
+            return []
+
+    def add_comments(
+        self,
+        comments: Iterable[DbComment],
+        on_conflict: DbOnConflict = "nothing",
+        batch_size: int = 1000,
+    ) -> list[DbBatchSummary]:
+        """
+        Ajoute une liste de commentaires dans la table Comment.
 
-        finally:
-            # Fermeture de la connexion
-            connexion.close()
+        :param comments: Iterable[Comment] - Une liste d'objets Comment
+        :param on_conflict: DbOnConflict - "update" rafraîchit les commentaires existants, "nothing" les ignore.
+        :param batch_size: int - Le nombre de commentaires insérés par transaction.
+        :return: list[DbBatchSummary] - Un résumé par lot.
+        """
+
+        def to_row(comment: DbComment) -> tuple | None:
+            try:
+                return (
+                    comment["Id"],
+                    comment["Author_id"],
+                    self._format_date(comment["Created"]),
+                    int(comment["Created"].timestamp()),
+                    comment["Parent_id"],
+                    comment["Submission_id"],
+                    comment["Body"],
+                )
+            except (KeyError, AttributeError):
+                return None
+
+        try:
+            return self._bulk_write(
+                "Comment",
+                (
+                    "Id",
+                    "Author_id",
+                    "Created",
+                    "Created_utc",
+                    "Parent_id",
+                    "Submission_id",
+                    "Body",
+                ),
+                """
+                Author_id = excluded.Author_id,
+                Created = excluded.Created,
+                Created_utc = excluded.Created_utc,
+                Parent_id = excluded.Parent_id,
+                Submission_id = excluded.Submission_id,
+                Body = excluded.Body
+                """,
+                (to_row(comment) for comment in comments),
+                on_conflict,
+                batch_size,
+            )
+
+        except sqlite3.Error as e:
+            if self._connexion is not None:
+                self._connexion.rollback()
+            print(
+                f"Une erreur est survenue lors de la connexion ou de l'exécution des requêtes : {e}"
+            )
+            return []
 
     def update_keywords_and_topic(
         self, dict: DbSubmission, LLMResponse: LLMKeywordsTopicResponseFormat
@@ -321,11 +848,12 @@ class DatabaseManager:
 
         try:
             # Connexion à la base de données
-            connexion: sqlite3.Connection = sqlite3.connect(self._filepath)
+            connexion: sqlite3.Connection = self._connect()
             curseur: sqlite3.Cursor = connexion.cursor()
 
             # Formatage de la liste de mots-clés en une chaîne de caractères séparée par des virgules
-            formatted_keywords: str = ",".join(LLMResponse["keywords"])
+            keywords: list[str] = self._unique_keywords(LLMResponse["keywords"])
+            formatted_keywords: str = self._format_keywords(keywords)
 
             # Mise à jour des mots-clés et du sujet dans la table correspondante
             curseur.execute(
@@ -334,74 +862,269 @@ class DatabaseManager:
                 SET Keywords = ?, Topic = ?
                 WHERE Id = ?
             """,
-                (formatted_keywords, LLMResponse["topic"], dict["Id"]),
+                (formatted_keywords, self._stored_topic(LLMResponse), dict["Id"]),
             )
 
+            # Mise à jour de l'index inversé des mots-clés dans la même transaction
+            self._set_submission_keywords(connexion, dict["Id"], keywords)
+
             # Enregistrement des changements
             connexion.commit()
             print(f"Mots-clés et sujet mis à jour pour '{dict['Id']}' avec succès.")
 
         except sqlite3.Error as e:
+            if self._connexion is not None:
+                self._connexion.rollback()
             print(
                 f"Une erreur est survenue lors de la connexion ou de l'exécution des requêtes : {e}"
             )
 
-        finally:
-            # Fermeture de la connexion
-            connexion.close()
+    def _stored_topic(self, LLMResponse: LLMKeywordsTopicResponseFormat) -> str:
+        """Sujet à enregistrer pour une réponse : le marqueur no_keywords_topic si elle est vide."""
+
+        return LLMResponse["topic"] if LLMResponse["keywords"] else self.no_keywords_topic
+
+    def update_keywords_and_topics(
+        self, updates: Sequence[tuple[str, LLMKeywordsTopicResponseFormat]]
+    ) -> bool:
+        """
+        Met à jour en une seule transaction les mots-clés et sujets de plusieurs soumissions.
+
+        :param updates: Sequence[tuple[str, LLMKeywordsTopicResponseFormat]] - Les identifiants
+                        des soumissions et les réponses du modèle LLM.
+        :return: bool - True si la transaction a été validée.
+        """
+
+        keywords: list[list[str]] = [
+            self._unique_keywords(response["keywords"]) for _, response in updates
+        ]
+
+        try:
+            connexion: sqlite3.Connection = self._connect()
+            connexion.executemany(
+                "UPDATE Submission SET Keywords = ?, Topic = ? WHERE Id = ?",
+                (
+                    (
+                        self._format_keywords(submission_keywords),
+                        self._stored_topic(response),
+                        submission_id,
+                    )
+                    for (submission_id, response), submission_keywords in zip(
+                        updates, keywords
+                    )
+                ),
+            )
+            for (submission_id, _), submission_keywords in zip(updates, keywords):
+                self._set_submission_keywords(
+                    connexion, submission_id, submission_keywords
+                )
+            connexion.commit()
+            print(f"Mots-clés et sujets de {len(updates)} soumission(s) mis à jour.")
+            return True
+
+        except sqlite3.Error as e:
+            if self._connexion is not None:
+                self._connexion.rollback()
+            print(f"Erreur lors de la mise à jour des mots-clés et sujets : {e}")
+            return False
 
     def update_all_keywords_and_topic(
-        self, LLMAgent: LLMAgent, force_update: bool = False
+        self,
+        LLMAgent: LLMAgent,
+        force_update: bool = False,
+        concurrency: int = 1,
+        batch_size: int = 50,
+        max_batch_tokens: int | None = None,
+        batch_filepath: str | None = None,
     ):
         """
         Met à jour les mots-clés et le sujet de toutes les soumissions dans la table Submission.
 
+        Les appels au modèle sont faits en parallèle depuis un pool de threads (l'agent
+        respecte les quotas du déploiement) ; les résultats sont écrits par lots depuis le
+        thread appelant, seul utilisateur de la connexion. Avec max_batch_tokens, plusieurs
+        soumissions sont regroupées dans chaque appel (le prompt système n'est payé qu'une fois).
+
         :param LLMAgent: LLMAgent - L'agent LLM utilisé pour générer les mots-clés et le sujet.
         :param force_update: bool - Indique si on doit écraser les valeurs existantes (par défaut False).
+        :param concurrency: int - Le nombre de requêtes simultanées au modèle.
+        :param batch_size: int - Le nombre de résultats écrits par transaction.
+        :param max_batch_tokens: int | None - Le budget de tokens des soumissions regroupées dans un même appel (un appel par soumission si None).
+        :param batch_filepath: str | None - Mode hors ligne : au lieu d'appeler le modèle, écrit dans ce fichier
+                               JSONL une requête par soumission au format batch d'Azure OpenAI / OpenAI, dont
+                               les résultats s'importent avec import_keywords_and_topic_batch.
         """
 
-        # Récupération de toutes les soumissions
-        submissions = self.get_all_submissions()
+        if batch_filepath is not None:
+            self.export_keywords_and_topic_batch(
+                batch_filepath, force_update, deployment=LLMAgent.deployment
+            )
+            return
+
+        def packs() -> Iterator[list[DbSubmission]]:
+            # Parcours des soumissions par pages (seulement celles non traitées, sauf si force_update) :
+            # chaque page est lue entièrement avant les mises à jour, le curseur de pagination
+            # évite de garder une lecture ouverte pendant les écritures
+            after: tuple | None = None
+            while page := list(
+                self.iter_submissions(
+                    missing_keywords=not force_update, after=after, limit=100
+                )
+            ):
+                if max_batch_tokens is None:
+                    yield from ([submission] for submission in page)
+                else:
+                    yield from LLMAgent.pack_submissions(page, max_batch_tokens)
+                after = (page[-1]["Id"],)
+
+        def enrich(pack: list[DbSubmission]) -> dict[str, LLMKeywordsTopicResponseFormat]:
+            if max_batch_tokens is None:
+                response = LLMAgent.request_keywords_and_topic(pack[0])
+                return {pack[0]["Id"]: response} if response is not None else {}
+            return LLMAgent.request_keywords_and_topics(pack, max_batch_tokens)
+
+        updates: list[tuple[str, LLMKeywordsTopicResponseFormat]] = []
+
+        def collect(done: Iterable[Future]):
+            for future in done:
+                submission_ids: list[str] = in_flight.pop(future)
+                try:
+                    # Les soumissions sans réponse exploitable sont absentes du résultat : elles
+                    # restent à traiter ; les réponses vides explicites sont enregistrées
+                    updates.extend(future.result().items())
+                except Exception as e:
+                    print(
+                        f"Soumission(s) {', '.join(submission_ids)} - Erreur lors de l'appel au modèle : {e}"
+                    )
+
+            if len(updates) >= batch_size:
+                self.update_keywords_and_topics(updates)
+                updates.clear()
 
-        for submission in submissions:
-            if not force_update and self._has_values_for_keywords_and_topic(submission):
-                print(f"Soumission '{submission['Id']}' déjà traitée.")
-                continue
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            # Le nombre de requêtes en vol est borné : les pages sont lues au fil de l'eau
+            in_flight: dict[Future, list[str]] = {}
+            for pack in packs():
+                if len(in_flight) >= 2 * concurrency:
+                    done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                    collect(done)
+                future = executor.submit(enrich, pack)
+                in_flight[future] = [submission["Id"] for submission in pack]
 
-            # Génération des mots-clés et du sujet pour chaque soumission
-            LLMResponse = LLMAgent.request_keywords_and_topic(submission)
-            self.update_keywords_and_topic(submission, LLMResponse)
+            collect(wait(in_flight).done)
 
-    def get_all_users(self) -> list[DbUser]:
-        """
-        Récupère tous les utilisateurs de la table User.
+        if updates:
+            self.update_keywords_and_topics(updates)
 
-        :return: list[User] - La liste de tous les utilisateurs.
+        print(f"Analyse des réponses : {LLMAgent.parse_stats.report()}")
+
+    def export_keywords_and_topic_batch(
+        self, filepath: str, force_update: bool = False, deployment: str | None = None
+    ) -> int:
         """
+        Écrit le fichier de requêtes d'un traitement par lots (une ligne JSON par soumission,
+        custom_id étant l'identifiant de la soumission). Aucun client Azure n'est nécessaire.
 
-        users: list[DbUser] = []
+        :param filepath: str - Le chemin du fichier JSONL à écrire.
+        :param force_update: bool - Inclure aussi les soumissions ayant déjà des mots-clés et un sujet.
+        :param deployment: str | None - Le nom du déploiement visé (par défaut AZURE_OPENAI_DEPLOYMENT_NAME).
+        :return: int - Le nombre de requêtes écrites.
+        """
 
+        written: int = 0
         try:
-            # Connexion à la base de données
-            connexion: sqlite3.Connection = sqlite3.connect(self._filepath)
-            curseur: sqlite3.Cursor = connexion.cursor()
+            with open(filepath, "w", encoding="utf-8") as file:
+                for submission in self.iter_submissions(
+                    missing_keywords=not force_update,
+                    columns=["Id", "Title", "Body"],
+                ):
+                    request: dict = LLMAgent.keywords_and_topic_batch_request(
+                        submission, deployment
+                    )
+                    file.write(json.dumps(request, ensure_ascii=False) + "\n")
+                    written += 1
+        except OSError as e:
+            print(f"Erreur lors de l'écriture du fichier de requêtes '{filepath}' : {e}")
+            return written
+
+        print(f"{written} requête(s) écrite(s) dans '{filepath}'.")
+        return written
+
+    def import_keywords_and_topic_batch(
+        self, LLMAgent: LLMAgent, filepath: str, batch_size: int = 500
+    ) -> int:
+        """
+        Importe le fichier de résultats d'un traitement par lots, lu ligne par ligne.
 
-            # Exécution de la requête pour récupérer tous les utilisateurs
-            curseur.execute("SELECT Id, Name, Genre, Age FROM User")
-            rows = curseur.fetchall()
+        Chaque ligne est validée (statut de la requête, format de la réponse) ; les réponses
+        valides sont écrites par transactions de batch_size soumissions. Les lignes invalides
+        ou visant une soumission inconnue sont ignorées, leurs soumissions restent à traiter.
 
-            # Conversion des résultats en liste d'objets User
-            for row in rows:
-                user = DbUser(Id=row[0], Name=row[1], Genre=row[2], Age=row[3])
-                users.append(user)
+        :param LLMAgent: LLMAgent - L'agent LLM qui valide les réponses.
+        :param filepath: str - Le chemin du fichier JSONL de résultats.
+        :param batch_size: int - Le nombre de soumissions mises à jour par transaction.
+        :return: int - Le nombre de soumissions mises à jour.
+        """
 
-        except sqlite3.Error as e:
-            print(f"Erreur lors de la récupération des utilisateurs : {e}")
+        applied: int = 0
+        rejected: int = 0
+        unknown: int = 0
+        updates: dict[str, LLMKeywordsTopicResponseFormat] = {}
+
+        def flush():
+            nonlocal applied, unknown
+            ids: list[str] = list(updates)
+            known: set[str] = {
+                row[0]
+                for row in self.execute_command(
+                    f"SELECT Id FROM Submission WHERE Id IN ({', '.join('?' * len(ids))})",
+                    tuple(ids),
+                )
+                or []
+            }
+            unknown += len(ids) - len(known)
+            if known and self.update_keywords_and_topics(
+                [
+                    (submission_id, updates[submission_id])
+                    for submission_id in ids
+                    if submission_id in known
+                ]
+            ):
+                applied += len(known)
+            updates.clear()
 
-        finally:
-            connexion.close()
+        try:
+            with open(filepath, encoding="utf-8") as file:
+                for line in file:
+                    if not line.strip():
+                        continue
+                    submission_id, response = LLMAgent.parse_keywords_and_topic_batch_result(line)
+                    if submission_id is None or response is None:
+                        rejected += 1
+                        continue
+                    updates[submission_id] = response
+                    if len(updates) >= batch_size:
+                        flush()
+        except OSError as e:
+            print(f"Erreur lors de la lecture du fichier de résultats '{filepath}' : {e}")
+
+        if updates:
+            flush()
+
+        print(
+            f"Résultats importés : {applied} soumission(s) mise(s) à jour, "
+            f"{rejected} ligne(s) invalide(s), {unknown} soumission(s) inconnue(s)."
+        )
+        return applied
 
-        return users
+    def get_all_users(self) -> list[DbUser]:
+        """
+        Récupère tous les utilisateurs de la table User.
+
+        :return: list[User] - La liste de tous les utilisateurs.
+        """
+
+        return list(self.iter_users())
 
     def get_all_submissions(self) -> list[DbSubmission]:
         """
@@ -410,81 +1133,308 @@ class DatabaseManager:
         :return: list[Submission] - La liste de toutes les soumissions.
         """
 
-        submissions: list[DbSubmission] = []
+        return list(self.iter_submissions())
 
-        try:
-            # Connexion à la base de données
-            connexion: sqlite3.Connection = sqlite3.connect(self._filepath)
-            curseur: sqlite3.Cursor = connexion.cursor()
+    def get_all_comments(self) -> list[DbComment]:
+        """
+        Récupère tous les commentaires de la table Comment.
 
-            # Exécution de la requête pour récupérer toutes les soumissions
-            curseur.execute(
-                "SELECT Id, Author_id, Created, Sub_id, Url, Title, Body, Keywords, Topic FROM Submission"
-            )
-            rows = curseur.fetchall()
+        :return: list[Comment] - La liste de tous les commentaires.
+        """
 
-            # Conversion des résultats en liste d'objets Submission
-            for row in rows:
-                submission = DbSubmission(
-                    Id=row[0],
-                    Author_id=row[1],
-                    Created=datetime.strptime(row[2], "%Y-%m-%d %H:%M:%S.%f"),
-                    Sub_id=row[3],
-                    Url=row[4],
-                    Title=row[5],
-                    Body=row[6],
-                    Keywords=row[7].split(",") if row[7] else None,
-                    Topic=row[8],
-                )
-                submissions.append(submission)
+        return list(self.iter_comments())
+
+    def _iter_rows(
+        self,
+        table: str,
+        columns: Sequence[str],
+        allowed_columns: Sequence[str],
+        conditions: list[str],
+        params: list,
+        order_by: str,
+        after: tuple | None,
+        batch_size: int,
+        limit: int | None = None,
+        expressions: dict[str, str] | None = None,
+    ) -> Iterator[dict]:
+        """
+        Parcourt une table par paquets de batch_size lignes (fetchmany) sans tout charger en mémoire.
+
+        Le tri se fait toujours sur (order_by, Id) afin que le curseur de pagination soit unique.
+
+        :param table: str - La table à parcourir.
+        :param columns: Sequence[str] - Les colonnes à projeter.
+        :param allowed_columns: Sequence[str] - Les colonnes existantes de la table.
+        :param conditions: list[str] - Les clauses WHERE, combinées par AND.
+        :param params: list - Les paramètres des clauses WHERE.
+        :param order_by: str - La colonne de tri.
+        :param after: tuple | None - Curseur de pagination : valeurs de (order_by, Id) (ou (Id,) si order_by vaut "Id")
+                      de la dernière ligne déjà lue ; seules les lignes suivantes sont retournées.
+        :param batch_size: int - Le nombre de lignes lues par appel à fetchmany.
+        :param limit: int | None - Le nombre maximal de lignes retournées (optionnel).
+        :param expressions: dict[str, str] | None - Expressions SQL remplaçant certaines colonnes projetées (optionnel).
+        :return: Iterator[dict] - Les lignes sous forme de dictionnaires {colonne: valeur brute}.
+        """
 
-        except sqlite3.Error as e:
-            print(f"Erreur lors de la récupération des soumissions : {e}")
+        for column in (*columns, order_by):
+            if column not in allowed_columns:
+                raise ValueError(f"Colonne inconnue pour la table {table} : '{column}'")
 
+        order_columns: tuple[str, ...] = (
+            ("Id",) if order_by == "Id" else (order_by, "Id")
+        )
+        conditions = list(conditions)
+        params = list(params)
+        if after is not None:
+            conditions.append(
+                f"({', '.join(order_columns)}) > ({', '.join('?' for _ in order_columns)})"
+            )
+            params.extend(after)
+
+        expressions = expressions or {}
+        command: str = f"SELECT {', '.join(expressions.get(column, column) for column in columns)} FROM {table}"
+        if conditions:
+            command += " WHERE " + " AND ".join(conditions)
+        command += f" ORDER BY {', '.join(order_columns)}"
+        if limit is not None:
+            command += " LIMIT ?"
+            params.append(limit)
+
+        curseur: sqlite3.Cursor = self._connect().cursor()
+        curseur.execute(command, params)
+        try:
+            while rows := curseur.fetchmany(batch_size):
+                for row in rows:
+                    yield dict(zip(columns, row))
         finally:
-            connexion.close()
-
-        return submissions
-
-    def get_all_comments(self) -> list[DbComment]:
+            curseur.close()
+
+    def iter_users(
+        self,
+        columns: Sequence[str] | None = None,
+        after: tuple | None = None,
+        batch_size: int = 1000,
+    ) -> Iterator[DbUser]:
         """
-        Récupère tous les commentaires de la table Comment.
+        Parcourt les utilisateurs de la table User en mémoire constante.
 
-        :return: list[Comment] - La liste de tous les commentaires.
+        :param columns: Sequence[str] | None - Les colonnes à projeter (toutes par défaut).
+        :param after: tuple | None - Curseur de pagination (Id,) de la dernière ligne déjà lue.
+        :param batch_size: int - Le nombre de lignes lues par appel à fetchmany.
+        :return: Iterator[User] - Les utilisateurs, triés par Id.
         """
 
-        comments: list[DbComment] = []
+        all_columns: tuple[str, ...] = ("Id", "Name", "Genre", "Age")
 
         try:
-            # Connexion à la base de données
-            connexion: sqlite3.Connection = sqlite3.connect(self._filepath)
-            curseur: sqlite3.Cursor = connexion.cursor()
-
-            # Exécution de la requête pour récupérer tous les commentaires
-            curseur.execute(
-                "SELECT Id, Author_id, Created, Parent_id, Submission_id, Body FROM Comment"
+            yield from self._iter_rows(  # type: ignore[misc]
+                "User",
+                columns or all_columns,
+                all_columns,
+                [],
+                [],
+                "Id",
+                after,
+                batch_size,
             )
-            rows = curseur.fetchall()
 
-            # Conversion des résultats en liste d'objets Comment
-            for row in rows:
-                comment = DbComment(
-                    Id=row[0],
-                    Author_id=row[1],
-                    Created=datetime.strptime(row[2], "%Y-%m-%d %H:%M:%S.%f"),
-                    Parent_id=row[3],
-                    Submission_id=row[4],
-                    Body=row[5],
+        except sqlite3.Error as e:
+            print(f"Erreur lors de la récupération des utilisateurs : {e}")
+
+    def iter_submissions(
+        self,
+        start: datetime | None = None,
+        end: datetime | None = None,
+        sub_id: str | None = None,
+        missing_keywords: bool = False,
+        keyword: str | None = None,
+        columns: Sequence[str] | None = None,
+        order_by: str = "Id",
+        after: tuple | None = None,
+        batch_size: int = 1000,
+        limit: int | None = None,
+    ) -> Iterator[DbSubmission]:
+        """
+        Parcourt les soumissions de la table Submission en mémoire constante.
+
+        :param start: datetime | None - Date de création minimale, incluse (optionnel).
+        :param end: datetime | None - Date de création maximale, exclue (optionnel).
+        :param sub_id: str | None - Ne retourner que les soumissions de ce subreddit (optionnel).
+        :param missing_keywords: bool - Ne retourner que les soumissions sans mots-clés ou sans sujet
+                                 (sauf celles marquées no_keywords_topic, déjà traitées).
+        :param keyword: str | None - Ne retourner que les soumissions associées à ce mot-clé (optionnel).
+        :param columns: Sequence[str] | None - Les colonnes à projeter (toutes par défaut).
+        :param order_by: str - La colonne de tri ("Id" par défaut, "Created" pour un ordre chronologique).
+        :param after: tuple | None - Curseur de pagination, voir _iter_rows.
+        :param batch_size: int - Le nombre de lignes lues par appel à fetchmany.
+        :param limit: int | None - Le nombre maximal de soumissions retournées (optionnel).
+        :return: Iterator[Submission] - Les soumissions.
+        """
+
+        all_columns: tuple[str, ...] = (
+            "Id",
+            "Author_id",
+            "Created",
+            "Sub_id",
+            "Url",
+            "Title",
+            "Body",
+            "Keywords",
+            "Topic",
+        )
+
+        conditions: list[str] = []
+        params: list = []
+        if start is not None:
+            conditions.append("Created_utc >= ?")
+            params.append(int(start.timestamp()))
+        if end is not None:
+            conditions.append("Created_utc < ?")
+            params.append(int(end.timestamp()))
+        if sub_id is not None:
+            conditions.append("Sub_id = ?")
+            params.append(sub_id)
+        if missing_keywords:
+            conditions.append(
+                "(Topic IS NULL OR Topic = '' OR ((Keywords IS NULL OR Keywords = '') AND Topic != ?))"
+            )
+            params.append(self.no_keywords_topic)
+        if keyword is not None:
+            conditions.append("""
+                Id IN (
+                    SELECT SubmissionKeyword.Submission_id
+                    FROM SubmissionKeyword
+                    JOIN Keyword ON Keyword.Id = SubmissionKeyword.Keyword_id
+                    WHERE Keyword.Name = ?
                 )
-                comments.append(comment)
+            """)
+            params.append(keyword)
+
+        # Les mots-clés sont lus depuis l'index inversé quand il existe : contrairement à la
+        # chaîne séparée par des virgules, il conserve les mots-clés contenant une virgule
+        expressions: dict[str, str] = {}
+        if self._has_table("SubmissionKeyword"):
+            expressions["Keywords"] = """(
+                SELECT json_group_array(Name) FROM (
+                    SELECT Keyword.Name
+                    FROM SubmissionKeyword
+                    JOIN Keyword ON Keyword.Id = SubmissionKeyword.Keyword_id
+                    WHERE SubmissionKeyword.Submission_id = Submission.Id
+                    ORDER BY SubmissionKeyword.Position
+                )
+            )"""
+        # Le tri chronologique s'appuie sur la colonne indexée Created_utc
+        if order_by == "Created":
+            order_by = "Created_utc"
+            if after is not None:
+                after = (int(after[0].timestamp()), *after[1:])
+
+        try:
+            for submission in self._iter_rows(
+                "Submission",
+                columns or all_columns,
+                (*all_columns, "Created_utc"),
+                conditions,
+                params,
+                order_by,
+                after,
+                batch_size,
+                limit,
+                expressions,
+            ):
+                # Conversion des valeurs brutes en types Python
+                if "Created" in submission:
+                    submission["Created"] = datetime.strptime(
+                        submission["Created"], "%Y-%m-%d %H:%M:%S.%f"
+                    )
+                if "Keywords" in submission:
+                    if "Keywords" in expressions:
+                        submission["Keywords"] = (
+                            json.loads(submission["Keywords"]) or None
+                        )
+                    else:
+                        submission["Keywords"] = (
+                            submission["Keywords"].split(",")
+                            if submission["Keywords"]
+                            else None
+                        )
+                yield submission  # type: ignore[misc]
 
         except sqlite3.Error as e:
-            print(f"Erreur lors de la récupération des commentaires : {e}")
+            print(f"Erreur lors de la récupération des soumissions : {e}")
 
-        finally:
-            connexion.close()
+    def iter_comments(
+        self,
+        start: datetime | None = None,
+        end: datetime | None = None,
+        submission_id: str | None = None,
+        columns: Sequence[str] | None = None,
+        order_by: str = "Id",
+        after: tuple | None = None,
+        batch_size: int = 1000,
+        limit: int | None = None,
+    ) -> Iterator[DbComment]:
+        """
+        Parcourt les commentaires de la table Comment en mémoire constante.
+
+        :param start: datetime | None - Date de création minimale, incluse (optionnel).
+        :param end: datetime | None - Date de création maximale, exclue (optionnel).
+        :param submission_id: str | None - Ne retourner que les commentaires de cette soumission (optionnel).
+        :param columns: Sequence[str] | None - Les colonnes à projeter (toutes par défaut).
+        :param order_by: str - La colonne de tri ("Id" par défaut, "Created" pour un ordre chronologique).
+        :param after: tuple | None - Curseur de pagination, voir _iter_rows.
+        :param batch_size: int - Le nombre de lignes lues par appel à fetchmany.
+        :param limit: int | None - Le nombre maximal de commentaires retournés (optionnel).
+        :return: Iterator[Comment] - Les commentaires.
+        """
+
+        all_columns: tuple[str, ...] = (
+            "Id",
+            "Author_id",
+            "Created",
+            "Parent_id",
+            "Submission_id",
+            "Body",
+        )
 
-        return comments
+        conditions: list[str] = []
+        params: list = []
+        if start is not None:
+            conditions.append("Created_utc >= ?")
+            params.append(int(start.timestamp()))
+        if end is not None:
+            conditions.append("Created_utc < ?")
+            params.append(int(end.timestamp()))
+        if submission_id is not None:
+            conditions.append("Submission_id = ?")
+            params.append(submission_id)
+        # Le tri chronologique s'appuie sur la colonne indexée Created_utc
+        if order_by == "Created":
+            order_by = "Created_utc"
+            if after is not None:
+                after = (int(after[0].timestamp()), *after[1:])
+
+        try:
+            for comment in self._iter_rows(
+                "Comment",
+                columns or all_columns,
+                (*all_columns, "Created_utc"),
+                conditions,
+                params,
+                order_by,
+                after,
+                batch_size,
+                limit,
+            ):
+                # Conversion de la date brute en datetime
+                if "Created" in comment:
+                    comment["Created"] = datetime.strptime(
+                        comment["Created"], "%Y-%m-%d %H:%M:%S.%f"
+                    )
+                yield comment  # type: ignore[misc]
+
+        except sqlite3.Error as e:
+            print(f"Erreur lors de la récupération des commentaires : {e}")
 
     def execute_command(self, command: str, params: tuple = ()) -> list[tuple] | None:
         """
@@ -498,7 +1448,7 @@ class DatabaseManager:
 
         try:
             # Connexion à la base de données
-            connexion: sqlite3.Connection = sqlite3.connect(self._filepath)
+            connexion: sqlite3.Connection = self._connect()
             curseur: sqlite3.Cursor = connexion.cursor()
 
             # Exécution de la commande avec les paramètres
@@ -514,69 +1464,156 @@ class DatabaseManager:
             print("Commande exécutée avec succès.")
 
         except sqlite3.Error as e:
+            if self._connexion is not None:
+                self._connexion.rollback()
             print(f"Erreur lors de l'exécution de la commande : {e}")
 
-        finally:
-            # Fermeture de la connexion
-            connexion.close()
-
         # Retourner None si la commande n'est pas un SELECT
         return None
 
-    def calculate_keyword_occurrences(self):
+    def _rebuild_keyword_weight(self, connexion: sqlite3.Connection, table: str):
         """
-        Calcule les occurrences de chaque mot-clé dans la table Submission,
-        et enregistre les résultats dans une nouvelle table KeywordWeight.
+        Recalcule entièrement les occurrences des mots-clés à partir de l'index inversé
+        SubmissionKeyword (GROUP BY) dans une table au schéma de KeywordWeight (sans commit).
+
+        :param connexion: sqlite3.Connection - La connexion portant la transaction en cours.
+        :param table: str - La table à remplir (KeywordWeight ou une table temporaire).
         """
 
-        # Connexion à la base de données
-        connexion: sqlite3.Connection = sqlite3.connect(self._filepath)
-        curseur: sqlite3.Cursor = connexion.cursor()
+        connexion.execute(f"DELETE FROM {table}")
+        connexion.execute(f"""
+            INSERT INTO {table} (Keyword, Weight)
+            SELECT Keyword.Name, COUNT(*)
+            FROM SubmissionKeyword
+            JOIN Keyword ON Keyword.Id = SubmissionKeyword.Keyword_id
+            GROUP BY Keyword.Id
+        """)
 
-        try:
-            # Création de la table KeywordWeight si elle n'existe pas
-            curseur.execute("""
-                CREATE TABLE IF NOT EXISTS KeywordWeight (
-                    Keyword TEXT PRIMARY KEY,
-                    Weight INTEGER NOT NULL
-                );
-            """)
+    def calculate_keyword_occurrences(self):
+        """
+        Recalcule entièrement les occurrences de chaque mot-clé à partir de l'index inversé
+        SubmissionKeyword (GROUP BY), et enregistre les résultats dans la table KeywordWeight.
 
-            # Vider la table KeywordWeight si elle existe déjà
-            curseur.execute("DELETE FROM KeywordWeight")
+        Une base mise à niveau par migrate() maintient déjà KeywordWeight par triggers :
+        cet appel n'est alors utile que pour réparer la table.
+        """
 
-            # Récupération de tous les mots-clés dans la table Submission
-            curseur.execute("SELECT Keywords FROM Submission")
-            rows = curseur.fetchall()
+        try:
+            # Connexion à la base de données
+            connexion: sqlite3.Connection = self._connect()
 
-            # Compter les occurrences des mots-clés
-            keyword_counter = Counter()
-            for row in rows:
-                if row[0]:  # S'assurer que Keywords n'est pas NULL
-                    keywords = row[0].split(
-                        ","
-                    )  # Supposer que les mots-clés sont séparés par des virgules
-                    keyword_counter.update(keywords)
-
-            # Insérer les mots-clés et leurs occurrences dans la table KeywordWeight
-            for keyword, weight in keyword_counter.items():
-                curseur.execute(
-                    """
-                    INSERT INTO KeywordWeight (Keyword, Weight)
-                    VALUES (?, ?)
-                """,
-                    (keyword, weight),
-                )
+            # Création de la table KeywordWeight si elle n'existe pas
+            connexion.execute(self._table_keyword_weight)
+
+            # Vider puis remplir la table KeywordWeight en une seule requête
+            self._rebuild_keyword_weight(connexion, "KeywordWeight")
 
             # Sauvegarder les modifications
             connexion.commit()
             print("Table KeywordWeight mise à jour avec les occurrences des mots-clés.")
 
         except sqlite3.Error as e:
+            if self._connexion is not None:
+                self._connexion.rollback()
             print(f"Erreur lors du calcul des occurrences des mots-clés : {e}")
 
-        finally:
-            connexion.close()
+    def verify_keyword_weights(
+        self, repair: bool = False
+    ) -> list[tuple[str, int | None, int | None]]:
+        """
+        Reconstruit les occurrences des mots-clés de zéro dans une table temporaire et
+        les compare à l'état maintenu incrémentalement dans KeywordWeight.
+
+        :param repair: bool - Remplace KeywordWeight par la reconstruction en cas d'écart (par défaut False).
+        :return: list[tuple[str, int | None, int | None]] - Les écarts (mot-clé, poids incrémental, poids reconstruit),
+                 None indiquant un mot-clé absent de l'une des deux tables.
+        """
+
+        differences: list[tuple[str, int | None, int | None]] = []
+
+        try:
+            connexion: sqlite3.Connection = self._connect()
+            connexion.execute(
+                "CREATE TEMP TABLE IF NOT EXISTS KeywordWeightRebuild (Keyword TEXT PRIMARY KEY, Weight INTEGER NOT NULL)"
+            )
+            self._rebuild_keyword_weight(connexion, "KeywordWeightRebuild")
+
+            # FULL OUTER JOIN émulé par deux LEFT JOIN
+            differences = connexion.execute("""
+                SELECT Current.Keyword, Current.Weight, Rebuild.Weight
+                FROM KeywordWeight AS Current
+                LEFT JOIN KeywordWeightRebuild AS Rebuild ON Rebuild.Keyword = Current.Keyword
+                WHERE Rebuild.Weight IS NOT Current.Weight
+                UNION ALL
+                SELECT Rebuild.Keyword, NULL, Rebuild.Weight
+                FROM KeywordWeightRebuild AS Rebuild
+                WHERE Rebuild.Keyword NOT IN (SELECT Keyword FROM KeywordWeight)
+                ORDER BY 1
+            """).fetchall()
+
+            if differences and repair:
+                self._rebuild_keyword_weight(connexion, "KeywordWeight")
+                print(f"KeywordWeight réparée ({len(differences)} écart(s) corrigé(s)).")
+            else:
+                print(f"Vérification de KeywordWeight : {len(differences)} écart(s).")
+
+            connexion.execute("DROP TABLE KeywordWeightRebuild")
+            connexion.commit()
+
+        except sqlite3.Error as e:
+            if self._connexion is not None:
+                self._connexion.rollback()
+            print(f"Erreur lors de la vérification des occurrences des mots-clés : {e}")
+
+        return differences
+
+    def get_top_keywords(
+        self,
+        start: datetime | None = None,
+        end: datetime | None = None,
+        limit: int = 10,
+    ) -> list[DbWeightedKeyword]:
+        """
+        Récupère les mots-clés les plus fréquents sur une fenêtre de temps.
+
+        :param start: datetime | None - Date de création minimale des soumissions, incluse (optionnel).
+        :param end: datetime | None - Date de création maximale des soumissions, exclue (optionnel).
+        :param limit: int - Le nombre de mots-clés retournés.
+        :return: list[DbWeightedKeyword] - Les mots-clés et leur nombre d'occurrences, du plus au moins fréquent.
+        """
+
+        conditions: list[str] = []
+        params: list = []
+        if start is not None:
+            conditions.append("Submission.Created_utc >= ?")
+            params.append(int(start.timestamp()))
+        if end is not None:
+            conditions.append("Submission.Created_utc < ?")
+            params.append(int(end.timestamp()))
+
+        command: str = """
+            SELECT Keyword.Name, COUNT(*) AS Weight
+            FROM SubmissionKeyword
+            JOIN Keyword ON Keyword.Id = SubmissionKeyword.Keyword_id
+        """
+        if conditions:
+            command += """
+            JOIN Submission ON Submission.Id = SubmissionKeyword.Submission_id
+            WHERE """ + " AND ".join(conditions)
+        command += """
+            GROUP BY Keyword.Id
+            ORDER BY Weight DESC, Keyword.Name
+            LIMIT ?
+        """
+        params.append(limit)
+
+        try:
+            rows = self._connect().execute(command, params).fetchall()
+            return [{"Keyword": row[0], "Weight": row[1]} for row in rows]
+
+        except sqlite3.Error as e:
+            print(f"Erreur lors de la récupération des mots-clés les plus fréquents : {e}")
+            return []
 
     def categorize_keywords(self, chatgpt: LLMAgent, category_number: int):
         """
@@ -589,7 +1626,7 @@ class DatabaseManager:
 
         try:
             # Connexion à la base de données
-            connexion: sqlite3.Connection = sqlite3.connect(self._filepath)
+            connexion: sqlite3.Connection = self._connect()
             curseur: sqlite3.Cursor = connexion.cursor()
 
             # Récupération des mots-clés et de leur fréquence depuis KeywordWeight
@@ -638,158 +1675,490 @@ class DatabaseManager:
             print("Table CategoryWeight mise à jour avec les catégories des mots-clés.")
 
         except sqlite3.Error as e:
+            if self._connexion is not None:
+                self._connexion.rollback()
             print(
                 f"Erreur lors de la récupération ou de la catégorisation des mots-clés : {e}"
             )
 
-        finally:
-            connexion.close()
-
     def calculate_submissions_count_by_date(self):
         """
-        Cette fonction récupère les dates de soumission, compte les soumissions par jour
-        et insère ou met à jour les résultats dans une table SubmissionDate.
+        Cette fonction compte les soumissions par jour directement en SQL (GROUP BY)
+        et remplace les résultats de la table SubmissionDate.
         """
 
         try:
-            # Connexion à la base de données
-            connexion = sqlite3.connect(self._filepath)
+            connexion = self._connect()
             curseur = connexion.cursor()
 
-            # Récupérer toutes les soumissions
-            submissions: list[DbSubmission] = self.get_all_submissions()
-
-            # Créer un dictionnaire pour compter les soumissions par jour
-            date_count = defaultdict(int)
-
-            # Parcourir les soumissions et compter les soumissions par date
-            for submission in submissions:
-                # Extraire uniquement la date (en omettant l'heure)
-                date_only = submission[
-                    "Created"
-                ].date()  # Utilisation de .date() pour extraire la partie date
-
-                # Compter la soumission pour cette date
-                date_count[date_only] += 1
-
             # Création de la table SubmissionDate si elle n'existe pas
+            curseur.execute(self._table_submission_date)
+
+            # Recalcul complet en une seule requête d'agrégation
+            curseur.execute("DELETE FROM SubmissionDate")
             curseur.execute("""
-            CREATE TABLE IF NOT EXISTS SubmissionDate (
-                Date TEXT PRIMARY KEY,
-                NbSubmissions INTEGER NOT NULL
-            )
+            INSERT INTO SubmissionDate (Date, NbSubmissions)
+            SELECT date(Created), COUNT(*)
+            FROM Submission
+            GROUP BY date(Created)
             """)
 
-            # Insérer ou mettre à jour les résultats dans la table SubmissionDate
-            for date, count in date_count.items():
-                try:
-                    curseur.execute(
-                        """
-                    INSERT INTO SubmissionDate (Date, NbSubmissions) 
-                    VALUES (?, ?)
-                    ON CONFLICT(Date) 
-                    DO UPDATE SET NbSubmissions = excluded.NbSubmissions
-                    """,
-                        (date, count),
-                    )
-                except sqlite3.IntegrityError as e:
-                    print(
-                        f"Erreur d'intégrité lors de l'insertion des données pour la date {date}: {e}"
-                    )
-                except sqlite3.Error as e:
-                    print(
-                        f"Une erreur est survenue lors de l'insertion des données pour la date {date}: {e}"
-                    )
-
             # Validation des changements
             connexion.commit()
 
         except sqlite3.Error as e:
+            if self._connexion is not None:
+                self._connexion.rollback()
             print(
                 f"Une erreur est survenue lors de la connexion ou de l'exécution des requêtes : {e}"
             )
 
-        finally:
-            # Fermeture de la connexion
-            if connexion:
-                connexion.close()
-
     def calculate_submissions_count_by_weekday(self):
         """
-        Cette fonction récupère les dates de soumission, compte les soumissions par jour de la semaine,
-        et insère ou met à jour les résultats dans une table SubmissionWeekdayCount avec le jour de la semaine,
-        son ordre et le nombre de soumissions.
+        Cette fonction compte les soumissions par jour de la semaine directement en SQL (GROUP BY)
+        et remplace les résultats de la table SubmissionWeekdayCount avec le jour de la semaine,
+        son ordre (lundi = 0, dimanche = 6) et le nombre de soumissions.
         """
 
         try:
-            # Connexion à la base de données
-            connexion = sqlite3.connect(self._filepath)
+            connexion = self._connect()
             curseur = connexion.cursor()
 
-            # Récupérer toutes les soumissions
-            submissions: list[DbSubmission] = self.get_all_submissions()
-
-            # Créer un dictionnaire pour compter les soumissions par jour de la semaine
-            weekday_count = defaultdict(int)
-
-            # Parcourir les soumissions et compter les soumissions par jour de la semaine
-            for submission in submissions:
-                # Extraire le jour de la semaine (lundi = 0, dimanche = 6)
-                weekday = submission["Created"].weekday()
-
-                # Compter la soumission pour ce jour de la semaine
-                weekday_count[weekday] += 1
-
-            # Dictionnaire pour correspondre l'ordre et le nom du jour de la semaine
-            weekdays = {
-                0: "Lundi",
-                1: "Mardi",
-                2: "Mercredi",
-                3: "Jeudi",
-                4: "Vendredi",
-                5: "Samedi",
-                6: "Dimanche",
-            }
-
             # Création de la table SubmissionWeekdayCount si elle n'existe pas
-            curseur.execute("""
-            CREATE TABLE IF NOT EXISTS SubmissionWeekdayCount (
-                Weekday TEXT PRIMARY KEY,
-                Id INTEGER NOT NULL,
-                NbSubmissions INTEGER NOT NULL
+            curseur.execute(self._table_submission_weekday_count)
+
+            # Recalcul complet en une seule requête d'agrégation
+            curseur.execute("DELETE FROM SubmissionWeekdayCount")
+            curseur.execute(f"""
+            INSERT INTO SubmissionWeekdayCount (Weekday, Id, NbSubmissions)
+            SELECT {self._weekday_name_sql("Created")}, {self._weekday_id_sql("Created")}, COUNT(*)
+            FROM Submission
+            GROUP BY {self._weekday_id_sql("Created")}
+            """)
+
+            # Validation des changements
+            connexion.commit()
+
+        except sqlite3.Error as e:
+            if self._connexion is not None:
+                self._connexion.rollback()
+            print(
+                f"Une erreur est survenue lors de la connexion ou de l'exécution des requêtes : {e}"
             )
+
+    def enable_incremental_submission_counts(self):
+        """
+        Recalcule SubmissionDate et SubmissionWeekdayCount puis installe des triggers
+        qui les maintiennent à jour à chaque insertion, suppression ou changement de date
+        d'une soumission : rafraîchir les statistiques après une collecte coûte alors
+        O(nouvelles lignes) et non plus O(table).
+        """
+
+        self.calculate_submissions_count_by_date()
+        self.calculate_submissions_count_by_weekday()
+
+        try:
+            connexion = self._connect()
+
+            # Expressions SQL (date, numéro et nom du jour) pour une ligne NEW ou OLD
+            def counts(row: str) -> tuple[str, str, str]:
+                return (
+                    f"date({row}.Created)",
+                    self._weekday_id_sql(f"{row}.Created"),
+                    self._weekday_name_sql(f"{row}.Created"),
+                )
+
+            def increment(row: str) -> str:
+                date, weekday_id, weekday_name = counts(row)
+                return f"""
+                    INSERT INTO SubmissionDate (Date, NbSubmissions) VALUES ({date}, 1)
+                    ON CONFLICT(Date) DO UPDATE SET NbSubmissions = NbSubmissions + 1;
+                    INSERT INTO SubmissionWeekdayCount (Weekday, Id, NbSubmissions)
+                    VALUES ({weekday_name}, {weekday_id}, 1)
+                    ON CONFLICT(Weekday) DO UPDATE SET NbSubmissions = NbSubmissions + 1;
+                """
+
+            def decrement(row: str) -> str:
+                date, weekday_id, _ = counts(row)
+                return f"""
+                    UPDATE SubmissionDate SET NbSubmissions = NbSubmissions - 1 WHERE Date = {date};
+                    UPDATE SubmissionWeekdayCount SET NbSubmissions = NbSubmissions - 1 WHERE Id = {weekday_id};
+                    DELETE FROM SubmissionDate WHERE Date = {date} AND NbSubmissions <= 0;
+                    DELETE FROM SubmissionWeekdayCount WHERE Id = {weekday_id} AND NbSubmissions <= 0;
+                """
+
+            connexion.executescript(f"""
+            CREATE TRIGGER IF NOT EXISTS SubmissionCountsInsert AFTER INSERT ON Submission
+            BEGIN {increment("NEW")} END;
+
+            CREATE TRIGGER IF NOT EXISTS SubmissionCountsDelete AFTER DELETE ON Submission
+            BEGIN {decrement("OLD")} END;
+
+            CREATE TRIGGER IF NOT EXISTS SubmissionCountsUpdate AFTER UPDATE OF Created ON Submission
+            BEGIN {decrement("OLD")} {increment("NEW")} END;
             """)
+            print("Triggers de comptage des soumissions installés.")
 
-            # Insérer ou mettre à jour les résultats dans la table SubmissionWeekdayCount
-            for weekday, count in weekday_count.items():
-                try:
-                    curseur.execute(
-                        """
-                    INSERT INTO SubmissionWeekdayCount (Weekday, Id, NbSubmissions) 
-                    VALUES (?, ?, ?)
-                    ON CONFLICT(Weekday) 
-                    DO UPDATE SET NbSubmissions = excluded.NbSubmissions
-                    """,
-                        (weekdays[weekday], weekday, count),
+        except sqlite3.Error as e:
+            if self._connexion is not None:
+                self._connexion.rollback()
+            print(f"Erreur lors de l'installation des triggers de comptage : {e}")
+
+    def disable_incremental_submission_counts(self):
+        """Supprime les triggers de maintenance incrémentale de SubmissionDate et SubmissionWeekdayCount."""
+
+        try:
+            connexion = self._connect()
+            for trigger in (
+                "SubmissionCountsInsert",
+                "SubmissionCountsDelete",
+                "SubmissionCountsUpdate",
+            ):
+                connexion.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+            connexion.commit()
+
+        except sqlite3.Error as e:
+            if self._connexion is not None:
+                self._connexion.rollback()
+            print(f"Erreur lors de la suppression des triggers de comptage : {e}")
+
+    def rebuild_search_index(self):
+        """
+        Crée si nécessaire les index plein texte FTS5 (SubmissionSearch, CommentSearch) et
+        leurs triggers de synchronisation, puis les reconstruit entièrement depuis
+        Submission et Comment. À lancer sur une base existante ou après un VACUUM.
+        """
+
+        try:
+            connexion: sqlite3.Connection = self._connect()
+
+            for table in self._tables_search:
+                connexion.execute(table)
+            for trigger in self._triggers_search:
+                connexion.execute(trigger)
+
+            print("Reconstruction de l'index plein texte...")
+            connexion.execute(
+                "INSERT INTO SubmissionSearch (SubmissionSearch) VALUES ('rebuild')"
+            )
+            connexion.execute(
+                "INSERT INTO CommentSearch (CommentSearch) VALUES ('rebuild')"
+            )
+            connexion.commit()
+            print("Index plein texte reconstruit.")
+
+        except sqlite3.OperationalError as e:
+            # Par exemple si SQLite a été compilé sans FTS5
+            if self._connexion is not None:
+                self._connexion.rollback()
+            print(f"Index plein texte indisponible : {e}")
+
+        except sqlite3.Error as e:
+            if self._connexion is not None:
+                self._connexion.rollback()
+            print(f"Erreur lors de la reconstruction de l'index plein texte : {e}")
+
+    def search(
+        self,
+        query: str,
+        start: datetime | None = None,
+        end: datetime | None = None,
+        sub_id: str | None = None,
+        kinds: Sequence[str] = ("submission", "comment"),
+        limit: int = 20,
+    ) -> list[DbSearchResult]:
+        """
+        Recherche plein texte dans les titres et corps des soumissions et le corps des commentaires,
+        classée par pertinence (bm25, le titre pesant double).
+
+        :param query: str - La requête, en syntaxe FTS5 (par exemple 'impôts NEAR(voiture)' ou '"carte vitale"').
+        :param start: datetime | None - Date de création minimale, incluse (optionnel).
+        :param end: datetime | None - Date de création maximale, exclue (optionnel).
+        :param sub_id: str | None - Ne chercher que dans ce subreddit (optionnel).
+        :param kinds: Sequence[str] - Les types d'éléments recherchés ("submission" et/ou "comment").
+        :param limit: int - Le nombre maximal de résultats.
+        :return: list[DbSearchResult] - Les résultats, du plus au moins pertinent.
+        """
+
+        def filters(alias: str) -> tuple[str, list]:
+            conditions: list[str] = []
+            params: list = []
+            if start is not None:
+                conditions.append(f"{alias}.Created_utc >= ?")
+                params.append(int(start.timestamp()))
+            if end is not None:
+                conditions.append(f"{alias}.Created_utc < ?")
+                params.append(int(end.timestamp()))
+            if sub_id is not None:
+                if alias == "Submission":
+                    conditions.append("Submission.Sub_id = ?")
+                else:
+                    conditions.append(
+                        "Comment.Submission_id IN (SELECT 't3_' || Id FROM Submission WHERE Sub_id = ?)"
                     )
-                except sqlite3.IntegrityError as e:
-                    print(
-                        f"Erreur d'intégrité lors de l'insertion des données pour le jour {weekdays[weekday]}: {e}"
+                params.append(sub_id)
+            return "".join(f" AND {condition}" for condition in conditions), params
+
+        results: list[DbSearchResult] = []
+
+        try:
+            connexion: sqlite3.Connection = self._connect()
+
+            if "submission" in kinds:
+                conditions, params = filters("Submission")
+                rows = connexion.execute(
+                    f"""
+                    SELECT Submission.Id, Submission.Created,
+                           bm25(SubmissionSearch, 2.0, 1.0) AS Rank,
+                           snippet(SubmissionSearch, -1, '[', ']', '…', 12)
+                    FROM SubmissionSearch
+                    JOIN Submission ON Submission.rowid = SubmissionSearch.rowid
+                    WHERE SubmissionSearch MATCH ?{conditions}
+                    ORDER BY Rank
+                    LIMIT ?
+                    """,
+                    [query, *params, limit],
+                ).fetchall()
+                results.extend(
+                    DbSearchResult(
+                        Kind="submission",
+                        Id=row[0],
+                        Submission_id=row[0],
+                        Created=datetime.strptime(row[1], "%Y-%m-%d %H:%M:%S.%f"),
+                        Rank=row[2],
+                        Snippet=row[3],
                     )
-                except sqlite3.Error as e:
-                    print(
-                        f"Une erreur est survenue lors de l'insertion des données pour le jour {weekdays[weekday]}: {e}"
+                    for row in rows
+                )
+
+            if "comment" in kinds:
+                conditions, params = filters("Comment")
+                rows = connexion.execute(
+                    f"""
+                    SELECT Comment.Id, Comment.Submission_id, Comment.Created,
+                           bm25(CommentSearch) AS Rank,
+                           snippet(CommentSearch, -1, '[', ']', '…', 12)
+                    FROM CommentSearch
+                    JOIN Comment ON Comment.rowid = CommentSearch.rowid
+                    WHERE CommentSearch MATCH ?{conditions}
+                    ORDER BY Rank
+                    LIMIT ?
+                    """,
+                    [query, *params, limit],
+                ).fetchall()
+                results.extend(
+                    DbSearchResult(
+                        Kind="comment",
+                        Id=row[0],
+                        Submission_id=row[1],
+                        Created=datetime.strptime(row[2], "%Y-%m-%d %H:%M:%S.%f"),
+                        Rank=row[3],
+                        Snippet=row[4],
                     )
+                    for row in rows
+                )
 
-            # Validation des changements
+        except sqlite3.Error as e:
+            print(f"Erreur lors de la recherche plein texte : {e}")
+
+        return sorted(results, key=lambda result: result["Rank"])[:limit]
+
+    def get_crawl_state(self, subreddit: str, listing: str) -> DbCrawlState | None:
+        """
+        Récupère l'état de collecte d'un listing de subreddit.
+
+        :param subreddit: str - Le nom du subreddit.
+        :param listing: str - Le listing collecté (par exemple "new").
+        :return: DbCrawlState | None - L'état de collecte, ou None si ce listing n'a jamais été collecté.
+        """
+
+        try:
+            row = (
+                self._connect()
+                .execute(
+                    """
+                    SELECT Subreddit, Listing, Newest_fullname, Newest_created_utc,
+                           Head_fullname, Head_created_utc, Checkpoint_fullname
+                    FROM CrawlState
+                    WHERE Subreddit = ? AND Listing = ?
+                    """,
+                    (subreddit, listing),
+                )
+                .fetchone()
+            )
+
+        except sqlite3.Error as e:
+            print(f"Erreur lors de la récupération de l'état de collecte : {e}")
+            return None
+
+        if row is None:
+            return None
+
+        return DbCrawlState(
+            Subreddit=row[0],
+            Listing=row[1],
+            Newest_fullname=row[2],
+            Newest_created_utc=row[3],
+            Head_fullname=row[4],
+            Head_created_utc=row[5],
+            Checkpoint_fullname=row[6],
+        )
+
+    def save_crawl_state(self, state: DbCrawlState):
+        """
+        Enregistre (insère ou remplace) l'état de collecte d'un listing de subreddit.
+
+        :param state: DbCrawlState - L'état de collecte.
+        """
+
+        try:
+            connexion: sqlite3.Connection = self._connect()
+            connexion.execute(
+                """
+                INSERT INTO CrawlState (Subreddit, Listing, Newest_fullname, Newest_created_utc,
+                                        Head_fullname, Head_created_utc, Checkpoint_fullname, Updated_utc)
+                VALUES (?, ?, ?, ?, ?, ?, ?, CAST(strftime('%s', 'now') AS INTEGER))
+                ON CONFLICT(Subreddit, Listing) DO UPDATE SET
+                    Newest_fullname = excluded.Newest_fullname,
+                    Newest_created_utc = excluded.Newest_created_utc,
+                    Head_fullname = excluded.Head_fullname,
+                    Head_created_utc = excluded.Head_created_utc,
+                    Checkpoint_fullname = excluded.Checkpoint_fullname,
+                    Updated_utc = excluded.Updated_utc
+                """,
+                (
+                    state["Subreddit"],
+                    state["Listing"],
+                    state["Newest_fullname"],
+                    state["Newest_created_utc"],
+                    state["Head_fullname"],
+                    state["Head_created_utc"],
+                    state["Checkpoint_fullname"],
+                ),
+            )
             connexion.commit()
 
         except sqlite3.Error as e:
-            print(
-                f"Une erreur est survenue lors de la connexion ou de l'exécution des requêtes : {e}"
+            if self._connexion is not None:
+                self._connexion.rollback()
+            print(f"Erreur lors de l'enregistrement de l'état de collecte : {e}")
+
+    def get_crawl_schedules(self) -> list[DbCrawlSchedule]:
+        """
+        Récupère la planification enregistrée de tous les subreddits collectés.
+
+        :return: list[DbCrawlSchedule] - Les planifications, triées par date de prochaine collecte.
+        """
+
+        try:
+            rows = (
+                self._connect()
+                .execute("""
+                    SELECT Subreddit, Interval, Velocity, Cost, Last_run_utc, Next_run_utc
+                    FROM CrawlSchedule
+                    ORDER BY Next_run_utc
+                """)
+                .fetchall()
             )
 
-        finally:
-            # Fermeture de la connexion
-            if connexion:
-                connexion.close()
+        except sqlite3.Error as e:
+            print(f"Erreur lors de la récupération de la planification : {e}")
+            return []
+
+        return [
+            DbCrawlSchedule(
+                Subreddit=row[0],
+                Interval=row[1],
+                Velocity=row[2],
+                Cost=row[3],
+                Last_run_utc=row[4],
+                Next_run_utc=row[5],
+            )
+            for row in rows
+        ]
+
+    def save_crawl_schedule(self, schedule: DbCrawlSchedule):
+        """
+        Enregistre (insère ou remplace) la planification d'un subreddit.
+
+        :param schedule: DbCrawlSchedule - La planification.
+        """
+
+        try:
+            connexion: sqlite3.Connection = self._connect()
+            connexion.execute(
+                """
+                INSERT INTO CrawlSchedule (Subreddit, Interval, Velocity, Cost,
+                                           Last_run_utc, Next_run_utc, Updated_utc)
+                VALUES (?, ?, ?, ?, ?, ?, CAST(strftime('%s', 'now') AS INTEGER))
+                ON CONFLICT(Subreddit) DO UPDATE SET
+                    Interval = excluded.Interval,
+                    Velocity = excluded.Velocity,
+                    Cost = excluded.Cost,
+                    Last_run_utc = excluded.Last_run_utc,
+                    Next_run_utc = excluded.Next_run_utc,
+                    Updated_utc = excluded.Updated_utc
+                """,
+                (
+                    schedule["Subreddit"],
+                    schedule["Interval"],
+                    schedule["Velocity"],
+                    schedule["Cost"],
+                    schedule["Last_run_utc"],
+                    schedule["Next_run_utc"],
+                ),
+            )
+            connexion.commit()
+
+        except sqlite3.Error as e:
+            if self._connexion is not None:
+                self._connexion.rollback()
+            print(f"Erreur lors de l'enregistrement de la planification : {e}")
+
+    def get_import_offset(self, source: str) -> int:
+        """
+        Récupère la position (en octets décompressés) atteinte par l'import d'une archive.
+
+        :param source: str - Le nom de l'archive.
+        :return: int - La position, 0 si l'archive n'a jamais été importée.
+        """
+
+        try:
+            row = (
+                self._connect()
+                .execute("SELECT Offset FROM ImportState WHERE Source = ?", (source,))
+                .fetchone()
+            )
+
+        except sqlite3.Error as e:
+            print(f"Erreur lors de la récupération de l'état d'import : {e}")
+            return 0
+
+        return row[0] if row is not None else 0
+
+    def save_import_offset(self, source: str, offset: int):
+        """
+        Enregistre la position atteinte par l'import d'une archive.
+
+        :param source: str - Le nom de l'archive.
+        :param offset: int - La position, en octets décompressés.
+        """
+
+        try:
+            connexion: sqlite3.Connection = self._connect()
+            connexion.execute(
+                """
+                INSERT INTO ImportState (Source, Offset, Updated_utc)
+                VALUES (?, ?, CAST(strftime('%s', 'now') AS INTEGER))
+                ON CONFLICT(Source) DO UPDATE SET
+                    Offset = excluded.Offset,
+                    Updated_utc = excluded.Updated_utc
+                """,
+                (source, offset),
+            )
+            connexion.commit()
+
+        except sqlite3.Error as e:
+            if self._connexion is not None:
+                self._connexion.rollback()
+            print(f"Erreur lors de l'enregistrement de l'état d'import : {e}")
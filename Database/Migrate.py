@@ -0,0 +1,22 @@
+"""
+Met à niveau le schéma de bases de données existantes (par exemple Datasets/*.db).
+
+Usage : python -m Database.Migrate Datasets/askfrance_1000.db [autres fichiers .db ...]
+"""
+
+import sys
+from .Manager import DatabaseManager
+
+
+def main(filepaths: list[str]):
+    for filepath in filepaths:
+        print(f"Migration de {filepath}...")
+        with DatabaseManager("", filepath=filepath) as database:
+            database.migrate()
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print(__doc__)
+        sys.exit(1)
+    main(sys.argv[1:])
@@ -0,0 +1,34 @@
+"""
+Recherche plein texte dans une base de données, ou (re)construction de son index FTS5.
+
+Usage :
+    python -m Database.Search Datasets/askfrance_1000.db --rebuild
+    python -m Database.Search Datasets/askfrance_1000.db "carte vitale" [--limit 10]
+"""
+
+import argparse
+from .Manager import DatabaseManager
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("filepath")
+    parser.add_argument("query", nargs="?")
+    parser.add_argument(
+        "--rebuild", action="store_true", help="Reconstruit l'index plein texte"
+    )
+    parser.add_argument("--limit", type=int, default=10)
+    args = parser.parse_args()
+
+    with DatabaseManager("", filepath=args.filepath) as database:
+        if args.rebuild:
+            database.rebuild_search_index()
+        if args.query:
+            for result in database.search(args.query, limit=args.limit):
+                print(
+                    f"{result['Rank']:8.2f}  {result['Kind']:<10} {result['Id']:<10} {result['Snippet']}"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import NotRequired, TypedDict
+from typing import Literal, NotRequired, TypedDict
 
 """
 This module defines the TypedDicts used to represent the different types of data stored in the database.
@@ -95,3 +95,92 @@ class DbWeightedCategory(TypedDict):
 
     Category: str
     Weight: int
+
+
+"""
+Conflict resolution mode for bulk inserts: "update" refreshes existing rows, "nothing" skips them.
+"""
+DbOnConflict = Literal["update", "nothing"]
+
+
+class DbBatchSummary(TypedDict):
+    """
+    This module defines the TypedDict for summarizing the outcome of one bulk insert batch.
+
+    Attributes:
+        Inserted (int): The number of new rows inserted.
+        Updated (int): The number of existing rows refreshed.
+        Skipped (int): The number of rows ignored because they already existed.
+        Rejected (int): The number of rows rejected by validation or by a constraint.
+    """
+
+    Inserted: int
+    Updated: int
+    Skipped: int
+    Rejected: int
+
+
+class DbSearchResult(TypedDict):
+    """
+    This module defines the TypedDict for representing a full-text search result.
+
+    Attributes:
+        Kind (str): The kind of the matched item ("submission" or "comment").
+        Id (str): The unique identifier of the matched submission or comment.
+        Submission_id (str): The identifier of the submission the item belongs to (its own Id for a submission).
+        Created (datetime): The creation date of the matched item.
+        Rank (float): The bm25 score of the match (lower is better).
+        Snippet (str): An excerpt of the matched text with the matched terms highlighted.
+    """
+
+    Kind: str
+    Id: str
+    Submission_id: str
+    Created: datetime
+    Rank: float
+    Snippet: str
+
+
+class DbCrawlState(TypedDict):
+    """
+    This module defines the TypedDict for representing the crawl state (watermarks) of one subreddit listing.
+
+    Attributes:
+        Subreddit (str): The display name of the crawled subreddit.
+        Listing (str): The crawled listing (e.g. "new").
+        Newest_fullname (Optional[str]): The fullname of the newest item seen by the last completed crawl.
+        Newest_created_utc (Optional[int]): The creation timestamp of that item.
+        Head_fullname (Optional[str]): The fullname of the newest item of the crawl in progress.
+        Head_created_utc (Optional[int]): The creation timestamp of that item.
+        Checkpoint_fullname (Optional[str]): The fullname of the last item processed by the crawl in progress,
+            from which an interrupted crawl resumes.
+    """
+
+    Subreddit: str
+    Listing: str
+    Newest_fullname: str | None
+    Newest_created_utc: int | None
+    Head_fullname: str | None
+    Head_created_utc: int | None
+    Checkpoint_fullname: str | None
+
+
+class DbCrawlSchedule(TypedDict):
+    """
+    This module defines the TypedDict for representing the persisted schedule of one crawled subreddit.
+
+    Attributes:
+        Subreddit (str): The display name of the crawled subreddit.
+        Interval (float): The current delay between two crawls, in seconds.
+        Velocity (Optional[float]): The observed posting rate, in new items per hour (moving average).
+        Cost (Optional[float]): The observed number of API requests per crawl (moving average).
+        Last_run_utc (Optional[int]): The timestamp of the last completed crawl.
+        Next_run_utc (int): The timestamp of the next planned crawl.
+    """
+
+    Subreddit: str
+    Interval: float
+    Velocity: float | None
+    Cost: float | None
+    Last_run_utc: int | None
+    Next_run_utc: int
@@ -0,0 +1,30 @@
+"""
+Vérifie que la table KeywordWeight, maintenue incrémentalement, correspond à un
+recalcul complet depuis l'index inversé des mots-clés.
+
+Usage : python -m Database.Verify Datasets/askfrance_1000.db [--repair]
+"""
+
+import argparse
+from .Manager import DatabaseManager
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("filepaths", nargs="+")
+    parser.add_argument(
+        "--repair", action="store_true", help="Corrige KeywordWeight en cas d'écart"
+    )
+    args = parser.parse_args()
+
+    for filepath in args.filepaths:
+        print(f"Vérification de {filepath}...")
+        with DatabaseManager("", filepath=filepath) as database:
+            for keyword, current, rebuilt in database.verify_keyword_weights(
+                args.repair
+            ):
+                print(f"  {keyword!r} : incrémental={current}, reconstruit={rebuilt}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from typing import Any
+
+
+class LLMCache:
+    """
+    Persistent SQLite store of LLM answers.
+
+    Entries are keyed by a hash of the task's system prompt, the model deployment and the
+    normalized payload: editing a prompt or switching deployment invalidates the previous
+    entries. When the store grows beyond max_bytes, the least recently used entries are
+    evicted.
+    """
+
+    def __init__(self, filepath: str | None = None, max_bytes: int = 256 * 2**20) -> None:
+        """
+        Args:
+            filepath (str | None): The cache file (defaults to llm_cache.db in the module folder).
+            max_bytes (int): The maximum total size of the stored answers.
+        """
+
+        self._filepath = filepath or os.path.join(
+            os.path.dirname(__file__), "llm_cache.db"
+        )
+        self._max_bytes = max_bytes
+        self._lock: threading.Lock = threading.Lock()
+        self.hits: int = 0
+        self.misses: int = 0
+        self.evictions: int = 0
+
+        self._connexion: sqlite3.Connection = sqlite3.connect(
+            self._filepath, check_same_thread=False
+        )
+        self._connexion.execute("PRAGMA journal_mode = WAL")
+        self._connexion.execute("PRAGMA synchronous = NORMAL")
+        self._connexion.execute("""
+            CREATE TABLE IF NOT EXISTS LLMCache (
+                Key TEXT PRIMARY KEY,
+                Response TEXT NOT NULL,
+                Size INTEGER NOT NULL,
+                Last_used_utc REAL NOT NULL
+            ) WITHOUT ROWID
+        """)
+        self._connexion.execute(
+            "CREATE INDEX IF NOT EXISTS IdxLLMCacheLastUsed ON LLMCache(Last_used_utc)"
+        )
+        self._connexion.commit()
+        self._size: int = self._connexion.execute(
+            "SELECT COALESCE(SUM(Size), 0) FROM LLMCache"
+        ).fetchone()[0]
+
+    def close(self):
+        self._connexion.close()
+
+    @staticmethod
+    def normalize(text: str) -> str:
+        """Normalizes a payload so that cosmetic differences (Unicode form, spacing) share an entry."""
+
+        return re.sub(r"\s+", " ", unicodedata.normalize("NFC", text)).strip()
+
+    @classmethod
+    def key(cls, system_prompt: str, deployment: str | None, payload: str) -> str:
+        """
+        Computes the cache key of a request.
+
+        Args:
+            system_prompt (str): The system prompt (or prompts) of the task.
+            deployment (str | None): The model deployment.
+            payload (str): The request payload.
+
+        Returns:
+            str: The key.
+        """
+
+        return hashlib.sha256(
+            json.dumps(
+                [cls.normalize(system_prompt), deployment, cls.normalize(payload)]
+            ).encode()
+        ).hexdigest()
+
+    def get(self, key: str) -> Any | None:
+        """
+        Returns the answer stored under a key, if any.
+
+        Args:
+            key (str): The cache key.
+
+        Returns:
+            Any | None: The decoded answer, or None.
+        """
+
+        with self._lock:
+            row = self._connexion.execute(
+                "SELECT Response FROM LLMCache WHERE Key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+
+            self.hits += 1
+            self._connexion.execute(
+                "UPDATE LLMCache SET Last_used_utc = ? WHERE Key = ?", (time.time(), key)
+            )
+            self._connexion.commit()
+        return json.loads(row[0])
+
+    def put_many(self, entries: list[tuple[str, Any]]):
+        """
+        Stores several answers, then evicts the least recently used ones if the store is too large.
+
+        Args:
+            entries (list[tuple[str, Any]]): The cache keys and answers.
+        """
+
+        rows: list[tuple[str, str, int, float]] = []
+        now: float = time.time()
+        for key, response in entries:
+            encoded: str = json.dumps(response, ensure_ascii=False)
+            rows.append((key, encoded, len(encoded.encode()), now))
+
+        with self._lock:
+            for key, _, size, _ in rows:
+                previous = self._connexion.execute(
+                    "SELECT Size FROM LLMCache WHERE Key = ?", (key,)
+                ).fetchone()
+                self._size += size - (previous[0] if previous else 0)
+            self._connexion.executemany(
+                "INSERT OR REPLACE INTO LLMCache (Key, Response, Size, Last_used_utc) VALUES (?, ?, ?, ?)",
+                rows,
+            )
+
+            if self._size > self._max_bytes:
+                # Éviction jusqu'à 90 % de la taille maximale, pour ne pas évincer à chaque ajout
+                evicted: int = 0
+                for key, size in self._connexion.execute(
+                    "SELECT Key, Size FROM LLMCache ORDER BY Last_used_utc"
+                ).fetchall():
+                    if self._size <= 0.9 * self._max_bytes:
+                        break
+                    self._connexion.execute("DELETE FROM LLMCache WHERE Key = ?", (key,))
+                    self._size -= size
+                    evicted += 1
+                self.evictions += evicted
+
+            self._connexion.commit()
+
+    def put(self, key: str, response: Any):
+        """
+        Stores one answer.
+
+        Args:
+            key (str): The cache key.
+            response (Any): The answer (JSON serializable).
+        """
+
+        self.put_many([(key, response)])
+
+    def stats(self) -> dict[str, float]:
+        """Returns the hit/miss counters and the current size of the store."""
+
+        requests: int = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / requests if requests else 0.0,
+            "evictions": self.evictions,
+            "bytes": self._size,
+        }
@@ -0,0 +1,350 @@
+"""
+Local stand-in for an Azure OpenAI chat-completions deployment, to measure and test the
+enrichment pipeline without paying for real calls.
+
+The answers are synthesized from the prompts the agent sends (keywords and topic, single or
+batched, and keyword categorization with conserved weights). Latency, request and token
+quotas, 429 injection and malformed-answer injection are configurable.
+
+Usage :
+    python -m LLM.MockServer [--port 8000] [--latency 0.2] [--tokens-per-minute 30000] [--rate-limit-rate 0.05] [--malformed-rate 0.05]
+"""
+
+import argparse
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+import math
+import random
+import re
+import threading
+import time
+import uuid
+
+API_VERSION: str = "2024-06-01"
+API_KEY: str = "mock"
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (about four characters per token), enough for quotas and usage."""
+
+    return len(text) // 4 + 1
+
+
+class MockAzureOpenAI:
+    """
+    Threaded HTTP server answering POST .../chat/completions like an Azure OpenAI deployment.
+
+    Every counter is updated under a lock, so stats() can be read while the server runs.
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency: float = 0.05,
+        jitter: float = 0.02,
+        latency_per_token: float = 0.0,
+        requests_per_minute: int | None = None,
+        tokens_per_minute: int | None = None,
+        rate_limit_rate: float = 0.0,
+        malformed_rate: float = 0.0,
+        seed: int | None = None,
+    ) -> None:
+        """
+        Args:
+            host (str): The interface to listen on.
+            port (int): The port to listen on (0 picks a free one).
+            latency (float): The base response time, in seconds.
+            jitter (float): The standard deviation of the response time, in seconds.
+            latency_per_token (float): The additional response time per completion token, in seconds.
+            requests_per_minute (int | None): The request quota, unlimited if None.
+            tokens_per_minute (int | None): The token quota, unlimited if None.
+            rate_limit_rate (float): The probability of answering 429 to a request within quota.
+            malformed_rate (float): The probability of answering with malformed JSON.
+            seed (int | None): The seed of the random generator, for reproducible runs.
+        """
+
+        self.latency = latency
+        self.jitter = jitter
+        self.latency_per_token = latency_per_token
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.rate_limit_rate = rate_limit_rate
+        self.malformed_rate = malformed_rate
+
+        self._random: random.Random = random.Random(seed)
+        self._lock: threading.Lock = threading.Lock()
+        self._window: deque[tuple[float, int]] = deque()  # (timestamp, tokens) par requête acceptée
+        self._window_tokens: int = 0
+        self.requests: int = 0
+        self.completed: int = 0
+        self.throttled: int = 0
+        self.malformed: int = 0
+        self.prompt_tokens: int = 0
+        self.completion_tokens: int = 0
+
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                server._handle(self)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server: ThreadingHTTPServer = ThreadingHTTPServer((host, port), Handler)
+        self._server.daemon_threads = True
+        self._thread: threading.Thread | None = None
+
+    @property
+    def endpoint(self) -> str:
+        """The azure_endpoint to give to AzureChatOpenAI."""
+
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "MockAzureOpenAI":
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._thread is not None:
+            self._server.shutdown()
+            self._thread.join()
+            self._thread = None
+        self._server.server_close()
+
+    def __enter__(self) -> "MockAzureOpenAI":
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "completed": self.completed,
+                "throttled": self.throttled,
+                "malformed": self.malformed,
+                "prompt_tokens": self.prompt_tokens,
+                "completion_tokens": self.completion_tokens,
+            }
+
+    def _admit(self, tokens: int) -> float:
+        """Counts a request against the quotas; returns the wait to ask for (0 if admitted)."""
+
+        now: float = time.monotonic()
+        with self._lock:
+            self.requests += 1
+            while self._window and self._window[0][0] <= now - 60:
+                self._window_tokens -= self._window.popleft()[1]
+
+            retry_after: float = 0.0
+            if self.requests_per_minute is not None and len(self._window) >= self.requests_per_minute:
+                retry_after = self._window[0][0] + 60 - now
+            if self.tokens_per_minute is not None and self._window and (
+                self._window_tokens + tokens > self.tokens_per_minute
+            ):
+                # Attente jusqu'à ce que suffisamment de requêtes sortent de la fenêtre
+                freed: int = self._window_tokens + tokens - self.tokens_per_minute
+                for timestamp, request_tokens in self._window:
+                    freed -= request_tokens
+                    if freed <= 0:
+                        retry_after = max(retry_after, timestamp + 60 - now)
+                        break
+            if not retry_after and self._random.random() < self.rate_limit_rate:
+                retry_after = 1.0
+
+            if retry_after:
+                self.throttled += 1
+                return retry_after
+
+            self._window.append((now, tokens))
+            self._window_tokens += tokens
+            return 0.0
+
+    def _handle(self, handler: BaseHTTPRequestHandler):
+        if not handler.path.split("?")[0].endswith("/chat/completions"):
+            self._reply(handler, 404, {"error": {"code": "404", "message": "Resource not found"}})
+            return
+
+        try:
+            length: int = int(handler.headers.get("Content-Length", 0))
+            request: dict = json.loads(handler.rfile.read(length))
+            messages: list[dict] = request["messages"]
+        except (ValueError, KeyError, TypeError):
+            self._reply(handler, 400, {"error": {"code": "400", "message": "Invalid request"}})
+            return
+
+        prompt: str = "".join(str(message.get("content", "")) for message in messages)
+        prompt_tokens: int = estimate_tokens(prompt)
+        content: str = self._answer(messages)
+        completion_tokens: int = estimate_tokens(content)
+
+        retry_after: float = self._admit(prompt_tokens + completion_tokens)
+        if retry_after:
+            self._reply(
+                handler,
+                429,
+                {
+                    "error": {
+                        "code": "429",
+                        "message": "Requests to the ChatCompletions_Create Operation have exceeded "
+                        "the rate limit of your current deployment.",
+                    }
+                },
+                {"retry-after": str(math.ceil(retry_after)), "retry-after-ms": str(int(retry_after * 1000))},
+            )
+            return
+
+        with self._lock:
+            malformed: bool = self._random.random() < self.malformed_rate
+            delay: float = max(
+                0.0,
+                self._random.gauss(self.latency, self.jitter)
+                + self.latency_per_token * completion_tokens,
+            )
+            if malformed:
+                content = self._corrupt(content)
+                self.malformed += 1
+        time.sleep(delay)
+
+        with self._lock:
+            self.completed += 1
+            self.prompt_tokens += prompt_tokens
+            self.completion_tokens += completion_tokens
+
+        self._reply(
+            handler,
+            200,
+            {
+                "id": f"chatcmpl-{uuid.uuid4().hex}",
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": request.get("model") or "gpt-35-turbo",
+                "choices": [
+                    {
+                        "index": 0,
+                        "message": {"role": "assistant", "content": content},
+                        "finish_reason": "stop",
+                    }
+                ],
+                "usage": {
+                    "prompt_tokens": prompt_tokens,
+                    "completion_tokens": completion_tokens,
+                    "total_tokens": prompt_tokens + completion_tokens,
+                },
+            },
+        )
+
+    @staticmethod
+    def _reply(
+        handler: BaseHTTPRequestHandler,
+        status: int,
+        body: dict,
+        headers: dict[str, str] | None = None,
+    ):
+        data: bytes = json.dumps(body, ensure_ascii=False).encode("utf-8")
+        handler.send_response(status)
+        handler.send_header("Content-Type", "application/json")
+        handler.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            handler.send_header(name, value)
+        handler.end_headers()
+        handler.wfile.write(data)
+
+    def _corrupt(self, content: str) -> str:
+        """Malformed answers as seen in practice: truncated, code-fenced or wrapped in prose."""
+
+        kind: int = self._random.randrange(3)
+        if kind == 0:
+            return content[: max(1, len(content) // 2)]
+        if kind == 1:
+            return f"```json\n{content}\n```"
+        return f"Voici la réponse demandée : {content}"
+
+    @classmethod
+    def _answer(cls, messages: list[dict]) -> str:
+        """Synthesizes the answer expected by the prompt (the last user message)."""
+
+        payload: str = str(messages[-1].get("content", "")) if messages else ""
+        try:
+            request = json.loads(payload)
+        except json.JSONDecodeError:
+            request = None
+
+        if isinstance(request, dict) and "weighted_objects" in request:
+            return json.dumps(
+                cls._categorize(request["weighted_objects"], request.get("category_number", 1)),
+                ensure_ascii=False,
+            )
+        if isinstance(request, dict):
+            return json.dumps(
+                {key: cls._keywords_and_topic(str(text)) for key, text in request.items()},
+                ensure_ascii=False,
+            )
+        return json.dumps(cls._keywords_and_topic(payload), ensure_ascii=False)
+
+    @staticmethod
+    def _keywords_and_topic(text: str) -> dict:
+        words: list[str] = list(dict.fromkeys(re.findall(r"[a-zA-ZÀ-ÿ]{4,}", text.lower())))
+        keywords: list[str] = sorted(words, key=len, reverse=True)[:3] or ["divers"]
+        topic: str = " ".join(words[:3]).capitalize() or "Divers"
+        return {"keywords": keywords, "topic": topic}
+
+    @staticmethod
+    def _categorize(weighted_objects: list[dict], category_number: int) -> list[dict]:
+        # Répartition des objets par empreinte de nom : le poids total est conservé
+        category_number = max(1, int(category_number))
+        weights: list[int] = [0] * category_number
+        for weighted_object in weighted_objects:
+            name: str = str(weighted_object.get("Keyword", weighted_object.get("Category", "")))
+            weights[sum(map(ord, name)) % category_number] += int(weighted_object.get("Weight", 0))
+        return [
+            {"Category": f"Catégorie {index + 1}", "Weight": weight}
+            for index, weight in enumerate(weights)
+        ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--jitter", type=float, default=0.02)
+    parser.add_argument("--latency-per-token", type=float, default=0.0)
+    parser.add_argument("--requests-per-minute", type=int)
+    parser.add_argument("--tokens-per-minute", type=int)
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0)
+    parser.add_argument("--malformed-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int)
+    args = parser.parse_args()
+
+    server: MockAzureOpenAI = MockAzureOpenAI(
+        args.host,
+        args.port,
+        latency=args.latency,
+        jitter=args.jitter,
+        latency_per_token=args.latency_per_token,
+        requests_per_minute=args.requests_per_minute,
+        tokens_per_minute=args.tokens_per_minute,
+        rate_limit_rate=args.rate_limit_rate,
+        malformed_rate=args.malformed_rate,
+        seed=args.seed,
+    )
+    print(f"AZURE_OPENAI_ENDPOINT={server.endpoint}")
+    print(f"AZURE_OPENAI_API_KEY={API_KEY}")
+    print(f"AZURE_OPENAI_API_VERSION={API_VERSION}")
+    with server:
+        try:
+            threading.Event().wait()
+        except KeyboardInterrupt:
+            pass
+        print(server.stats())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+import json
+import re
+import threading
+from Database.Types import DbWeightedCategory
+from .Types import LLMKeywordsTopicResponseFormat
+
+_FENCE: re.Pattern = re.compile(r"```[a-zA-Z]*\s*(.*?)\s*```", re.DOTALL)
+
+# Caractères retirés aux extrémités d'un mot-clé
+_KEYWORD_EDGES: str = " \t\n.,;:!?\"'«»()[]"
+
+
+class ParseStats:
+    """
+    Thread-safe counters of the parsing of the model answers.
+
+    Every item is counted once per answer it was expected in: an item that is retried twice
+    counts as two failures and, if the third answer is valid, one success.
+    """
+
+    def __init__(self) -> None:
+        self._lock: threading.Lock = threading.Lock()
+        self.answers: int = 0
+        self.items: int = 0
+        self.recovered: int = 0
+        self.failed: int = 0
+        self.retries: int = 0
+        self.lost: int = 0
+
+    def record(
+        self,
+        items: int = 0,
+        recovered: int = 0,
+        failed: int = 0,
+        retries: int = 0,
+        lost: int = 0,
+        answers: int = 0,
+    ):
+        with self._lock:
+            self.answers += answers
+            self.items += items
+            self.recovered += recovered
+            self.failed += failed
+            self.retries += retries
+            self.lost += lost
+
+    @property
+    def failure_rate(self) -> float:
+        """The share of expected items that were rejected."""
+
+        with self._lock:
+            return self.failed / self.items if self.items else 0.0
+
+    def report(self) -> str:
+        with self._lock:
+            rate: float = self.failed / self.items if self.items else 0.0
+            return (
+                f"{self.answers} réponse(s), {self.items} élément(s) : {self.failed} rejeté(s) "
+                f"({rate:.1%}), {self.recovered} récupéré(s) par l'analyse tolérante, "
+                f"{self.retries} nouvelle(s) tentative(s), {self.lost} sans réponse valide."
+            )
+
+
+def extract_json(text: str) -> tuple[object, bool]:
+    """
+    Decode the JSON value of an answer, tolerating code fences and surrounding prose.
+
+    Args:
+        text (str): The answer of the model.
+
+    Returns:
+        tuple[object, bool]: The decoded value, and whether the strict decoding failed (the
+        value had to be recovered).
+
+    Raises:
+        ValueError: No JSON value could be found.
+    """
+
+    try:
+        return json.loads(text), False
+    except json.JSONDecodeError:
+        pass
+
+    fenced: re.Match | None = _FENCE.search(text)
+    if fenced:
+        text = fenced.group(1)
+
+    # Premier objet ou tableau JSON complet présent dans le texte
+    decoder: json.JSONDecoder = json.JSONDecoder()
+    for start in (match.start() for match in re.finditer(r"[{\[]", text)):
+        try:
+            return decoder.raw_decode(text, start)[0], True
+        except json.JSONDecodeError:
+            continue
+
+    raise ValueError("Aucun JSON valide dans la réponse.")
+
+
+def normalize_keywords_and_topic(entry: object) -> LLMKeywordsTopicResponseFormat | None:
+    """
+    Check and clean one keywords-and-topic answer.
+
+    Whitespace and the punctuation around keywords are trimmed, and duplicate keywords are
+    dropped. Keywords and topics may contain any punctuation inside, commas included. The
+    explicit empty answer {"keywords": [], "topic": ""} requested by the prompts is accepted
+    as such.
+
+    Args:
+        entry (object): The decoded answer.
+
+    Returns:
+        LLMKeywordsTopicResponseFormat | None: The cleaned answer, or None if it is invalid.
+    """
+
+    if not isinstance(entry, dict):
+        return None
+    keywords = entry.get("keywords")
+    topic = entry.get("topic")
+    if not isinstance(keywords, list) or not isinstance(topic, str):
+        return None
+    if not keywords and not topic.strip():
+        return LLMKeywordsTopicResponseFormat(keywords=[], topic="")
+
+    cleaned: list[str] = []
+    for keyword in keywords:
+        if not isinstance(keyword, str):
+            return None
+        keyword = " ".join(keyword.split()).strip(_KEYWORD_EDGES)
+        if keyword and keyword not in cleaned:
+            cleaned.append(keyword)
+
+    topic = " ".join(topic.split()).strip(" \"'«»")
+    if not cleaned or not topic:
+        return None
+
+    return LLMKeywordsTopicResponseFormat(keywords=cleaned, topic=topic)
+
+
+def normalize_categories(value: object) -> list[DbWeightedCategory] | None:
+    """
+    Check and clean a categorization answer.
+
+    Category names are trimmed, and categories sharing a name are merged by summing their
+    weights, so the total is unchanged.
+
+    Args:
+        value (object): The decoded answer.
+
+    Returns:
+        list[DbWeightedCategory] | None: The categories, or None if the answer is not a list
+        of {"Category": str, "Weight": int} objects.
+    """
+
+    if not isinstance(value, list):
+        return None
+
+    weights: dict[str, int] = {}
+    for category in value:
+        if not isinstance(category, dict):
+            return None
+        name = category.get("Category")
+        weight = category.get("Weight")
+        if not isinstance(name, str) or not name.strip():
+            return None
+        if isinstance(weight, bool) or not isinstance(weight, int) or weight < 0:
+            return None
+        name = " ".join(name.split())
+        weights[name] = weights.get(name, 0) + weight
+
+    return [
+        DbWeightedCategory(Category=name, Weight=weight) for name, weight in weights.items()
+    ]
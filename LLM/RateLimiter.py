@@ -0,0 +1,114 @@
+from collections import deque
+import threading
+import time
+
+
+class TokenRateLimiter:
+    """
+    Thread-safe limiter enforcing both a requests-per-minute and a tokens-per-minute quota,
+    as configured on an Azure OpenAI deployment.
+
+    Every request reserves its estimated token count in a sliding one-minute window; the
+    reservation is corrected with the real usage once the response is known. A 429 pauses
+    every caller until the delay requested by the server has elapsed.
+    """
+
+    def __init__(
+        self, requests_per_minute: int | None = None, tokens_per_minute: int | None = None
+    ) -> None:
+        """
+        Args:
+            requests_per_minute (int | None): The request quota, unlimited if None.
+            tokens_per_minute (int | None): The token quota, unlimited if None.
+        """
+
+        self._requests_per_minute = requests_per_minute
+        self._tokens_per_minute = tokens_per_minute
+        self._condition: threading.Condition = threading.Condition()
+        self._window: deque[list[float]] = deque()  # [timestamp, tokens] per request
+        self._tokens: float = 0
+        self._paused_until: float = 0.0
+        self.requests: int = 0
+        self.tokens: int = 0
+        self.throttled: int = 0
+
+    def _expire(self, now: float):
+        while self._window and self._window[0][0] <= now - 60:
+            self._tokens -= self._window.popleft()[1]
+
+    def _wait_time(self, tokens: int, now: float) -> float:
+        """Returns how long to wait before a request of the given size fits the quotas."""
+
+        wait: float = max(self._paused_until - now, 0.0)
+        if (
+            self._requests_per_minute is not None
+            and len(self._window) >= self._requests_per_minute
+        ):
+            wait = max(wait, self._window[0][0] + 60 - now)
+        if (
+            self._tokens_per_minute is not None
+            and self._window
+            and self._tokens + tokens > self._tokens_per_minute
+        ):
+            # Wait until enough of the oldest reservations leave the window
+            released: float = self._tokens + tokens - self._tokens_per_minute
+            for timestamp, reserved in self._window:
+                released -= reserved
+                if released <= 0:
+                    wait = max(wait, timestamp + 60 - now)
+                    break
+        return wait
+
+    def acquire(self, tokens: int) -> list[float]:
+        """
+        Blocks until a request of the given estimated size fits both quotas, then reserves it.
+
+        Args:
+            tokens (int): The estimated number of tokens (prompt and completion) of the request.
+
+        Returns:
+            list[float]: The reservation, to be passed to `record`.
+        """
+
+        with self._condition:
+            while True:
+                now: float = time.monotonic()
+                self._expire(now)
+                wait: float = self._wait_time(tokens, now)
+                if wait <= 0:
+                    break
+                self._condition.wait(wait)
+
+            reservation: list[float] = [now, tokens]
+            self._window.append(reservation)
+            self._tokens += tokens
+            self.requests += 1
+            return reservation
+
+    def record(self, reservation: list[float], tokens: int):
+        """
+        Replaces a reservation's estimate with the real token usage of the request.
+
+        Args:
+            reservation (list[float]): The reservation returned by `acquire`.
+            tokens (int): The number of tokens actually used.
+        """
+
+        with self._condition:
+            if any(entry is reservation for entry in self._window):
+                self._tokens += tokens - reservation[1]
+            reservation[1] = tokens
+            self.tokens += tokens
+            self._condition.notify_all()
+
+    def pause(self, seconds: float):
+        """
+        Pauses every caller, e.g. after a 429 response.
+
+        Args:
+            seconds (float): The delay requested by the server.
+        """
+
+        with self._condition:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+            self.throttled += 1
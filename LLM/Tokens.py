@@ -0,0 +1,121 @@
+from collections import OrderedDict
+from collections.abc import Iterable
+from functools import cache
+import json
+import threading
+import tiktoken
+
+ENCODING_MODEL: str = "gpt-35-turbo"
+
+# Nombre maximal de comptes mémorisés ; au-delà, les moins récemment utilisés sont oubliés
+MEMO_SIZE: int = 500_000
+
+_counts: OrderedDict[str, int] = OrderedDict()
+_lock: threading.Lock = threading.Lock()
+
+
+class ApproximateEncoding:
+    """
+    Stand-in for a tiktoken encoding when the real one cannot be loaded (offline machine).
+
+    Only the length of the encoded texts is meaningful: about four characters per token.
+    """
+
+    def encode(self, text: str) -> list[int]:
+        return [0] * (len(text) // 4 + 1)
+
+    def encode_batch(self, texts: list[str], num_threads: int = 8) -> list[list[int]]:
+        return [self.encode(text) for text in texts]
+
+
+@cache
+def encoding(model: str = ENCODING_MODEL) -> tiktoken.Encoding | ApproximateEncoding:
+    """
+    Encoding used to count tokens, loaded once per process and shared by every caller.
+
+    Loading is deferred to the first use because tiktoken may have to download the encoding.
+    If the download fails, token counts fall back to an approximation.
+    """
+
+    try:
+        return tiktoken.encoding_for_model(model)
+    except OSError as e:
+        # Les requêtes restent possibles, mais leur découpage n'est plus qu'approximatif
+        print(f"Encodage tiktoken indisponible ({e}) : comptage approximatif des tokens.")
+        return ApproximateEncoding()
+
+
+def serialize(obj: object) -> str:
+    """Serializes an object exactly as it is sent in request payloads."""
+
+    return json.dumps(obj, ensure_ascii=False)
+
+
+def count_tokens(text: str) -> int:
+    """
+    Count the tokens of a text.
+
+    Args:
+        text (str): The text to measure.
+
+    Returns:
+        int: The number of tokens.
+    """
+
+    return len(encoding().encode(text))
+
+
+def count_tokens_batch(texts: list[str], num_threads: int = 8) -> list[int]:
+    """
+    Count the tokens of several texts, encoded in parallel by tiktoken's native threads.
+
+    Args:
+        texts (list[str]): The texts to measure.
+        num_threads (int): The number of encoding threads.
+
+    Returns:
+        list[int]: The number of tokens of each text, in order.
+    """
+
+    return [len(tokens) for tokens in encoding().encode_batch(texts, num_threads=num_threads)]
+
+
+def count_serialized(objects: Iterable[object], num_threads: int = 8) -> list[int]:
+    """
+    Count the tokens of the JSON serialization of each object.
+
+    Counts are memoized per distinct serialized object, so that a keyword seen in several
+    requests is only encoded once; unknown objects are encoded together in one batch. The
+    memo keeps the MEMO_SIZE most recently used counts.
+
+    Args:
+        objects (Iterable[object]): The objects to measure.
+        num_threads (int): The number of encoding threads.
+
+    Returns:
+        list[int]: The number of tokens of each serialized object, in order.
+    """
+
+    serialized: list[str] = [serialize(obj) for obj in objects]
+
+    known: dict[str, int] = {}
+    missing: list[str] = []
+    with _lock:
+        for text in dict.fromkeys(serialized):
+            count: int | None = _counts.get(text)
+            if count is None:
+                missing.append(text)
+            else:
+                _counts.move_to_end(text)
+                known[text] = count
+
+    if missing:
+        known.update(zip(missing, count_tokens_batch(missing, num_threads)))
+        with _lock:
+            for text in missing:
+                _counts[text] = known[text]
+                _counts.move_to_end(text)
+            while len(_counts) > MEMO_SIZE:
+                _counts.popitem(last=False)
+
+    return [known[text] for text in serialized]
@@ -1,22 +1,13 @@
-import praw
 import os
 from dotenv import load_dotenv
 from praw.models import Submission, Comment, MoreComments
+from Crawler.Cache import ResponseCache
+from Crawler.Client import create_reddit
 load_dotenv()
 
-CLIENT_ID = os.getenv('CLIENT_ID')
-CLIENT_SECRET = os.getenv('CLIENT_SECRET')
-USERNAME = os.getenv('USERNAME')
-USER_PASSWORD = os.getenv('USER_PASSWORD')
-USER_AGENT = os.getenv('USER_AGENT')
-
-reddit = praw.Reddit(
-    client_id=CLIENT_ID,
-    client_secret=CLIENT_SECRET,
-    password=USER_PASSWORD,
-    user_agent=USER_AGENT,
-    username=USERNAME,
-)
+# HTTP_CACHE=cache|record|replay active le cache disque des réponses (replay : sans réseau)
+cache = ResponseCache(mode=os.environ["HTTP_CACHE"]) if os.getenv("HTTP_CACHE") else None
+reddit = create_reddit(cache=cache)
 
 submissions: list[Submission] = reddit.subreddit("AskFrance").new(limit=30)
 isOne: bool = False
@@ -1,119 +1,90 @@
-import praw
+import argparse
+from collections.abc import Iterator
 import os
-import time
 from dotenv import load_dotenv
-from praw.models import Submission, Comment, Redditor
+from praw.models import Submission
+from Crawler.Cache import ResponseCache
+from Crawler.Client import load_credentials
+from Crawler.Comments import CommentFetcher
+from Crawler.Listing import ListingCrawler
+from Crawler.Mapping import RedditMapper
+from Crawler.Pipeline import CrawlPipeline
+from Crawler.Pool import CredentialPool
+from Crawler.Scheduler import CrawlScheduler, CrawlTarget
 from Database.Manager import DatabaseManager
-from Database.Types import DbUser, DbSubmission, DbComment
-from datetime import datetime
-from praw import Reddit
-load_dotenv()
 
-CLIENT_ID = os.getenv('CLIENT_ID')
-CLIENT_SECRET = os.getenv('CLIENT_SECRET')
-USERNAME = os.getenv('USERNAME')
-USER_PASSWORD = os.getenv('USER_PASSWORD')
-USER_AGENT = os.getenv('USER_AGENT')
-
-reddit = praw.Reddit(
-    client_id=CLIENT_ID,
-    client_secret=CLIENT_SECRET,
-    password=USER_PASSWORD,
-    user_agent=USER_AGENT,
-    username=USERNAME,
-    ratelimit_seconds=2
+# Par défaut, chaque subreddit est collecté une fois ; --duration ou --forever planifient
+# des collectes répétées
+parser = argparse.ArgumentParser(description="Collecte les subreddits suivis.")
+parser.add_argument(
+    "--duration", type=float, help="Planifie les collectes pendant cette durée (s)"
+)
+parser.add_argument(
+    "--forever", action="store_true", help="Planifie les collectes sans limite de durée"
 )
+args = parser.parse_args()
+
+load_dotenv()
+
+# Un quota par application Reddit : les requêtes vont au jeu d'identifiants ayant le plus de marge
+# HTTP_CACHE=cache|record|replay active le cache disque des réponses (replay : sans réseau)
+cache = ResponseCache(mode=os.environ["HTTP_CACHE"]) if os.getenv("HTTP_CACHE") else None
+pool = CredentialPool(load_credentials(), cache=cache)
 
 database = DatabaseManager(name='askfrance_new')
 database.create()
 
-users_to_add: list[DbUser] = []
-submissions_to_add: list[DbSubmission] = []
-comments_to_add: list[DbComment] = []
+# Subreddits collectés, par ordre d'importance
+targets: list[CrawlTarget] = [
+    CrawlTarget("AskFrance", priority=2.0),
+]
 
-submissions: list[Submission] = reddit.subreddit("AskFrance").new(limit=1000)
 
-for i, submission in enumerate(submissions):
+def track(submissions: Iterator[Submission], submission_ids: list[str]) -> Iterator[Submission]:
+    """Conserve l'identifiant de chaque soumission pour la collecte des commentaires."""
 
-    try:
+    for i, submission in enumerate(submissions):
         print(f"Submission-{i:03}: {submission.title}")
-        database.add_submissions([DbSubmission(
-            Id=submission.id,
-            Author_id=submission.author.id if submission.author is not None else "None",
-            Created=datetime.fromtimestamp(submission.created_utc),  # Exemple de date et heure
-            Sub_id=submission.subreddit.id,
-            Url=submission.url,
-            Title=submission.title,
-            Body=submission.selftext,
-            Keywords=[],  # Liste de mots-clés
-            Topic=""
-        )])
-
-        # time.sleep(0.65)
-        if submission.author is not None:
-            users_to_add.append(DbUser(Id=submission.author.id, Name=submission.author.name))
-    except Exception as e:
-        pass
-    finally:
-        continue
-
-    # submission.comments.replace_more(limit=None)
-
-    # comments = submission.comments.list()
-
-    # for comment in comments:
-    #     if isinstance(comment, Comment):
-    #         if comment.author is None or not hasattr(comment.author, 'id'):
-    #             comments_to_add.append(
-    #                 DbComment(
-    #                 Id=comment.id,
-    #                 Author_id='[Removed]',
-    #                 Created=datetime.fromtimestamp(comment.created_utc),
-    #                 Parent_id=comment.parent_id,
-    #                 Submission_id=comment.link_id,
-    #                 Body='[Removed]'
-    #             ))
-    #         else :
-    #             comments_to_add.append(
-    #                 DbComment(
-    #                 Id=comment.id,
-    #                 Author_id=comment.author.id,
-    #                 Created=datetime.fromtimestamp(comment.created_utc),
-    #                 Parent_id=comment.parent_id,
-    #                 Submission_id=comment.link_id,
-    #                 Body=comment.body
-    #             ))
-    #         if comment.author is not None and hasattr(comment.author, 'id'):
-    #             users_to_add.append(DbUser(Id=comment.author.id, Name=comment.author.name))
-    #     time.sleep(0.65)
-
-
-filtered_submissions: list[DbSubmission] = []
-filtered_comments: list[DbComment] = []
-filtered_users: list[DbUser] = []
-
-submissions_ids = set()
-comments_ids = set()
-users_ids = set()
-
-for submission in submissions_to_add:
-    if submission['Id'] not in submissions_ids:
-        submissions_ids.add(submission['Id'])
-        filtered_submissions.append(submission)
-
-for comment in comments_to_add:
-    if comment['Id'] not in comments_ids:
-        comments_ids.add(comment['Id'])
-        filtered_comments.append(comment)
-
-for user in users_to_add:
-    if user['Id'] not in users_ids:
-        users_ids.add(user['Id'])
-        filtered_users.append(user)
-
-database.add_submissions(filtered_submissions)
-# database.add_comments(filtered_comments)
-# database.add_users(filtered_users)
+        submission_ids.append(submission.id)
+        yield submission
+
+
+# Récupération, conversion et écriture en parallèle, reliées par des files bornées.
+# Le convertisseur a son propre client, utilisé depuis le thread de conversion ; les
+# résolutions d'auteurs par nom, possibles depuis les threads de commentaires, empruntent
+# un client au pool.
+mapper = RedditMapper(pool.client(), pool=pool)
+pipeline = CrawlPipeline(lambda: DatabaseManager(name='askfrance_new'), mapper)
+
+# Récupération concurrente des arbres de commentaires
+comment_fetcher = CommentFetcher(None, database, workers=8, mapper=mapper, pool=pool)
+
+
+def crawl(subreddit: str) -> int:
+    """Collecte les nouvelles soumissions d'un subreddit et leurs commentaires."""
+
+    submission_ids: list[str] = []
+    with pool.lease() as reddit:
+        # Seules les soumissions postérieures à la dernière collecte sont parcourues ; le point
+        # de reprise n'avance qu'une fois les soumissions écrites par le pipeline
+        crawler = ListingCrawler(reddit, database, subreddit, manual_ack=True)
+        submissions: Iterator[Submission] = crawler.crawl()
+        pipeline.run(track(submissions, submission_ids), on_commit=crawler.acknowledge)
+    pipeline.report()
+    comment_fetcher.fetch(submission_ids)
+
+    return len(submission_ids)
+
+
+# Tous les subreddits partagent les quotas du pool ; les intervalles s'adaptent à leur activité
+scheduler = CrawlScheduler(
+    database, targets, crawl, pool, requests_per_minute=60.0 * len(pool)
+)
+if args.forever or args.duration is not None:
+    scheduler.run(args.duration)
+else:
+    for target in targets:
+        scheduler.run_once(target.subreddit)
 
 # # Récupérer tous les utilisateurs
 # users = database.get_all_users()
@@ -0,0 +1,32 @@
+from datetime import datetime
+import pytest
+from Database.Manager import DatabaseManager
+from Database.Types import DbSubmission
+
+
+@pytest.fixture
+def database(tmp_path):
+    """Base vierge dans un dossier temporaire, au schéma à jour (triggers compris)."""
+
+    with DatabaseManager("", filepath=str(tmp_path / "test.db")) as database:
+        database.create()
+        yield database
+
+
+def make_submission(
+    submission_id: str,
+    keywords: list[str] | None = None,
+    topic: str | None = None,
+    created: datetime = datetime(2024, 1, 1, 12, 0),
+) -> DbSubmission:
+    return DbSubmission(
+        Id=submission_id,
+        Author_id="author",
+        Created=created,
+        Sub_id="sub",
+        Url=f"https://reddit.com/{submission_id}",
+        Title=f"Titre {submission_id}",
+        Body=f"Texte {submission_id}",
+        Keywords=keywords,
+        Topic=topic,
+    )
@@ -0,0 +1,81 @@
+import pytest
+from Database.Types import DbWeightedCategory, DbWeightedKeyword
+from LLM.Agent import LLMAgent
+from LLM.Types import LLMCategoryRequestFormat
+
+KEYWORDS: list[DbWeightedKeyword] = [
+    DbWeightedKeyword(Keyword="paris", Weight=5),
+    DbWeightedKeyword(Keyword="vélo", Weight=3),
+    DbWeightedKeyword(Keyword="métro", Weight=2),
+]
+
+
+@pytest.fixture
+def agent():
+    # La catégorisation sous contrôle des poids n'appelle pas le modèle directement :
+    # aucun client Azure n'est nécessaire
+    return LLMAgent.__new__(LLMAgent)
+
+
+def answering(agent, monkeypatch, *answers: list[DbWeightedCategory]) -> list:
+    """Remplace la requête au modèle par des réponses successives ; retourne les requêtes reçues."""
+
+    requests: list = []
+    remaining = iter(answers)
+
+    def request_object_categorization(request):
+        requests.append(request)
+        return next(remaining)
+
+    monkeypatch.setattr(agent, "request_object_categorization", request_object_categorization)
+    return requests
+
+
+def request(objects) -> LLMCategoryRequestFormat:
+    return LLMCategoryRequestFormat(weighted_objects=objects, category_number=2)
+
+
+def test_conserved_answer_is_returned(agent, monkeypatch):
+    answer = [
+        DbWeightedCategory(Category="Ville", Weight=5),
+        DbWeightedCategory(Category="Transport", Weight=5),
+    ]
+    requests = answering(agent, monkeypatch, answer)
+
+    assert agent._categorize_conserving_weights(request(KEYWORDS)) == answer
+    assert len(requests) == 1
+
+
+def test_answer_losing_weight_is_retried(agent, monkeypatch):
+    answer = [DbWeightedCategory(Category="Ville", Weight=10)]
+    requests = answering(
+        agent, monkeypatch, [DbWeightedCategory(Category="Ville", Weight=7)], [], answer
+    )
+
+    assert agent._categorize_conserving_weights(request(KEYWORDS)) == answer
+    assert len(requests) == 3
+
+
+def test_keywords_fall_back_to_a_single_category(agent, monkeypatch):
+    requests = answering(
+        agent, monkeypatch, [], [DbWeightedCategory(Category="Ville", Weight=12)], []
+    )
+
+    assert agent._categorize_conserving_weights(request(KEYWORDS)) == [
+        DbWeightedCategory(Category="Autres", Weight=10)
+    ]
+    assert len(requests) == 3
+
+
+def test_categories_fall_back_to_a_merge_by_name(agent, monkeypatch):
+    categories = [
+        DbWeightedCategory(Category="Ville", Weight=4),
+        DbWeightedCategory(Category="Transport", Weight=3),
+        DbWeightedCategory(Category="Ville", Weight=2),
+    ]
+    answering(agent, monkeypatch, [], [])
+
+    assert agent._categorize_conserving_weights(request(categories), max_attempts=2) == [
+        DbWeightedCategory(Category="Ville", Weight=6),
+        DbWeightedCategory(Category="Transport", Weight=3),
+    ]
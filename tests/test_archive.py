@@ -0,0 +1,75 @@
+import json
+import zstandard
+from Crawler.Archive import ArchiveImporter, parse_lines
+
+
+def submission_line(submission_id: str, subreddit: str, created_utc: float) -> bytes:
+    return (
+        json.dumps(
+            {
+                "id": submission_id,
+                "author": "alice",
+                "author_fullname": "t2_a1",
+                "created_utc": created_utc,
+                "subreddit": subreddit,
+                "subreddit_id": "t5_sub",
+                "title": f"Titre {submission_id}",
+            }
+        ).encode()
+        + b"\n"
+    )
+
+
+def comment_line(comment_id: str, created_utc: float) -> bytes:
+    return (
+        json.dumps(
+            {
+                "id": comment_id,
+                "author": "bob",
+                "author_fullname": "t2_b1",
+                "created_utc": str(created_utc),
+                "subreddit": "AskFrance",
+                "parent_id": "t3_s1",
+                "link_id": "t3_s1",
+                "body": "Texte",
+            }
+        ).encode()
+        + b"\n"
+    )
+
+
+def test_parse_lines_filters_subreddits_and_dates():
+    lines = [
+        submission_line("s1", "AskFrance", 1_700_000_000),
+        submission_line("s2", "france", 1_700_000_000),
+        submission_line("s3", "AskFrance", 1_600_000_000),
+        comment_line("c1", 1_700_000_100),
+        b'{"subreddit": "AskFrance", "id": \n',  # Ligne tronquée
+    ]
+
+    submissions, comments, users, errors = parse_lines(
+        lines, frozenset({"askfrance"}), 1_650_000_000, None
+    )
+
+    assert [row["Id"] for row in submissions] == ["s1"]
+    # Champs absents des archives anciennes complétés
+    assert (submissions[0]["Body"], submissions[0]["Url"]) == ("", "")
+    assert [row["Id"] for row in comments] == ["c1"]
+    assert sorted(user["Name"] for user in users) == ["alice", "bob"]
+    assert errors == 1
+
+
+def test_import_resumes_after_the_last_written_chunk(database, tmp_path):
+    filepath = tmp_path / "RS_test.zst"
+    lines = [
+        submission_line(f"s{index}", "AskFrance", 1_700_000_000 + index) for index in range(5)
+    ]
+    filepath.write_bytes(zstandard.ZstdCompressor().compress(b"".join(lines)))
+
+    importer = ArchiveImporter(database, ["AskFrance"], workers=1, chunk_lines=2)
+
+    assert importer.import_file(str(filepath)) == 5
+    assert database.get_import_offset("RS_test.zst") == sum(len(line) for line in lines)
+    assert database.execute_command("SELECT COUNT(*) FROM Submission") == [(5,)]
+    # Une archive déjà importée n'est pas relue
+    assert importer.import_file(str(filepath)) == 0
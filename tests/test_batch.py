@@ -0,0 +1,79 @@
+import json
+import pytest
+from LLM.Agent import LLMAgent
+from LLM.Parser import ParseStats
+from .conftest import make_submission
+
+
+@pytest.fixture
+def agent():
+    # La validation des résultats n'appelle pas le modèle : aucun client Azure n'est nécessaire
+    agent = LLMAgent.__new__(LLMAgent)
+    agent.parse_stats = ParseStats()
+    return agent
+
+
+def result(submission_id: str, content: str, status_code: int = 200) -> str:
+    return json.dumps(
+        {
+            "custom_id": submission_id,
+            "response": {
+                "status_code": status_code,
+                "body": {"choices": [{"message": {"content": content}}]},
+            },
+            "error": None,
+        }
+    )
+
+
+def test_export_writes_one_request_per_submission_to_process(database, tmp_path):
+    database.add_submissions(
+        [make_submission("s1"), make_submission("s2", keywords=["pain"], topic="Cuisine")]
+    )
+    filepath = tmp_path / "requests.jsonl"
+
+    assert database.export_keywords_and_topic_batch(str(filepath), deployment="gpt") == 1
+    (request,) = [json.loads(line) for line in filepath.read_text(encoding="utf-8").splitlines()]
+    assert (request["custom_id"], request["url"]) == ("s1", "/chat/completions")
+    assert request["body"]["model"] == "gpt"
+    assert request["body"]["response_format"] == {"type": "json_object"}
+    assert "Titre s1" in request["body"]["messages"][1]["content"]
+
+    assert database.export_keywords_and_topic_batch(str(filepath), force_update=True) == 2
+
+
+def test_import_applies_valid_results_only(database, agent, tmp_path):
+    database.add_submissions([make_submission(f"s{index}") for index in range(1, 5)])
+    filepath = tmp_path / "results.jsonl"
+    filepath.write_text(
+        "\n".join(
+            [
+                result("s1", '{"keywords": ["pain", "vin"], "topic": "Cuisine"}'),
+                result("s2", "", status_code=500),
+                result("s3", "pas de JSON"),
+                result("inconnue", '{"keywords": ["pain"], "topic": "Cuisine"}'),
+                "ligne tronquée {",
+                result("s4", '```json\n{"keywords": ["vélo"], "topic": "Transport"}\n```'),
+            ]
+        ),
+        encoding="utf-8",
+    )
+
+    assert database.import_keywords_and_topic_batch(agent, str(filepath), batch_size=2) == 2
+
+    processed = {
+        submission["Id"]: (submission["Keywords"], submission["Topic"])
+        for submission in database.iter_submissions(columns=["Id", "Keywords", "Topic"])
+    }
+    assert processed["s1"] == (["pain", "vin"], "Cuisine")
+    assert processed["s4"] == (["vélo"], "Transport")
+    # Les soumissions en échec restent à traiter
+    assert [row["Id"] for row in database.iter_submissions(missing_keywords=True)] == [
+        "s2",
+        "s3",
+    ]
+    assert (agent.parse_stats.items, agent.parse_stats.recovered, agent.parse_stats.failed) == (
+        4,
+        1,
+        1,
+    )
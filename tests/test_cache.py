@@ -0,0 +1,83 @@
+import json
+import prawcore
+import pytest
+import requests
+from Crawler.Cache import CachingRequestor, ResponseCache
+
+LISTING: str = "https://oauth.reddit.com/r/AskFrance/new"
+
+
+class FakeSession:
+    """Session HTTP comptant les requêtes et répondant toujours le même listing."""
+
+    def __init__(self) -> None:
+        self.headers: dict = {}
+        self.requests: list[tuple[str, str]] = []
+
+    def request(self, method, url, timeout=None, **kwargs):
+        self.requests.append((method, url))
+        response = requests.Response()
+        response.status_code = 200
+        response.url = url
+        response.headers["x-ratelimit-remaining"] = "99"
+        response._content = json.dumps({"kind": "Listing"}).encode()
+        return response
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = ResponseCache(str(tmp_path / "http_cache.db"), mode="record")
+    yield cache
+    cache.close()
+
+
+def requestor(cache: ResponseCache, session: FakeSession) -> CachingRequestor:
+    return CachingRequestor("tests by u/test", cache=cache, session=session)
+
+
+def test_recorded_listing_is_replayed_without_network(cache):
+    session = FakeSession()
+    requestor(cache, session).request("GET", LISTING, params={"limit": 100})
+
+    cache.mode = "replay"
+    response = requestor(cache, session).request("GET", LISTING, params={"limit": 100})
+
+    assert session.requests == [("GET", LISTING)]
+    assert response.json() == {"kind": "Listing"}
+    # Les en-têtes de quota ne sont pas rejoués
+    assert "x-ratelimit-remaining" not in response.headers
+
+
+def test_replay_fails_on_uncached_requests(cache):
+    cache.mode = "replay"
+    replaying = requestor(cache, FakeSession())
+
+    with pytest.raises(prawcore.exceptions.RequestException):
+        replaying.request("GET", LISTING, params={"limit": 25})
+    with pytest.raises(prawcore.exceptions.RequestException):
+        replaying.request("POST", "https://oauth.reddit.com/api/vote", data={"dir": 1})
+
+
+def test_replay_simulates_only_the_token_request(cache):
+    cache.mode = "replay"
+    session = FakeSession()
+
+    response = requestor(cache, session).request(
+        "POST", "https://www.reddit.com/api/v1/access_token", data={"grant_type": "password"}
+    )
+
+    assert response.json()["access_token"] == "replay"
+    assert session.requests == []
+
+
+@pytest.mark.parametrize("ttl, fetches", [(60, 1), (-1, 2)])
+def test_cache_mode_serves_fresh_responses_only(tmp_path, ttl, fetches):
+    cache = ResponseCache(str(tmp_path / "http_cache.db"), ttls=[(r"/new", ttl)])
+    session = FakeSession()
+    caching = requestor(cache, session)
+
+    caching.request("GET", LISTING)
+    caching.request("GET", LISTING)
+    cache.close()
+
+    assert len(session.requests) == fetches
@@ -0,0 +1,330 @@
+from datetime import datetime
+from types import SimpleNamespace
+import pytest
+from Database.Types import DbBatchSummary, DbComment, DbUser
+from LLM.Types import LLMKeywordsTopicResponseFormat
+from .conftest import make_submission
+
+
+def summary(inserted=0, updated=0, skipped=0, rejected=0) -> DbBatchSummary:
+    return DbBatchSummary(
+        Inserted=inserted, Updated=updated, Skipped=skipped, Rejected=rejected
+    )
+
+
+def weights(database) -> dict[str, int]:
+    return dict(database.execute_command("SELECT Keyword, Weight FROM KeywordWeight"))
+
+
+def test_bulk_write_inserts_and_rejects_invalid_rows(database):
+    users = [
+        DbUser(Id="u1", Name="alice"),
+        DbUser(Id="u2", Name="bob", Genre="F"),
+        DbUser(Id="u3", Name="carol", Genre="X"),  # Genre invalide
+    ]
+
+    assert database.add_users(users) == [summary(inserted=2, rejected=1)]
+
+
+def test_bulk_write_skips_existing_rows(database):
+    database.add_users([DbUser(Id="u1", Name="alice")])
+
+    summaries = database.add_users(
+        [DbUser(Id="u1", Name="alice2"), DbUser(Id="u2", Name="bob")]
+    )
+
+    assert summaries == [summary(inserted=1, skipped=1)]
+    assert database.execute_command("SELECT Name FROM User WHERE Id = 'u1'") == [("alice",)]
+
+
+def test_bulk_write_updates_existing_rows(database):
+    database.add_users([DbUser(Id="u1", Name="alice", Age=30)])
+
+    summaries = database.add_users(
+        [DbUser(Id="u1", Name="alice2"), DbUser(Id="u2", Name="bob")],
+        on_conflict="update",
+    )
+
+    assert summaries == [summary(inserted=1, updated=1)]
+    # Les champs absents de la nouvelle version sont conservés
+    assert database.execute_command("SELECT Name, Age FROM User WHERE Id = 'u1'") == [
+        ("alice2", 30)
+    ]
+
+
+def test_bulk_write_summarizes_each_batch(database):
+    summaries = database.add_submissions(
+        [make_submission(f"s{i}") for i in range(5)], batch_size=2
+    )
+
+    assert summaries == [summary(inserted=2), summary(inserted=2), summary(inserted=1)]
+
+
+def test_keyword_weights_follow_submission_keywords(database):
+    database.add_submissions(
+        [
+            make_submission("s1", ["paris", "vélo"], "Transport"),
+            make_submission("s2", ["paris", "métro"], "Transport"),
+        ]
+    )
+    assert weights(database) == {"paris": 2, "vélo": 1, "métro": 1}
+
+    database.update_keywords_and_topic(
+        make_submission("s2"),
+        LLMKeywordsTopicResponseFormat(keywords=["lyon", "métro"], topic="Transport"),
+    )
+
+    # Le mot-clé dont le poids tombe à zéro disparaît de la table
+    assert weights(database) == {"paris": 1, "vélo": 1, "métro": 1, "lyon": 1}
+    assert database.verify_keyword_weights() == []
+
+
+def test_verify_keyword_weights_reports_and_repairs_drift(database):
+    database.add_submissions(
+        [
+            make_submission("s1", ["paris", "vélo"], "Transport"),
+            make_submission("s2", ["paris"], "Ville"),
+        ]
+    )
+    database.execute_command("UPDATE KeywordWeight SET Weight = 5 WHERE Keyword = 'paris'")
+    database.execute_command("DELETE FROM KeywordWeight WHERE Keyword = 'vélo'")
+
+    assert database.verify_keyword_weights() == [("paris", 5, 2), ("vélo", None, 1)]
+
+    database.verify_keyword_weights(repair=True)
+
+    assert weights(database) == {"paris": 2, "vélo": 1}
+    assert database.verify_keyword_weights() == []
+
+
+def test_failed_write_is_rolled_back_on_the_shared_connection(database):
+    database.execute_command(
+        "CREATE TABLE CategoryWeight (Category TEXT PRIMARY KEY, Weight INTEGER NOT NULL)"
+    )
+    database.execute_command("INSERT INTO CategoryWeight VALUES ('Ville', 3)")
+    # Deux catégories de même nom : l'insertion échoue après le vidage de la table
+    agent = SimpleNamespace(
+        categorize_keywords=lambda request: [
+            {"Category": "Santé", "Weight": 1},
+            {"Category": "Santé", "Weight": 2},
+        ]
+    )
+
+    database.categorize_keywords(agent, 2)
+    # Le commit suivant, sur la même connexion, ne doit pas valider le vidage
+    database.add_users([DbUser(Id="u1", Name="alice")])
+
+    assert database.execute_command("SELECT * FROM CategoryWeight") == [("Ville", 3)]
+
+
+def test_repeated_keywords_are_stored_once_on_both_paths(database):
+    database.add_submissions([make_submission("s1", ["paris", "vélo", "paris"], "Ville")])
+    database.update_keywords_and_topics(
+        [("s1", LLMKeywordsTopicResponseFormat(keywords=["lyon", "lyon"], topic="Ville"))]
+    )
+    database.add_submissions([make_submission("s2", ["métro", "métro"], "Transport")])
+
+    assert database.execute_command("SELECT Id, Keywords FROM Submission ORDER BY Id") == [
+        ("s1", "lyon"),
+        ("s2", "métro"),
+    ]
+    assert weights(database) == {"lyon": 1, "métro": 1}
+    assert database.verify_keyword_weights() == []
+
+
+def test_keywords_keep_their_commas_in_the_keyword_tables(database):
+    database.add_submissions([make_submission("s1")])
+    database.update_keywords_and_topic(
+        make_submission("s1"),
+        LLMKeywordsTopicResponseFormat(keywords=["pain, vin", "fromage"], topic="Cuisine"),
+    )
+
+    assert weights(database) == {"pain, vin": 1, "fromage": 1}
+    # Seule la colonne historique, séparée par des virgules, perd la virgule interne
+    assert database.execute_command("SELECT Keywords FROM Submission") == [
+        ("pain vin,fromage",)
+    ]
+    assert next(database.iter_submissions())["Keywords"] == ["pain, vin", "fromage"]
+
+
+def test_iterators_page_through_the_tables(database):
+    database.add_users([DbUser(Id=f"u{index}", Name=f"user{index}") for index in range(5)])
+    database.add_submissions(
+        [
+            make_submission(f"s{index}", created=datetime(2024, 1, 5 - index))
+            for index in range(5)
+        ]
+    )
+
+    users = [user["Id"] for user in database.iter_users(batch_size=2)]
+    assert users == [f"u{index}" for index in range(5)]
+    assert list(database.iter_users(columns=["Name"], after=("u3",))) == [{"Name": "user4"}]
+    assert database.get_all_users() == list(database.iter_users())
+
+    # Pagination par curseur sur l'ordre chronologique : pages disjointes et complètes
+    pages: list[list[str]] = []
+    after = None
+    while page := list(
+        database.iter_submissions(
+            columns=["Id", "Created"], order_by="Created", after=after, limit=2
+        )
+    ):
+        pages.append([submission["Id"] for submission in page])
+        after = (page[-1]["Created"], page[-1]["Id"])
+
+    assert pages == [["s4", "s3"], ["s2", "s1"], ["s0"]]
+
+
+def test_iterators_reject_unknown_columns(database):
+    with pytest.raises(ValueError):
+        list(database.iter_users(columns=["Id", "Password"]))
+
+
+def counts(database) -> tuple[list[tuple], list[tuple]]:
+    return (
+        database.execute_command("SELECT Date, NbSubmissions FROM SubmissionDate ORDER BY Date"),
+        database.execute_command(
+            "SELECT Weekday, Id, NbSubmissions FROM SubmissionWeekdayCount ORDER BY Id"
+        ),
+    )
+
+
+def test_submission_counts_by_date_and_weekday(database):
+    # Le 1er janvier 2024 est un lundi
+    database.add_submissions(
+        [
+            make_submission("s1", created=datetime(2024, 1, 1, 9, 0)),
+            make_submission("s2", created=datetime(2024, 1, 1, 23, 59)),
+            make_submission("s3", created=datetime(2024, 1, 2, 8, 0)),
+            make_submission("s4", created=datetime(2024, 1, 8, 8, 0)),
+        ]
+    )
+
+    database.calculate_submissions_count_by_date()
+    database.calculate_submissions_count_by_weekday()
+
+    assert counts(database) == (
+        [("2024-01-01", 2), ("2024-01-02", 1), ("2024-01-08", 1)],
+        [("Lundi", 0, 3), ("Mardi", 1, 1)],
+    )
+
+
+def test_incremental_submission_counts_match_a_full_recount(database):
+    database.add_submissions([make_submission("s1", created=datetime(2024, 1, 1, 9, 0))])
+    database.enable_incremental_submission_counts()
+
+    database.add_submissions(
+        [
+            make_submission("s2", created=datetime(2024, 1, 1, 10, 0)),
+            make_submission("s3", created=datetime(2024, 1, 6, 10, 0)),
+        ]
+    )
+    database.execute_command("DELETE FROM Submission WHERE Id = ?", ("s1",))
+    database.execute_command(
+        "UPDATE Submission SET Created = ? WHERE Id = ?", ("2024-01-03 10:00:00", "s3")
+    )
+    incremental = counts(database)
+
+    assert incremental == (
+        [("2024-01-01", 1), ("2024-01-03", 1)],
+        [("Lundi", 0, 1), ("Mercredi", 2, 1)],
+    )
+
+    database.disable_incremental_submission_counts()
+    database.calculate_submissions_count_by_date()
+    database.calculate_submissions_count_by_weekday()
+    assert counts(database) == incremental
+
+
+def test_migrate_fills_created_utc_for_range_queries(database):
+    created = [datetime(2024, 1, day, 12, 0) for day in (1, 2, 3)]
+    database.add_submissions(
+        [make_submission(f"s{index}", created=date) for index, date in enumerate(created)]
+    )
+    database.add_comments(
+        [
+            DbComment(
+                Id=f"c{index}",
+                Author_id="author",
+                Created=date,
+                Parent_id="t3_s0",
+                Submission_id="s0",
+                Body="Texte",
+            )
+            for index, date in enumerate(created)
+        ]
+    )
+    # Base antérieure à la colonne : dates epoch absentes
+    database.execute_command("UPDATE Submission SET Created_utc = NULL")
+    database.execute_command("UPDATE Comment SET Created_utc = NULL")
+    assert list(database.iter_submissions(start=created[0])) == []
+
+    database.migrate()
+
+    assert database.execute_command("SELECT Created_utc FROM Submission ORDER BY Id") == [
+        (int(date.timestamp()),) for date in created
+    ]
+    # Début inclus, fin exclue
+    submissions = database.iter_submissions(start=created[1], end=created[2], columns=["Id"])
+    assert list(submissions) == [{"Id": "s1"}]
+    comments = database.iter_comments(start=created[1], columns=["Id"])
+    assert list(comments) == [{"Id": "c1"}, {"Id": "c2"}]
+
+
+def search_ids(database, query: str, **filters) -> list[str]:
+    return [result["Id"] for result in database.search(query, **filters)]
+
+
+def test_search_follows_inserts_updates_and_deletes(database):
+    database.add_submissions(
+        [
+            make_submission("s1", created=datetime(2024, 1, 1, 12, 0)),
+            make_submission("s2", created=datetime(2024, 1, 2, 12, 0)),
+        ]
+    )
+    database.execute_command(
+        "UPDATE Submission SET Title = ?, Body = ? WHERE Id = ?",
+        ("Carte vitale perdue", "Comment refaire sa carte ?", "s1"),
+    )
+    database.execute_command(
+        "UPDATE Submission SET Body = ? WHERE Id = ?", ("Remboursement de la carte", "s2")
+    )
+    database.add_comments(
+        [
+            DbComment(
+                Id="c1",
+                Author_id="author",
+                Created=datetime(2024, 1, 3, 12, 0),
+                Parent_id="t3_s1",
+                Submission_id="t3_s1",
+                Body="Il faut passer par la mutuelle",
+            )
+        ]
+    )
+
+    # Le titre pèse double : s1 passe devant s2
+    assert search_ids(database, "carte") == ["s1", "s2"]
+    assert search_ids(database, "carte", start=datetime(2024, 1, 2)) == ["s2"]
+    assert search_ids(database, "carte", kinds=("comment",)) == []
+    results = database.search("mutuelle")
+    assert [(result["Kind"], result["Submission_id"]) for result in results] == [
+        ("comment", "t3_s1")
+    ]
+    assert "[mutuelle]" in results[0]["Snippet"]
+
+    # Les triggers suivent les modifications et suppressions
+    database.execute_command("UPDATE Submission SET Title = ? WHERE Id = ?", ("Question", "s1"))
+    assert search_ids(database, "perdue") == []
+    database.execute_command("DELETE FROM Submission WHERE Id = ?", ("s2",))
+    database.execute_command("DELETE FROM Comment WHERE Id = ?", ("c1",))
+    assert search_ids(database, "carte") == ["s1"]
+    assert search_ids(database, "mutuelle") == []
+
+
+def test_rebuild_search_index_covers_existing_rows(database):
+    database.add_submissions([make_submission("s1")])
+    database.execute_command("DROP TABLE SubmissionSearch")
+
+    database.rebuild_search_index()
+
+    assert search_ids(database, "Titre") == ["s1"]
@@ -0,0 +1,83 @@
+from types import SimpleNamespace
+from Crawler.Listing import ListingCrawler
+
+
+class FakeReddit:
+    """Client servant un listing "new" figé, du plus récent au plus ancien."""
+
+    def __init__(self, fullnames: list[str]) -> None:
+        self.items = [
+            SimpleNamespace(fullname=fullname, created_utc=1_700_000_000 - index)
+            for index, fullname in enumerate(fullnames)
+        ]
+        self.afters: list[str | None] = []
+
+    def subreddit(self, name: str):
+        return SimpleNamespace(new=self.new)
+
+    def new(self, limit=None, params=None):
+        after: str | None = (params or {}).get("after")
+        self.afters.append(after)
+        start: int = 0
+        if after is not None:
+            start = [item.fullname for item in self.items].index(after) + 1
+        return iter(self.items[start:][:limit])
+
+
+def fullnames(items) -> list[str]:
+    return [item.fullname for item in items]
+
+
+def test_crawl_stops_at_the_watermark(database):
+    reddit = FakeReddit(["t3_c", "t3_b", "t3_a"])
+    assert fullnames(ListingCrawler(reddit, database, "sub").crawl()) == ["t3_c", "t3_b", "t3_a"]
+
+    reddit.items.insert(0, SimpleNamespace(fullname="t3_d", created_utc=1_700_000_001))
+    assert fullnames(ListingCrawler(reddit, database, "sub").crawl()) == ["t3_d"]
+
+    state = database.get_crawl_state("sub", "new")
+    assert state["Newest_fullname"] == "t3_d"
+    assert state["Checkpoint_fullname"] is None
+
+
+def test_interrupted_crawl_resumes_after_the_checkpoint(database):
+    reddit = FakeReddit([f"t3_{index:02}" for index in range(10)])
+    crawler = ListingCrawler(reddit, database, "sub", checkpoint_every=3)
+
+    crawl = crawler.crawl()
+    # Interruption pendant le traitement du septième élément : six sont acquittés
+    assert fullnames(next(crawl) for _ in range(7))[-1] == "t3_06"
+    crawl.close()
+
+    state = database.get_crawl_state("sub", "new")
+    assert state["Checkpoint_fullname"] == "t3_05"
+    assert state["Newest_fullname"] is None
+
+    resumed = fullnames(ListingCrawler(reddit, database, "sub").crawl())
+
+    assert reddit.afters[-2:] == ["t3_05", None]
+    # Reprise après le point de reprise ; la nouvelle passe s'arrête aussitôt sur la tête
+    # de la collecte interrompue, devenue le filigrane
+    assert resumed == ["t3_06", "t3_07", "t3_08", "t3_09"]
+    state = database.get_crawl_state("sub", "new")
+    assert state["Newest_fullname"] == "t3_00"
+    assert state["Checkpoint_fullname"] is None
+
+
+def test_manual_ack_moves_the_checkpoint_only_when_acknowledged(database):
+    reddit = FakeReddit(["t3_c", "t3_b", "t3_a"])
+    crawler = ListingCrawler(reddit, database, "sub", manual_ack=True)
+
+    items = fullnames(crawler.crawl())
+    assert items == ["t3_c", "t3_b", "t3_a"]
+    # Rien n'est acquitté : ni point de reprise ni filigrane
+    assert database.get_crawl_state("sub", "new") is None
+
+    crawler.acknowledge("t3_b")
+    assert database.get_crawl_state("sub", "new")["Checkpoint_fullname"] == "t3_b"
+
+    # Le dernier acquittement termine la passe : le filigrane est enregistré
+    crawler.acknowledge("t3_a", save=False)
+    state = database.get_crawl_state("sub", "new")
+    assert state["Newest_fullname"] == "t3_c"
+    assert state["Checkpoint_fullname"] is None
@@ -0,0 +1,58 @@
+import itertools
+import pytest
+from LLM import Cache
+from LLM.Cache import LLMCache
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    # Horloge strictement croissante : l'ordre d'utilisation est déterministe
+    clock = itertools.count(1000)
+    monkeypatch.setattr(Cache.time, "time", lambda: float(next(clock)))
+    cache = LLMCache(str(tmp_path / "llm_cache.db"), max_bytes=30)
+    yield cache
+    cache.close()
+
+
+def test_keys_ignore_cosmetic_differences():
+    key = LLMCache.key("prompt", "gpt", "Carte  vitale\n")
+
+    assert LLMCache.key("prompt", "gpt", "Carte vitale") == key
+    # Composition Unicode différente du même texte
+    assert LLMCache.key("prompt", "gpt", "cafe\u0301") == LLMCache.key("prompt", "gpt", "caf\u00e9")
+    assert LLMCache.key("prompt", "autre", "Carte vitale") != key
+    assert LLMCache.key("autre prompt", "gpt", "Carte vitale") != key
+
+
+def test_least_recently_used_entries_are_evicted(cache):
+    # Chaque réponse pèse 10 octets une fois encodée
+    cache.put_many([("a", "aaaaaaaa"), ("b", "bbbbbbbb"), ("c", "cccccccc")])
+    assert cache.get("a") == "aaaaaaaa"
+
+    cache.put("d", "dddddddd")
+
+    # Éviction jusqu'à 90 % de la taille maximale, des moins récemment utilisées à a
+    assert [cache.get(key) for key in "abcd"] == ["aaaaaaaa", None, None, "dddddddd"]
+    assert cache.stats()["evictions"] == 2
+    assert cache.stats()["bytes"] == 20
+
+
+def test_replacing_an_entry_keeps_the_size_exact(cache):
+    cache.put("a", "aaaaaaaa")
+    cache.put("a", "a")
+
+    assert cache.stats()["bytes"] == 3
+
+
+def test_entries_and_size_survive_a_reopening(cache, tmp_path):
+    cache.put("a", {"topic": "pain"})
+    cache.close()
+
+    reopened = LLMCache(str(tmp_path / "llm_cache.db"), max_bytes=30)
+    try:
+        assert reopened.get("a") == {"topic": "pain"}
+        assert reopened.get("b") is None
+        assert reopened.stats()["bytes"] == cache.stats()["bytes"]
+        assert (reopened.stats()["hits"], reopened.stats()["misses"]) == (1, 1)
+    finally:
+        reopened.close()
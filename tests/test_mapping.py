@@ -0,0 +1,56 @@
+from types import SimpleNamespace
+from Crawler.Mapping import RedditMapper
+
+
+class FakeReddit:
+    """Client résolvant les comptes connus, les autres étant ignorés comme par Reddit."""
+
+    def __init__(self, names: dict[str, str]) -> None:
+        self.redditors = SimpleNamespace(partial_redditors=self.partial_redditors)
+        self.names = names
+
+    def partial_redditors(self, fullnames):
+        return [
+            SimpleNamespace(fullname=fullname, name=self.names[fullname[3:]])
+            for fullname in fullnames
+            if fullname[3:] in self.names
+        ]
+
+
+def comment(comment_id: str, author_fullname: str) -> dict:
+    return {
+        "id": comment_id,
+        "author_fullname": author_fullname,
+        "created_utc": 1_700_000_000,
+        "parent_id": "t3_s1",
+        "link_id": "t3_s1",
+        "body": "Texte",
+    }
+
+
+def test_resolved_and_unknown_authors_leave_the_pending_set():
+    mapper = RedditMapper(FakeReddit({"a1": "alice"}))
+    mapper.comment(comment("c1", "t2_a1"))
+    mapper.comment(comment("c2", "t2_deleted"))
+    assert mapper.pending == 2
+
+    assert mapper.resolve_pending() == [{"Id": "a1", "Name": "alice"}]
+    assert mapper.pending == 0
+    # L'auteur résolu est ensuite servi par le cache
+    assert mapper.comment(comment("c3", "t2_a1"))[1] == {"Id": "a1", "Name": "alice"}
+
+
+def test_pending_set_is_bounded():
+    mapper = RedditMapper(FakeReddit({}), cache_size=3)
+    for index in range(10):
+        mapper.comment(comment(f"c{index}", f"t2_a{index}"))
+
+    assert mapper.pending == 3
+
+
+def test_authors_are_not_kept_pending_without_a_client():
+    mapper = RedditMapper()
+    row, user = mapper.comment(comment("c1", "t2_a1"))
+
+    assert (row["Author_id"], user) == ("a1", None)
+    assert mapper.pending == 0
@@ -0,0 +1,95 @@
+import pytest
+from Database.Types import DbWeightedCategory
+from LLM.Parser import extract_json, normalize_categories, normalize_keywords_and_topic
+
+ANSWER: str = '{"keywords": ["carte vitale", "sécu", "remboursement"], "topic": "Santé"}'
+
+
+def test_extract_json_strict():
+    assert extract_json(ANSWER) == (
+        {"keywords": ["carte vitale", "sécu", "remboursement"], "topic": "Santé"},
+        False,
+    )
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        f"```json\n{ANSWER}\n```",
+        f"```\n{ANSWER}\n```",
+        f"Voici la réponse demandée : {ANSWER}",
+        f"{ANSWER}\nJ'espère que cela vous aide.",
+    ],
+)
+def test_extract_json_recovers_fenced_and_prose_answers(text):
+    value, recovered = extract_json(text)
+
+    assert recovered
+    assert value["topic"] == "Santé"
+
+
+@pytest.mark.parametrize("text", [ANSWER[: len(ANSWER) // 2], "Je ne sais pas.", ""])
+def test_extract_json_rejects_truncated_answers(text):
+    with pytest.raises(ValueError):
+        extract_json(text)
+
+
+def test_normalize_keywords_and_topic_cleans_keywords():
+    entry = {
+        "keywords": [" Carte vitale. ", "sécu, remboursement", "Carte vitale", "«santé»"],
+        "topic": '  "Santé   publique" ',
+    }
+
+    assert normalize_keywords_and_topic(entry) == {
+        "keywords": ["Carte vitale", "sécu, remboursement", "santé"],
+        "topic": "Santé publique",
+    }
+
+
+def test_normalize_keywords_and_topic_accepts_the_explicit_empty_answer():
+    assert normalize_keywords_and_topic({"keywords": [], "topic": " "}) == {
+        "keywords": [],
+        "topic": "",
+    }
+
+
+@pytest.mark.parametrize(
+    "entry",
+    [
+        None,
+        ["carte vitale"],
+        {"keywords": "carte vitale", "topic": "Santé"},
+        {"keywords": ["carte vitale", 3], "topic": "Santé"},
+        {"keywords": ["carte vitale"], "topic": ""},
+        {"keywords": [" , "], "topic": "Santé"},
+    ],
+)
+def test_normalize_keywords_and_topic_rejects_invalid_answers(entry):
+    assert normalize_keywords_and_topic(entry) is None
+
+
+def test_normalize_categories_merges_names():
+    answer = [
+        {"Category": "Santé ", "Weight": 3},
+        {"Category": "Transport", "Weight": 2},
+        {"Category": "Santé", "Weight": 4},
+    ]
+
+    assert normalize_categories(answer) == [
+        DbWeightedCategory(Category="Santé", Weight=7),
+        DbWeightedCategory(Category="Transport", Weight=2),
+    ]
+
+
+@pytest.mark.parametrize(
+    "answer",
+    [
+        {"Category": "Santé", "Weight": 3},
+        [{"Category": "Santé", "Weight": "3"}],
+        [{"Category": "Santé", "Weight": True}],
+        [{"Category": "Santé", "Weight": -1}],
+        [{"Category": "", "Weight": 1}],
+    ],
+)
+def test_normalize_categories_rejects_invalid_answers(answer):
+    assert normalize_categories(answer) is None
@@ -0,0 +1,52 @@
+import pytest
+from Crawler.Mapping import RedditMapper
+from Crawler.Pipeline import CrawlPipeline
+from Database.Manager import DatabaseManager
+from .test_mapping import FakeReddit, comment
+
+
+def submission(submission_id: str, author: str | None = "alice") -> dict:
+    return {
+        "id": submission_id,
+        "name": f"t3_{submission_id}",
+        "author": author,
+        "author_fullname": "t2_a1",
+        "created_utc": 1_700_000_000,
+        "subreddit_id": "t5_sub",
+        "url": f"https://reddit.com/{submission_id}",
+        "title": f"Titre {submission_id}",
+        "selftext": "Texte",
+    }
+
+
+def test_pipeline_writes_items_and_acknowledges_each_batch(database, tmp_path):
+    mapper = RedditMapper(FakeReddit({"a2": "bob"}))
+    pipeline = CrawlPipeline(
+        lambda: DatabaseManager("", filepath=str(tmp_path / "test.db")), mapper, batch_size=2
+    )
+    items = [
+        submission("s1"),
+        submission("s2"),
+        submission("s1"),  # Doublon
+        {**comment("c1", "t2_a2"), "name": "t1_c1"},
+        submission("s3"),
+    ]
+    commits: list[str] = []
+
+    stats = pipeline.run(items, on_commit=commits.append)
+
+    assert (stats["fetch"].items, stats["map"].items, stats["write"].items) == (5, 4, 4)
+    assert [row["Id"] for row in database.iter_submissions()] == ["s1", "s2", "s3"]
+    assert [row["Id"] for row in database.iter_comments()] == ["c1"]
+    # L'auteur du commentaire, connu par son seul identifiant, a été résolu par lot
+    assert [user["Name"] for user in database.iter_users()] == ["alice", "bob"]
+    assert commits[-1] == "t3_s3"
+
+
+def test_pipeline_reraises_errors_after_draining(database, tmp_path):
+    pipeline = CrawlPipeline(
+        lambda: DatabaseManager("", filepath=str(tmp_path / "test.db")), RedditMapper()
+    )
+
+    with pytest.raises(KeyError):
+        pipeline.run([submission("s1"), {"id": "broken"}, submission("s2")])
@@ -0,0 +1,94 @@
+from types import SimpleNamespace
+import prawcore
+import pytest
+from Crawler import Pool
+from Crawler.Pool import CredentialPool
+
+
+@pytest.fixture
+def pool(monkeypatch) -> CredentialPool:
+    # Clients factices : seul le jeu d'identifiants prêté importe
+    monkeypatch.setattr(
+        Pool,
+        "create_reddit",
+        lambda rate_limiter, credentials, cache: SimpleNamespace(name=credentials["username"]),
+    )
+    return CredentialPool(
+        [{"username": "a"}, {"username": "b"}], max_failures=2, quarantine=60.0
+    )
+
+
+def fail(pool: CredentialPool, error: Exception) -> str:
+    """Prête un client, échoue avec error et retourne le nom du jeu utilisé."""
+
+    with pytest.raises(type(error)):
+        with pool.lease() as client:
+            name: str = client.name
+            raise error
+    return name
+
+
+def network_error() -> prawcore.exceptions.RequestException:
+    return prawcore.exceptions.RequestException(ConnectionError("coupure"), (), {})
+
+
+def response(status_code: int) -> SimpleNamespace:
+    return SimpleNamespace(status_code=status_code, headers={}, text="")
+
+
+def test_lease_prefers_the_credential_with_the_most_headroom(pool):
+    pool.credentials[0].rate_limiter.remaining = 10
+    pool.credentials[1].rate_limiter.remaining = 300
+
+    with pool.lease() as first:
+        assert first.name == "b"
+        # Le quota de b est partagé avec le client déjà prêté, mais reste le plus grand
+        with pool.lease() as second:
+            assert second.name == "b"
+
+    # Les clients rendus sont réutilisés
+    assert len(pool.credentials[1].clients) == 2
+    with pool.lease() as client:
+        assert client in (first, second)
+
+
+def test_repeated_failures_quarantine_the_credential(pool):
+    assert fail(pool, network_error()) == "a"
+    assert fail(pool, network_error()) == "a"
+
+    assert pool.credentials[0].quarantined_until > 0
+    with pool.lease() as client:
+        assert client.name == "b"
+
+
+def test_success_resets_the_failure_count(pool):
+    pool.credentials[1].quarantined_until = float("inf")
+    fail(pool, network_error())
+    with pool.lease():
+        pass
+    fail(pool, network_error())
+
+    assert pool.credentials[0].failures == 1
+    assert pool.credentials[0].quarantines == 0
+
+
+def test_quarantine_doubles_on_each_recurrence(pool, monkeypatch):
+    monkeypatch.setattr(Pool.time, "time", lambda: 1000.0)
+    pool.credentials[1].quarantined_until = float("inf")
+    durations: list[float] = []
+
+    for _ in range(3):
+        fail(pool, prawcore.exceptions.InvalidToken(response(401)))
+        durations.append(pool.credentials[0].quarantined_until - 1000.0)
+        pool.credentials[0].quarantined_until = 0.0
+
+    assert durations == [60.0, 120.0, 240.0]
+
+
+def test_rate_limited_credential_waits_for_the_window_reset(pool, monkeypatch):
+    monkeypatch.setattr(Pool.time, "time", lambda: 1000.0)
+    pool.credentials[0].rate_limiter.reset_timestamp = 1450.0
+
+    fail(pool, prawcore.exceptions.TooManyRequests(response(429)))
+
+    assert pool.credentials[0].quarantined_until == 1450.0
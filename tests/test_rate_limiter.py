@@ -0,0 +1,89 @@
+from types import SimpleNamespace
+import pytest
+from Crawler import RateLimiter
+from Crawler.RateLimiter import SharedRateLimiter
+
+
+class FakeClock:
+    """Horloge simulée : sleep() avance le temps au lieu d'attendre."""
+
+    def __init__(self) -> None:
+        self.now: float = 1000.0
+        self.sleeps: list[float] = []
+
+    def time(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch) -> FakeClock:
+    clock = FakeClock()
+    monkeypatch.setattr(RateLimiter, "time", clock)
+    return clock
+
+
+def headers(remaining: int, reset: int) -> dict[str, str]:
+    return {
+        "x-ratelimit-remaining": str(remaining),
+        "x-ratelimit-used": str(600 - remaining),
+        "x-ratelimit-reset": str(reset),
+    }
+
+
+def test_requests_are_free_until_the_quota_is_known(clock):
+    limiter = SharedRateLimiter()
+
+    for _ in range(3):
+        limiter.delay()
+
+    assert clock.sleeps == []
+    assert limiter.requests == 3
+
+
+def test_remaining_quota_is_spread_over_the_window(clock):
+    limiter = SharedRateLimiter(max_delay=60.0)
+    limiter.update(headers(remaining=10, reset=100))
+
+    for _ in range(3):
+        limiter.delay()
+
+    # 100 s pour 10 requêtes, puis 90 s pour 9, etc. : une requête toutes les 10 s
+    assert clock.sleeps == pytest.approx([10.0, 10.0])
+    assert limiter.remaining == 7
+
+
+def test_delay_is_capped_by_max_delay(clock):
+    limiter = SharedRateLimiter(max_delay=2.0)
+    limiter.update(headers(remaining=5, reset=600))
+
+    limiter.delay()
+    limiter.delay()
+
+    assert clock.sleeps == [2.0]
+
+
+def test_exhausted_quota_waits_for_the_reset(clock):
+    limiter = SharedRateLimiter()
+    limiter.update(headers(remaining=0, reset=30))
+
+    limiter.delay()
+
+    assert clock.sleeps == [30.0]
+
+
+def test_call_sends_headers_and_reads_the_response(clock):
+    limiter = SharedRateLimiter()
+    calls: list[dict] = []
+
+    def request(*args, **kwargs):
+        calls.append(kwargs)
+        return SimpleNamespace(headers=headers(remaining=42, reset=60))
+
+    limiter.call(request, lambda: {"Authorization": "bearer token"}, "GET", timeout=5)
+
+    assert calls == [{"timeout": 5, "headers": {"Authorization": "bearer token"}}]
+    assert (limiter.remaining, limiter.used, limiter.reset_timestamp) == (42, 558, 1060.0)
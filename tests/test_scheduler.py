@@ -0,0 +1,102 @@
+from types import SimpleNamespace
+import pytest
+from Crawler import Scheduler
+from Crawler.Scheduler import CrawlScheduler, CrawlTarget
+
+
+class FakeCrawl:
+    """Collecte simulée : chaque appel coûte cost requêtes et dure une seconde."""
+
+    def __init__(self, clock: SimpleNamespace, items: dict[str, int], cost: int = 2) -> None:
+        self.clock = clock
+        self.items = items
+        self.cost = cost
+        self.limiter = SimpleNamespace(requests=0)
+        self.crawled: list[str] = []
+
+    def __call__(self, subreddit: str) -> int:
+        self.crawled.append(subreddit)
+        self.limiter.requests += self.cost
+        self.clock.now += 1
+        if self.items[subreddit] < 0:
+            raise ConnectionError("coupure")
+        return self.items[subreddit]
+
+
+@pytest.fixture
+def clock(monkeypatch) -> SimpleNamespace:
+    clock = SimpleNamespace(now=1_700_000_000.0)
+    monkeypatch.setattr(Scheduler.time, "time", lambda: clock.now)
+    return clock
+
+
+def scheduler(database, crawl: FakeCrawl, targets: list[CrawlTarget], **kwargs) -> CrawlScheduler:
+    return CrawlScheduler(database, targets, crawl, crawl.limiter, **kwargs)
+
+
+def test_due_targets_are_ordered_by_priority(database, clock):
+    crawl = FakeCrawl(clock, {"a": 0, "b": 0})
+    planner = scheduler(
+        database, crawl, [CrawlTarget("a", priority=1), CrawlTarget("b", priority=2)]
+    )
+
+    assert planner.due() == ["b", "a"]
+    planner.run_once("b")
+    assert planner.due() == ["a"]
+
+
+def test_interval_follows_the_publication_velocity(database, clock):
+    crawl = FakeCrawl(clock, {"a": 100})
+    planner = scheduler(database, crawl, [CrawlTarget("a", interval=900)])
+
+    # Première collecte : pas de vitesse mesurée, l'intervalle initial est conservé
+    planner.run_once("a")
+    assert planner.schedules["a"]["Interval"] == 900
+    assert planner.schedules["a"]["Cost"] == 2
+
+    # 100 éléments en une heure : 50 éléments visés par collecte, soit toutes les 30 min
+    clock.now += 3599
+    planner.run_once("a")
+    assert planner.schedules["a"]["Velocity"] == pytest.approx(100)
+    assert planner.schedules["a"]["Interval"] == pytest.approx(1800)
+
+    # Plus aucune publication : l'intervalle double, borné par max_interval
+    crawl.items["a"] = 0
+    for _ in range(10):
+        clock.now += 3599
+        planner.run_once("a")
+    assert planner.schedules["a"]["Interval"] == CrawlTarget("a").max_interval
+
+
+def test_interval_respects_the_request_budget(database, clock):
+    crawl = FakeCrawl(clock, {"a": 10_000, "b": 10_000}, cost=10)
+    planner = scheduler(
+        database,
+        crawl,
+        [CrawlTarget("a", priority=3), CrawlTarget("b", priority=1)],
+        requests_per_minute=4,
+    )
+
+    for _ in range(2):
+        planner.run_once("a")
+        clock.now += 3599
+
+    # 240 requêtes par heure, dont les trois quarts pour a : 10 requêtes toutes les 200 s
+    assert planner.schedules["a"]["Interval"] == pytest.approx(200)
+
+
+def test_schedule_survives_a_restart_and_failed_crawls(database, clock):
+    crawl = FakeCrawl(clock, {"a": 5})
+    planner = scheduler(database, crawl, [CrawlTarget("a")])
+    planner.run_once("a")
+    last_run: int = planner.schedules["a"]["Last_run_utc"]
+
+    crawl.items["a"] = -1
+    clock.now += 3599
+    planner.run_once("a")
+
+    restarted = scheduler(database, crawl, [CrawlTarget("a"), CrawlTarget("b")])
+    assert restarted.schedules["a"] == planner.schedules["a"]
+    # Une collecte en échec ne compte pas comme une collecte réussie
+    assert restarted.schedules["a"]["Last_run_utc"] == last_run
+    assert restarted.due() == ["b"]
@@ -0,0 +1,87 @@
+import time
+from types import SimpleNamespace
+import prawcore
+from Crawler.Mapping import RedditMapper
+from Crawler.Stream import StreamIngester
+
+
+def post(submission_id: str, created_utc: float) -> SimpleNamespace:
+    return SimpleNamespace(
+        id=submission_id,
+        fullname=f"t3_{submission_id}",
+        author="alice",
+        author_fullname="t2_a1",
+        created_utc=created_utc,
+        subreddit_id="t5_sub",
+        url=f"https://reddit.com/{submission_id}",
+        title=f"Titre {submission_id}",
+        selftext="Texte",
+    )
+
+
+class FakeReddit:
+    """
+    Client dont le flux de soumissions rejoue une connexion par liste d'éléments ; une
+    exception de la liste interrompt le flux comme une erreur réseau.
+    """
+
+    def __init__(self, connections: list[list]) -> None:
+        self.connections = connections
+        self.calls: list[dict] = []
+        self.ingester: StreamIngester | None = None
+        stream = SimpleNamespace(submissions=self.submissions)
+        self.subreddit_object = SimpleNamespace(stream=stream)
+
+    def subreddit(self, name: str) -> SimpleNamespace:
+        return self.subreddit_object
+
+    def submissions(self, **kwargs):
+        self.calls.append(kwargs)
+        items = self.connections.pop(0)
+        for item in items:
+            if isinstance(item, Exception):
+                raise item
+            yield item
+        # Dernière connexion épuisée : fin du test
+        if not self.connections:
+            self.ingester.stop()
+        yield None
+
+
+def ingester(database, reddit: FakeReddit) -> StreamIngester:
+    reddit.ingester = StreamIngester(
+        reddit, database, ["sub"], mapper=RedditMapper(), comments=False
+    )
+    return reddit.ingester
+
+
+def network_error() -> prawcore.exceptions.RequestException:
+    return prawcore.exceptions.RequestException(ConnectionError("coupure"), (), {})
+
+
+def test_stream_resumes_after_the_last_received_item(database):
+    # Éléments publiés après la première connexion
+    now: float = time.time() + 60
+    reddit = FakeReddit(
+        [[post("s1", now), post("s2", now), network_error()], [post("s3", now)]]
+    )
+    stream = ingester(database, reddit)
+
+    stream.run()
+
+    assert reddit.calls == [
+        {"pause_after": 0, "skip_existing": True},
+        {"pause_after": 0, "continue_after_id": "t3_s2"},
+    ]
+    assert stream.reconnections == 1
+    assert [row["Id"] for row in database.iter_submissions()] == ["s1", "s2", "s3"]
+
+
+def test_stream_without_items_drops_those_older_than_the_first_connection(database):
+    reddit = FakeReddit([[network_error()], [post("old", 0), post("new", time.time() + 60)]])
+    stream = ingester(database, reddit)
+
+    stream.run()
+
+    assert reddit.calls == [{"pause_after": 0, "skip_existing": True}, {"pause_after": 0}]
+    assert [row["Id"] for row in database.iter_submissions()] == ["new"]